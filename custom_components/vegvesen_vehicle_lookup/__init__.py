@@ -2,31 +2,101 @@
 
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import logging
-import re
 
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import Unauthorized, UnknownUser
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import VegvesenApi
+from .cache import VegvesenLookupCache
 from .const import (
+    API_BASE_URL,
+    ATTR_DEVICE_ID,
+    ATTR_ENTRY_ID,
+    ATTR_FILENAME,
+    ATTR_FORMAT,
+    ATTR_LOOKUPS,
     ATTR_REGNR,
+    ATTR_SECONDS,
+    ATTR_VIN,
     CONF_API_KEY,
+    CONF_BASE_URL,
+    CONF_FLEET_SENSORS,
+    CONF_HEDGE_REQUESTS,
+    CONF_PLATE_ENTITIES,
+    CONF_PLATE_EVENT,
+    DATA_METRICS_VIEW,
+    DEFAULT_FLEET_SENSORS,
+    DEFAULT_HEDGE_REQUESTS,
     DOMAIN,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMATS,
+    LOOKUP_QUEUE_WORKERS,
     PLATFORMS,
-    REGNR_PATTERN,
+    PRIORITY_AUTOMATION,
+    PROFILE_DEFAULT_LOOKUPS,
+    PROFILE_DEFAULT_SECONDS,
+    PROFILE_MAX_LOOKUPS,
+    PROFILE_MAX_SECONDS,
+    SERVICE_EXPORT,
     SERVICE_LOOKUP,
+    SERVICE_PROFILE,
+    normalize_lookup_key,
 )
 from .coordinator import VegvesenCoordinator
+from .export import async_export
+from .history import VegvesenChangeTracker
+from .ingest import VegvesenPlateIngest
+from .metrics import VegvesenMetricsView
+from .profiler import async_start_profile, async_stop_profile
+from .shared_cache import (
+    SharedCacheError,
+    async_share_quota,
+    create_shared_backend,
+)
+from .websocket_api import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
 SERVICE_SCHEMA = vol.Schema(
     {
-        vol.Optional(ATTR_REGNR): str,
+        vol.Exclusive(ATTR_REGNR, "lookup_key"): vol.Any(str, [str]),
+        vol.Exclusive(ATTR_VIN, "lookup_key"): vol.Any(str, [str]),
+        vol.Exclusive(ATTR_ENTRY_ID, "target"): str,
+        vol.Exclusive(ATTR_DEVICE_ID, "target"): str,
+    }
+)
+
+EXPORT_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_FORMAT, default=EXPORT_FORMAT_CSV): vol.In(
+            EXPORT_FORMATS
+        ),
+        vol.Optional(ATTR_FILENAME): str,
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_LOOKUPS, default=PROFILE_DEFAULT_LOOKUPS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_LOOKUPS)
+        ),
+        vol.Optional(ATTR_SECONDS, default=PROFILE_DEFAULT_SECONDS): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_MAX_SECONDS)
+        ),
+        vol.Optional(ATTR_FILENAME): str,
     }
 )
 
@@ -37,13 +107,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     api_key = entry.data[CONF_API_KEY]
     session = async_get_clientsession(hass)
-    api = VegvesenApi(session, api_key)
+    api = VegvesenApi(
+        session,
+        api_key,
+        hedge=entry.options.get(CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS),
+        base_url=entry.data.get(CONF_BASE_URL, API_BASE_URL),
+    )
 
     coordinator = VegvesenCoordinator(hass, api, entry)
+    await coordinator.cache.async_load()
+
+    # Optional cache tier shared with other instances; lookups keep
+    # working locally if it is unreachable
+    shared_cache = create_shared_backend(hass, entry)
+    if shared_cache is not None:
+        try:
+            await shared_cache.async_setup()
+        except SharedCacheError as err:
+            _LOGGER.warning("Shared cache unavailable, using local cache: %s", err)
+            shared_cache = None
+        else:
+            coordinator.cache.attach_shared(shared_cache)
+            async_share_quota(hass, entry, shared_cache, api.quota, api_key)
+    await coordinator.history.async_load()
+    coordinator.history.retain(coordinator.cache)
+    if coordinator.scheduled_revalidation:
+        coordinator.revalidation.async_start()
+        entry.async_on_unload(coordinator.revalidation.async_stop)
+    if entry.options.get(CONF_FLEET_SENSORS, DEFAULT_FLEET_SENSORS):
+        if importlib.util.find_spec("numpy") is None:
+            _LOGGER.error("Fleet sensors require the numpy package")
+        else:
+            await coordinator.async_enable_fleet()
+            entry.async_on_unload(coordinator.async_disable_fleet)
 
     hass.data[DOMAIN][entry.entry_id] = {
         "coordinator": coordinator,
         "api": api,
+        "shared_cache": shared_cache,
         "text_entity": None,  # populated by text.py
     }
 
@@ -51,6 +152,20 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Register domain-level service (once)
     _register_services(hass)
+    async_register_websocket_commands(hass)
+    # HTTP views cannot be unregistered; the view reads whatever entries
+    # are loaded at scrape time
+    if not hass.data.get(DATA_METRICS_VIEW):
+        hass.http.register_view(VegvesenMetricsView())
+        hass.data[DATA_METRICS_VIEW] = True
+
+    # ANPR plate reads (see ingest.py)
+    plate_entities = entry.options.get(CONF_PLATE_ENTITIES) or []
+    plate_event = entry.options.get(CONF_PLATE_EVENT) or None
+    if plate_entities or plate_event:
+        ingest = VegvesenPlateIngest(hass, coordinator)
+        ingest.async_start(plate_entities, plate_event)
+        entry.async_on_unload(ingest.async_stop)
 
     # Reload integration when options change (rebuild sensors)
     entry.async_on_unload(entry.add_update_listener(_async_update_options))
@@ -70,49 +185,188 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id, None)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id, None)
+        if entry_data is not None:
+            entry_data["coordinator"].queue.shutdown()
+            if entry_data["shared_cache"] is not None:
+                await entry_data["shared_cache"].async_close()
 
-    # Remove service if no remaining entries
+    # Remove services if no remaining entries
     if not hass.data.get(DOMAIN):
         hass.services.async_remove(DOMAIN, SERVICE_LOOKUP)
+        hass.services.async_remove(DOMAIN, SERVICE_EXPORT)
+        hass.services.async_remove(DOMAIN, SERVICE_PROFILE)
+        async_stop_profile(hass)
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored lookup cache and history when the entry is deleted."""
+    await VegvesenLookupCache(hass, entry.entry_id).async_remove()
+    await VegvesenChangeTracker(hass, entry.entry_id).async_remove()
+
+
+def _target_entries(hass: HomeAssistant, call: ServiceCall) -> list[dict]:
+    """Return the entry data a service call may use.
+
+    An explicit entry_id or device_id narrows the choice; otherwise every
+    entry with quota left is a candidate.
+    """
+    entries = {
+        entry_id: entry_data
+        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+        if isinstance(entry_data, dict)
+    }
+
+    if entry_id := call.data.get(ATTR_ENTRY_ID):
+        return [entries[entry_id]] if entry_id in entries else []
+
+    if device_id := call.data.get(ATTR_DEVICE_ID):
+        device = dr.async_get(hass).async_get(device_id)
+        if device is None:
+            return []
+        return [entries[e] for e in device.config_entries if e in entries]
+
+    with_quota = [
+        entry_data
+        for entry_data in entries.values()
+        if entry_data["api"].quota.remaining > 0
+    ]
+    # All exhausted: keep them so the lookup reports quota_exceeded
+    return with_quota or list(entries.values())
+
+
+async def _async_fan_out(candidates: list[dict], keys: list[str]) -> None:
+    """Spread a batch of lookups across entries and run them in parallel.
+
+    Each key goes to the entry with the lowest current load plus keys
+    already assigned to it. Per entry, at most LOOKUP_QUEUE_WORKERS
+    lookups are submitted at a time so a large batch doesn't overflow
+    the bounded lookup queue.
+    """
+    assigned: dict[int, list[str]] = {i: [] for i in range(len(candidates))}
+    for key in keys:
+        index = min(
+            assigned,
+            key=lambda i: candidates[i]["coordinator"].load + len(assigned[i]),
+        )
+        assigned[index].append(key)
+
+    async def _run(coordinator: VegvesenCoordinator, batch: list[str]) -> None:
+        semaphore = asyncio.Semaphore(LOOKUP_QUEUE_WORKERS)
+
+        async def _one(key: str) -> None:
+            async with semaphore:
+                await coordinator.async_lookup(key, PRIORITY_AUTOMATION)
+
+        await asyncio.gather(*(_one(key) for key in batch))
+
+    await asyncio.gather(
+        *(
+            _run(candidates[i]["coordinator"], batch)
+            for i, batch in assigned.items()
+            if batch
+        )
+    )
+
+
+async def _async_require_admin(hass: HomeAssistant, call: ServiceCall) -> None:
+    """Raise unless the call comes from an admin user or from Home Assistant.
+
+    async_register_admin_service cannot register services that return a
+    response, so response services check this themselves.
+    """
+    if not call.context.user_id:
+        return
+    user = await hass.auth.async_get_user(call.context.user_id)
+    if user is None:
+        raise UnknownUser(context=call.context)
+    if not user.is_admin:
+        raise Unauthorized(context=call.context)
+
+
 def _register_services(hass: HomeAssistant) -> None:
-    """Register the vegvesen_vehicle_lookup.lookup service (idempotent)."""
+    """Register the vegvesen_vehicle_lookup services (idempotent)."""
     if hass.services.has_service(DOMAIN, SERVICE_LOOKUP):
         return
 
     async def _handle_lookup(call: ServiceCall) -> None:
         """Handle the lookup service call."""
-        regnr_raw: str | None = call.data.get(ATTR_REGNR)
+        raw = call.data.get(ATTR_REGNR) or call.data.get(ATTR_VIN)
+        raw_keys: list[str] = raw if isinstance(raw, list) else [raw] if raw else []
+
+        keys: list[str] = []
+        for value in raw_keys:
+            normalized = normalize_lookup_key(value)
+            if normalized is None:
+                _LOGGER.warning(
+                    "Service call with invalid regnr/VIN format: %s", value
+                )
+                return
+            keys.append(normalized)
+
+        candidates = _target_entries(hass, call)
+        if not keys:
+            # Re-run the current lookup: only entries that have one
+            candidates = [c for c in candidates if c["coordinator"].regnr]
+        if not candidates:
+            _LOGGER.warning("No Vegvesen Vehicle Lookup entry available")
+            return
 
-        # Find the first available coordinator
-        for entry_id, entry_data in hass.data.get(DOMAIN, {}).items():
-            if not isinstance(entry_data, dict):
-                continue
-            coordinator: VegvesenCoordinator = entry_data["coordinator"]
+        if len(keys) > 1:
+            await _async_fan_out(candidates, keys)
+            return
 
-            if regnr_raw:
-                normalized = regnr_raw.upper().replace(" ", "")
-                if not re.match(REGNR_PATTERN, normalized):
-                    _LOGGER.warning(
-                        "Service call with invalid regnr format: %s",
-                        regnr_raw,
-                    )
-                    return
+        # Single lookup: the least-loaded entry shows the result
+        entry_data = min(candidates, key=lambda c: c["coordinator"].load)
+        coordinator: VegvesenCoordinator = entry_data["coordinator"]
 
-                coordinator.regnr = normalized
+        if keys:
+            coordinator.regnr = keys[0]
 
-                # Keep text entity in sync (without triggering debounce)
-                text_entity = entry_data.get("text_entity")
-                if text_entity is not None:
-                    text_entity.set_regnr_from_service(normalized)
+            # Keep text entity in sync (without triggering debounce)
+            text_entity = entry_data.get("text_entity")
+            if text_entity is not None:
+                text_entity.set_regnr_from_service(keys[0])
 
-            await coordinator.async_request_refresh()
-            break  # service affects first entry only
+        await coordinator.async_lookup_now(PRIORITY_AUTOMATION)
 
     hass.services.async_register(
         DOMAIN, SERVICE_LOOKUP, _handle_lookup, schema=SERVICE_SCHEMA
     )
+
+    async def _handle_export(call: ServiceCall) -> ServiceResponse:
+        """Handle the export service call."""
+        # Writes files into the config directory: admin users only
+        await _async_require_admin(hass, call)
+        return await async_export(
+            hass, call.data[ATTR_FORMAT], call.data.get(ATTR_FILENAME)
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_EXPORT,
+        _handle_export,
+        schema=EXPORT_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+    async def _handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Handle the profile service call."""
+        # Profiles the whole event loop and writes files: admin users only
+        await _async_require_admin(hass, call)
+        return async_start_profile(
+            hass,
+            call.data[ATTR_LOOKUPS],
+            call.data[ATTR_SECONDS],
+            call.data.get(ATTR_FILENAME),
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        _handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -3,11 +3,27 @@
 from __future__ import annotations
 
 import asyncio
+from collections import deque
+from collections.abc import Callable
+from datetime import date
 import logging
+import time
+from typing import Any
 
 import aiohttp
 
-from .const import API_BASE_URL, API_TIMEOUT
+from .const import (
+    API_BASE_URL,
+    API_CONNECT_TIMEOUT,
+    API_DAILY_QUOTA,
+    API_READ_TIMEOUT,
+    API_READ_TIMEOUT_MIN,
+    API_READ_TIMEOUT_P95_FACTOR,
+    API_TIMEOUT,
+    HEDGE_MAX_RATIO,
+    LATENCY_MIN_SAMPLES,
+    LATENCY_WINDOW_SIZE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,6 +36,10 @@ class VegvesenAuthError(VegvesenApiError):
     """Authentication / authorisation error (401/403)."""
 
 
+class VegvesenInvalidRequestError(VegvesenApiError):
+    """The API rejected the request (400), e.g. a malformed plate."""
+
+
 class VegvesenNotFoundError(VegvesenApiError):
     """Vehicle not found (404)."""
 
@@ -28,12 +48,116 @@ class VegvesenConnectionError(VegvesenApiError):
     """Network / timeout error."""
 
 
+class VegvesenOverloadError(VegvesenApiError):
+    """Lookup rejected or shed because the lookup queue is full."""
+
+
+class VegvesenQuotaExceededError(VegvesenApiError):
+    """Daily API call quota used up."""
+
+
+# Answers about the request itself, which another copy of it would repeat
+_DEFINITIVE_ERRORS = (
+    VegvesenAuthError,
+    VegvesenInvalidRequestError,
+    VegvesenNotFoundError,
+)
+
+
+class VegvesenQuota:
+    """Daily API call budget for one API key.
+
+    When the key is shared with other Home Assistant instances, on_acquire
+    reports each call to a shared counter and update_shared() feeds the
+    combined count back; the budget then applies to the combined count.
+    """
+
+    def __init__(self, limit: int = API_DAILY_QUOTA) -> None:
+        self.limit = limit
+        self._day = date.today()
+        self._used = 0
+        self._shared_used = 0
+        # Called with the ISO day after each counted call
+        self.on_acquire: Callable[[str], None] | None = None
+
+    def _roll(self) -> None:
+        today = date.today()
+        if today != self._day:
+            self._day = today
+            self._used = 0
+            self._shared_used = 0
+
+    @property
+    def used(self) -> int:
+        """Calls made today (by all instances sharing the key, if known)."""
+        self._roll()
+        return max(self._used, self._shared_used)
+
+    def update_shared(self, day: str, used: int) -> None:
+        """Record the combined call count of all instances for a day."""
+        self._roll()
+        if day == self._day.isoformat():
+            self._shared_used = max(self._shared_used, used)
+
+    @property
+    def remaining(self) -> int:
+        """Calls left today."""
+        return max(0, self.limit - self.used)
+
+    def acquire(self) -> None:
+        """Count one call, or raise VegvesenQuotaExceededError."""
+        if self.used >= self.limit:
+            raise VegvesenQuotaExceededError(
+                f"Daily API quota of {self.limit} calls used up"
+            )
+        self._used += 1
+        if self.on_acquire is not None:
+            self.on_acquire(self._day.isoformat())
+
+
+class LatencyWindow:
+    """Rolling window of recent successful request durations (seconds)."""
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, pct: float) -> float | None:
+        """Return the given percentile, or None until enough samples exist."""
+        if len(self._samples) < LATENCY_MIN_SAMPLES:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+
 class VegvesenApi:
     """Async client for the Vegvesen enkeltoppslag API."""
 
-    def __init__(self, session: aiohttp.ClientSession, api_key: str) -> None:
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        api_key: str,
+        *,
+        hedge: bool = False,
+        base_url: str = API_BASE_URL,
+    ) -> None:
         self._session = session
         self._api_key = api_key
+        # Set from the entry's base_url, e.g. for the stand-in server
+        self._base_url = base_url
+        self._hedge = hedge
+        self.quota = VegvesenQuota()
+        self.latency = LatencyWindow()
+
+        # Counters for the hedging budget
+        self.request_count = 0
+        self.hedge_count = 0
 
     # -- public ----------------------------------------------------------------
 
@@ -43,24 +167,15 @@ class VegvesenApi:
         Returns the first vehicle object from kjoretoydataListe.
         Raises typed exceptions on error.
         """
-        url = f"{API_BASE_URL}?kjennemerke={regnr}"
-        headers = {
-            "Accept": "application/json",
-            "SVV-Authorization": f"Apikey {self._api_key}",
-        }
+        return await self._async_query("kjennemerke", regnr)
 
-        resp = await self._request(url, headers)
+    async def async_lookup_vin(self, vin: str) -> dict:
+        """Look up vehicle data by chassis number (VIN).
 
-        # Parse JSON
-        try:
-            data = await resp.json()
-        except (ValueError, aiohttp.ContentTypeError) as err:
-            raise VegvesenApiError(
-                f"Failed to parse JSON response: {err}"
-            ) from err
-
-        # Extract vehicle from wrapper
-        return self._extract_vehicle(data, regnr)
+        Returns the first vehicle object from kjoretoydataListe.
+        Raises typed exceptions on error.
+        """
+        return await self._async_query("understellsnummer", vin)
 
     async def async_validate_api_key(self) -> bool:
         """Validate the API key by issuing a test request.
@@ -69,7 +184,7 @@ class VegvesenApi:
         Returns False on 401/403.
         Raises VegvesenConnectionError on network problems.
         """
-        url = f"{API_BASE_URL}?kjennemerke=AA00000"
+        url = f"{self._base_url}?kjennemerke=AA00000"
         headers = {
             "Accept": "application/json",
             "SVV-Authorization": f"Apikey {self._api_key}",
@@ -77,7 +192,12 @@ class VegvesenApi:
 
         try:
             async with asyncio.timeout(API_TIMEOUT):
-                resp = await self._session.get(url, headers=headers)
+                # Only the status matters; the context manager releases
+                # the connection without reading the body.
+                async with self._session.get(
+                    url, headers=headers, timeout=self._client_timeout()
+                ) as resp:
+                    status = resp.status
         except asyncio.TimeoutError as err:
             raise VegvesenConnectionError("Validation request timed out") from err
         except aiohttp.ClientError as err:
@@ -85,7 +205,7 @@ class VegvesenApi:
                 f"Connection error during validation: {err}"
             ) from err
 
-        if resp.status in (401, 403):
+        if status in (401, 403):
             return False
 
         # 200, 404, 400 etc. all indicate the key itself is valid.
@@ -93,13 +213,102 @@ class VegvesenApi:
 
     # -- private ---------------------------------------------------------------
 
-    async def _request(
-        self, url: str, headers: dict
-    ) -> aiohttp.ClientResponse:
-        """Execute an HTTP GET with timeout and translate errors."""
+    async def _async_query(self, param: str, value: str) -> dict:
+        """Query the API by a single key and return the vehicle object."""
+        url = f"{self._base_url}?{param}={value}"
+        headers = {
+            "Accept": "application/json",
+            "SVV-Authorization": f"Apikey {self._api_key}",
+        }
+
+        data = await self._request(url, headers)
+
+        # Extract vehicle from wrapper
+        return self._extract_vehicle(data, value)
+
+    def _client_timeout(self) -> aiohttp.ClientTimeout:
+        """Connect/read deadlines; the read deadline follows observed p95."""
+        read = API_READ_TIMEOUT
+        p95 = self.latency.percentile(95)
+        if p95 is not None:
+            read = min(
+                API_READ_TIMEOUT,
+                max(API_READ_TIMEOUT_MIN, p95 * API_READ_TIMEOUT_P95_FACTOR),
+            )
+        return aiohttp.ClientTimeout(
+            total=API_TIMEOUT, connect=API_CONNECT_TIMEOUT, sock_read=read
+        )
+
+    async def _request(self, url: str, headers: dict) -> Any:
+        """Execute a request, hedging it when it runs past the observed p95.
+
+        A hedge is only sent when hedging is enabled, enough latency
+        samples exist, hedges stay within HEDGE_MAX_RATIO of all requests
+        and the quota has room. The first successful answer wins; an
+        answer about the request itself (HTTP 400, 401, 403, 404) from
+        either copy is raised at once. Other errors (5xx, 429, timeouts, a
+        used-up quota) only end the request once no copy is pending; the
+        original copy's error is raised then.
+        """
+        self.request_count += 1
+        p95 = self.latency.percentile(95) if self._hedge else None
+        if p95 is None:
+            return await self._request_once(url, headers)
+
+        primary = asyncio.ensure_future(self._request_once(url, headers))
+        pending = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=p95)
+            if not done and self._may_hedge():
+                self.hedge_count += 1
+                _LOGGER.debug("Request exceeded p95 (%.2fs) – hedging", p95)
+                pending.add(
+                    asyncio.ensure_future(self._request_once(url, headers))
+                )
+            while True:
+                for task in done:
+                    err = task.exception()
+                    if err is None:
+                        return task.result()
+                    if isinstance(err, _DEFINITIVE_ERRORS):
+                        raise err
+                if not pending:
+                    raise primary.exception()
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _may_hedge(self) -> bool:
+        """Return True if a hedge fits the traffic share and the quota."""
+        return (
+            self.hedge_count < self.request_count * HEDGE_MAX_RATIO
+            and self.quota.remaining > 0
+        )
+
+    async def _request_once(self, url: str, headers: dict) -> Any:
+        """Execute an HTTP GET with timeouts, translate errors, return JSON.
+
+        The body is read inside the response context manager, so the
+        connection goes back to the pool on every path – including error
+        statuses, which previously left the response unreleased.
+        """
+        self.quota.acquire()
+        started = time.monotonic()
         try:
             async with asyncio.timeout(API_TIMEOUT):
-                resp = await self._session.get(url, headers=headers)
+                async with self._session.get(
+                    url, headers=headers, timeout=self._client_timeout()
+                ) as resp:
+                    self._raise_for_status(resp.status)
+                    try:
+                        data = await resp.json()
+                    except (ValueError, aiohttp.ContentTypeError) as err:
+                        raise VegvesenApiError(
+                            f"Failed to parse JSON response: {err}"
+                        ) from err
         except asyncio.TimeoutError as err:
             raise VegvesenConnectionError("Request timed out") from err
         except aiohttp.ClientError as err:
@@ -107,31 +316,37 @@ class VegvesenApi:
                 f"Connection error: {err}"
             ) from err
 
-        if resp.status in (401, 403):
+        self.latency.add(time.monotonic() - started)
+        return data
+
+    @staticmethod
+    def _raise_for_status(status: int) -> None:
+        """Translate a non-200 HTTP status into a typed exception."""
+        if status in (401, 403):
             raise VegvesenAuthError(
-                f"Authentication failed (HTTP {resp.status}). "
+                f"Authentication failed (HTTP {status}). "
                 "Check your API key."
             )
-        if resp.status == 400:
+        if status == 400:
             _LOGGER.warning(
                 "HTTP 400 from Vegvesen API – the registration number "
                 "may be invalid"
             )
-            raise VegvesenApiError(
+            raise VegvesenInvalidRequestError(
                 "Invalid request (HTTP 400). Check registration number format."
             )
-        if resp.status == 404:
+        if status == 404:
             raise VegvesenNotFoundError("Vehicle not found (HTTP 404)")
-        if resp.status >= 500:
-            _LOGGER.error("Vegvesen API server error: HTTP %s", resp.status)
-            raise VegvesenApiError(f"Server error (HTTP {resp.status})")
-        if resp.status != 200:
-            raise VegvesenApiError(f"Unexpected HTTP status: {resp.status}")
-
-        return resp
+        if status == 429:
+            raise VegvesenQuotaExceededError("Rate limited by the API (HTTP 429)")
+        if status >= 500:
+            _LOGGER.error("Vegvesen API server error: HTTP %s", status)
+            raise VegvesenApiError(f"Server error (HTTP {status})")
+        if status != 200:
+            raise VegvesenApiError(f"Unexpected HTTP status: {status}")
 
     @staticmethod
-    def _extract_vehicle(data: dict, regnr: str) -> dict:
+    def _extract_vehicle(data: dict, key: str) -> dict:
         """Extract the vehicle dict from a KjoretoydataResponse."""
         if isinstance(data, dict):
             # Standard response: { kjoretoydataListe: [ … ] }
@@ -139,7 +354,7 @@ class VegvesenApi:
                 items = data["kjoretoydataListe"]
                 if not items:
                     raise VegvesenNotFoundError(
-                        f"No vehicle data returned for {regnr}"
+                        f"No vehicle data returned for {key}"
                     )
                 return items[0]
             # Possible direct vehicle object (fallback)
@@ -3,14 +3,15 @@
 from __future__ import annotations
 
 import logging
+import time
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, PRIORITY_INTERACTIVE
 from .coordinator import VegvesenCoordinator
 
 _LOGGER = logging.getLogger(__name__)
@@ -52,6 +53,12 @@ class VegvesenLookupButton(ButtonEntity):
             entry_type=DeviceEntryType.SERVICE,
         )
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counted in the entry's entity_writes metric."""
+        self.coordinator.metrics.entity_writes += 1
+        super().async_write_ha_state()
+
     async def async_press(self) -> None:
         """Handle the button press – trigger immediate lookup."""
         if not self.coordinator.regnr:
@@ -60,4 +67,6 @@ class VegvesenLookupButton(ButtonEntity):
             )
             return
         _LOGGER.debug("Lookup button pressed – refreshing data")
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_lookup_now(
+            PRIORITY_INTERACTIVE, time.monotonic()
+        )
@@ -0,0 +1,406 @@
+"""Persistent cache of vehicle lookup results."""
+
+from __future__ import annotations
+
+import bisect
+from collections import OrderedDict
+from collections.abc import Callable
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from . import codec
+from .const import (
+    CACHE_MAX_ENTRIES,
+    DOMAIN,
+    INDEXED_ATTRIBUTES,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    safe_get,
+)
+from .shared_cache import SharedCacheBackend, SharedCacheError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CachedLookup:
+    """A stored lookup result and the time it was fetched.
+
+    Records loaded from disk keep their compressed payload and only
+    decode it when ``data`` is first accessed; new records are compressed
+    once, when first saved. The INDEXED_ATTRIBUTES values are stored next
+    to the payload, so they are available without decoding it.
+    """
+
+    __slots__ = (
+        "_data",
+        "_encoded",
+        "fetched_at",
+        "key",
+        "vin",
+        "index",
+        "snapshot",
+    )
+
+    def __init__(
+        self,
+        data: dict | None,
+        fetched_at: float,
+        *,
+        encoded: str | None = None,
+        vin: str | None = None,
+        index: dict[str, Any] | None = None,
+    ) -> None:
+        self._data = data
+        self._encoded = encoded
+        self.fetched_at = fetched_at  # UTC epoch seconds
+        self.key: str | None = None  # record key, set when stored
+        self.vin = vin
+        # INDEXED_ATTRIBUTES values (missing ones omitted); set when stored
+        self.index = index
+        # Extracted attributes; computed on first use, not stored
+        self.snapshot: dict[str, Any] | None = None
+
+    @property
+    def data(self) -> dict:
+        """The vehicle payload, decompressed on first access."""
+        if self._data is None:
+            self._data = codec.decode(self._encoded)
+        return self._data
+
+    def read(self) -> dict:
+        """Return the payload without keeping a decoded copy in memory."""
+        if self._data is not None:
+            return self._data
+        return codec.decode(self._encoded)
+
+    def attributes(self) -> dict[str, Any]:
+        """Return the extracted attributes, computed once per record.
+
+        Raises ValueError if the stored payload is corrupt.
+        """
+        if self.snapshot is None:
+            from .attributes import extract_snapshot
+
+            self.snapshot = extract_snapshot(self.read())
+        return self.snapshot
+
+    @property
+    def encoded(self) -> str:
+        """The compressed payload, encoded on first access."""
+        if self._encoded is None:
+            self._encoded = codec.encode(self._data)
+        return self._encoded
+
+    def age(self, now: float) -> float:
+        """Return the age of the result in seconds."""
+        return max(0.0, now - self.fetched_at)
+
+
+def _index_values(data: dict) -> dict[str, Any]:
+    """Return the INDEXED_ATTRIBUTES values of a vehicle payload."""
+    from .attributes import SUPPORTED_ATTRIBUTES
+
+    values = {}
+    for name in INDEXED_ATTRIBUTES:
+        value = safe_get(data, *SUPPORTED_ATTRIBUTES[name].path)
+        if value is not None:
+            values[name] = value
+    return values
+
+
+def _build_indexes(records: list[CachedLookup]) -> None:
+    """Fill in missing index values (executor; decodes each payload once)."""
+    for record in records:
+        try:
+            record.index = _index_values(record.read())
+        except ValueError:
+            record.index = {}  # corrupt; dropped on next cache.get()
+
+
+def _record_keys(data: dict) -> tuple[str | None, str | None]:
+    """Return the (registration number, VIN) a vehicle payload belongs to."""
+    regnr = safe_get(data, "kjoretoyId", "kjennemerke")
+    vin = safe_get(data, "kjoretoyId", "understellsnummer")
+    return (
+        regnr.upper().replace(" ", "") if isinstance(regnr, str) else None,
+        vin.upper() if isinstance(vin, str) else None,
+    )
+
+
+class VegvesenLookupCache:
+    """Registration number → last successful lookup, persisted via Store.
+
+    Each record is stored once, under its registration number (or the key
+    it was looked up by when the payload has none), and additionally
+    indexed by VIN so a lookup by either key hits the same record.
+
+    Record keys are also kept in a sorted list, updated on every insert
+    and removal, so prefix queries (plate autocomplete) are two binary
+    searches.
+
+    At most CACHE_MAX_ENTRIES records are kept: records are ordered by
+    last use (stored, or read with get()), and the least recently used
+    one is dropped when a new one would exceed the limit. Plate reads
+    from a busy gate camera therefore cannot grow the cache, or the
+    decoded payloads it holds, without bound.
+
+    Writes are batched with a delayed save so a burst of lookups results
+    in a single write to disk. With a shared backend attached, stored and
+    removed results are also written behind to it, and async_get_shared()
+    reads results other instances stored.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._hass = hass
+        self._shared: SharedCacheBackend | None = None
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{entry_id}"
+        )
+        # Least recently used first
+        self._records: OrderedDict[str, CachedLookup] = OrderedDict()
+        self._vin_index: dict[str, str] = {}  # VIN → record key
+        self._sorted_keys: list[str] = []
+        # Called with (record key, record) after a record is stored and
+        # with (record key, None) after one is removed (not when a record
+        # is replaced under the same key)
+        self.on_change: Callable[[str, CachedLookup | None], None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, key: str) -> bool:
+        return self._resolve(key) is not None
+
+    def items(self) -> list[tuple[str, CachedLookup]]:
+        """Return (record key, record) pairs as a list safe to iterate later."""
+        return list(self._records.items())
+
+    # -- persistence -----------------------------------------------------------
+
+    async def async_load(self) -> None:
+        """Load stored results from disk."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        # Indexes stored for another set of attributes are rebuilt
+        reindex = stored.get("indexed") != list(INDEXED_ATTRIBUTES)
+        for regnr, record in stored.get("records", {}).items():
+            try:
+                if "payload" in record:
+                    cached = CachedLookup(
+                        None,
+                        float(record["fetched_at"]),
+                        encoded=record["payload"],
+                        vin=record.get("vin"),
+                        index=None if reindex else record.get("index"),
+                    )
+                else:  # uncompressed record from an older version
+                    cached = CachedLookup(
+                        record["data"],
+                        float(record["fetched_at"]),
+                        vin=_record_keys(record["data"])[1],
+                        index=_index_values(record["data"]),
+                    )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.debug("Skipping malformed cache record for %s", regnr)
+                continue
+            cached.key = regnr
+            self._records[regnr] = cached
+            if cached.vin:
+                self._vin_index[cached.vin] = regnr
+        # Stored least recently used first; a lowered limit drops the oldest
+        while len(self._records) > CACHE_MAX_ENTRIES:
+            _, dropped = self._records.popitem(last=False)
+            if dropped.vin and self._vin_index.get(dropped.vin) == dropped.key:
+                del self._vin_index[dropped.vin]
+        self._sorted_keys = sorted(self._records)
+        _LOGGER.debug("Loaded %d cached lookup(s)", len(self._records))
+
+        # Records stored before the index (or one of its attributes) existed
+        if unindexed := [r for r in self._records.values() if r.index is None]:
+            await self._hass.async_add_executor_job(_build_indexes, unindexed)
+            self._schedule_save()
+
+    async def async_remove(self) -> None:
+        """Delete the stored cache file (config entry removed)."""
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {
+            "indexed": list(INDEXED_ATTRIBUTES),
+            "records": {
+                regnr: {
+                    "payload": record.encoded,
+                    "fetched_at": record.fetched_at,
+                    "vin": record.vin,
+                    "index": record.index,
+                }
+                for regnr, record in self._records.items()
+            }
+        }
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+    # -- shared tier -----------------------------------------------------------
+
+    def attach_shared(self, backend: SharedCacheBackend) -> None:
+        """Share results with other instances through backend."""
+        self._shared = backend
+
+    async def async_get_shared(self, key: str) -> CachedLookup | None:
+        """Return a result another instance stored, if newer than ours.
+
+        The shared record is adopted into this cache (without writing it
+        back). Returns None when there is nothing newer or the shared
+        backend is unavailable.
+        """
+        if self._shared is None:
+            return None
+        try:
+            stored = await self._shared.async_get(key)
+        except SharedCacheError as err:
+            _LOGGER.debug("Shared cache read failed for %s: %s", key, err)
+            return None
+        if stored is None:
+            return None
+
+        local = self.peek(key)
+        if local is not None and local.fetched_at >= stored["fetched_at"]:
+            return None
+        record = CachedLookup(
+            None, float(stored["fetched_at"]), encoded=stored["payload"]
+        )
+        try:
+            self._insert(key, record)
+        except ValueError as err:
+            _LOGGER.warning("Ignoring unreadable shared record %s: %s", key, err)
+            return None
+        self._schedule_save()
+        return record
+
+    def _write_shared(self, record_key: str, record: CachedLookup | None) -> None:
+        if self._shared is None:
+            return
+        if record is None:
+            coro = self._shared.async_delete(record_key)
+        else:
+            coro = self._shared.async_put(
+                record_key,
+                {
+                    "payload": record.encoded,
+                    "fetched_at": record.fetched_at,
+                    "vin": record.vin,
+                },
+            )
+        self._hass.async_create_background_task(
+            self._async_write_shared(record_key, coro), f"{DOMAIN} shared cache"
+        )
+
+    @staticmethod
+    async def _async_write_shared(record_key: str, coro) -> None:
+        try:
+            await coro
+        except SharedCacheError as err:
+            _LOGGER.debug("Shared cache write failed for %s: %s", record_key, err)
+
+    # -- access ----------------------------------------------------------------
+
+    def _resolve(self, key: str) -> str | None:
+        """Map a registration number or VIN to its record key."""
+        if key in self._records:
+            return key
+        return self._vin_index.get(key)
+
+    def _insert(self, key: str, record: CachedLookup) -> str:
+        """Store a record under its canonical key and index its VIN."""
+        regnr, vin = _record_keys(record.data)
+        record.vin = vin
+        if record.index is None:
+            record.index = _index_values(record.data)
+        record_key = regnr or key
+        # Drop records this one replaces: the previous result for the key,
+        # the same vehicle under an old plate, and whatever vehicle held
+        # this plate before (so its VIN stops resolving here).
+        for old_key in {self._resolve(key), record_key}:
+            if old_key:
+                self._remove(old_key, notify=old_key != record_key)
+        if vin and vin in self._vin_index:
+            self._remove(self._vin_index[vin])
+        record.key = record_key
+        self._records[record_key] = record
+        bisect.insort(self._sorted_keys, record_key)
+        if vin:
+            self._vin_index[vin] = record_key
+        if self.on_change is not None:
+            self.on_change(record_key, record)
+        while len(self._records) > CACHE_MAX_ENTRIES:
+            self._remove(next(iter(self._records)))
+        return record_key
+
+    def _remove(self, record_key: str, notify: bool = True) -> CachedLookup | None:
+        record = self._records.pop(record_key, None)
+        if record is not None:
+            del self._sorted_keys[bisect.bisect_left(self._sorted_keys, record_key)]
+            vin = record.vin
+            if vin and self._vin_index.get(vin) == record_key:
+                del self._vin_index[vin]
+            if notify and self.on_change is not None:
+                self.on_change(record_key, None)
+        return record
+
+    def keys_with_prefix(self, prefix: str, limit: int) -> list[str]:
+        """Return up to limit record keys starting with prefix, sorted."""
+        start = bisect.bisect_left(self._sorted_keys, prefix)
+        end = bisect.bisect_left(self._sorted_keys, prefix + "\uffff", start)
+        return self._sorted_keys[start : min(end, start + limit)]
+
+    def peek(self, key: str) -> CachedLookup | None:
+        """Return the record for a key without decoding its payload."""
+        record_key = self._resolve(key)
+        return self._records[record_key] if record_key else None
+
+    def get(self, key: str) -> CachedLookup | None:
+        """Return the cached result for a registration number or VIN."""
+        record_key = self._resolve(key)
+        if record_key is None:
+            return None
+        record = self._records[record_key]
+        try:
+            record.data  # noqa: B018 – decode now so corruption is caught here
+        except ValueError as err:
+            _LOGGER.warning("Dropping unreadable cache record %s: %s", key, err)
+            self._remove(record_key)
+            self._schedule_save()
+            return None
+        self._records.move_to_end(record_key)
+        return record
+
+    def put(self, key: str, data: dict, fetched_at: float) -> CachedLookup:
+        """Store a lookup result and schedule a save."""
+        record = CachedLookup(data=data, fetched_at=fetched_at)
+        record_key = self._insert(key, record)
+        self._schedule_save()
+        self._write_shared(record_key, record)
+        return record
+
+    def touch(self, key: str, fetched_at: float) -> None:
+        """Mark an unchanged result as revalidated."""
+        record = self.get(key)
+        if record is not None:
+            record.fetched_at = fetched_at
+            self._schedule_save()
+            self._write_shared(record.key, record)
+
+    def pop(self, key: str) -> CachedLookup | None:
+        """Remove a result (e.g. the plate no longer resolves)."""
+        record_key = self._resolve(key)
+        record = self._remove(record_key) if record_key else None
+        if record is not None:
+            self._schedule_save()
+            self._write_shared(record_key, None)
+        return record
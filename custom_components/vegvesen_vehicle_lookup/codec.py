@@ -0,0 +1,186 @@
+"""Compressed encoding of stored vehicle payloads.
+
+Payloads are compact JSON compressed with zstd when the optional
+``zstandard`` package is installed, else with zlib. Both use the same
+preset dictionary: a hand-written skeleton of a kjoretoydataListe item
+(key names and recurring code objects, empty values). It was not trained
+on sample payloads. It only primes the compressor with the field names
+that make up most of a payload, so they compress to back-references even
+in a single small record. scripts/bench_codec.py measures the effect, and
+with --train compares it with a dictionary trained on given payloads.
+
+Encoded blobs carry their codec name and dictionary version. The
+dictionary must therefore never change in place – add a new version
+instead and keep the old one for decoding.
+"""
+
+from __future__ import annotations
+
+import base64
+from functools import cache
+import json
+from typing import Any
+import zlib
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+
+_DICT_VERSION = 1
+
+# Hand-written from the API schema, not trained: key names and recurring
+# code objects of a kjoretoydataListe item in the order the API emits
+# them. Used verbatim as raw-content dictionary – frequent strings nearer
+# the end compress best.
+_HANDWRITTEN_SKELETON_V1 = (
+    '{"kjoretoyId":{"kjennemerke":"","understellsnummer":""},'
+    '"forstegangsregistrering":{"registrertForstegangNorgeDato":""},'
+    '"kjennemerke":[{"fomTidspunkt":"","kjennemerke":"",'
+    '"kjennemerkekategori":"KJORETOY","kjennemerketype":'
+    '{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"","tidligereKodeVerdi":[]}}],'
+    '"registrering":{"fomTidspunkt":"","kjoringensArt":'
+    '{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"","tidligereKodeVerdi":[]},'
+    '"registreringsstatus":{"kodeBeskrivelse":"","kodeVerdi":"REGISTRERT",'
+    '"tidligereKodeVerdi":[]},"avregistrertSidenDato":"",'
+    '"neringskode":"","neringskodeBeskrivelse":""},'
+    '"godkjenning":{"forstegangsGodkjenning":{"forstegangRegistrertDato":"",'
+    '"godkjenningsId":"","godkjenningsundertype":{"kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"gyldigFraDato":"","gyldigFraDatoTid":"",'
+    '"unntak":[],"bruktimport":{"importland":{"landkode":"","landNavn":""},'
+    '"kilometerstand":0,"tidligereUtenlandskKjennemerke":""}},'
+    '"kjoretoymerknad":[{"merknad":"","merknadtypeKode":""}],'
+    '"registreringsbegrensninger":{"registreringsbegrensning":[]},'
+    '"tekniskGodkjenning":{"godkjenningsId":"","godkjenningsundertype":'
+    '{"kodeVerdi":"","tidligereKodeVerdi":[]},"gyldigFraDato":"",'
+    '"gyldigFraDatoTid":"","kjoretoyklassifisering":{"beskrivelse":"",'
+    '"efTypegodkjenning":{"typegodkjenningNrTekst":"","typegodkjenningnummer":'
+    '{"direktiv":"","land":"","serie":"","utvidelse":""},"variant":"",'
+    '"versjon":""},"kjoretoyAvgiftsKode":{"kodeBeskrivelse":"","kodeNavn":"",'
+    '"kodeVerdi":"","tidligereKodeVerdi":[]},"nasjonalGodkjenning":'
+    '{"nasjonaltGodkjenningsAr":"","nasjonaltGodkjenningsHovednummer":"",'
+    '"nasjonaltGodkjenningsUndernummer":""},"spesielleKjennetegn":"",'
+    '"tekniskKode":{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"tekniskUnderkode":{"kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"iSamsvarMedTypegodkjenning":true},'
+    '"krav":[{"kravomrade":{"kodeBeskrivelse":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"kravoppfyllelse":{"kodeBeskrivelse":"",'
+    '"kodeVerdi":"","tidligereKodeVerdi":[]}}],'
+    '"tekniskeData":{"akslinger":{"akselGruppe":[{"akselListe":{"aksel":'
+    '[{"avstandTilNesteAksling":0,"drivAksel":true,"egenvektAksel":0,'
+    '"id":0,"plasseringAksel":"","sporvidde":0,"tekniskTillattAkselLast":0}]},'
+    '"egenvektAkselGruppe":0,"id":0,"plasseringAkselGruppe":"",'
+    '"tekniskTillattAkselGruppeLast":0}],"antallAksler":0},'
+    '"bremser":{"abs":true,"bremsesystem":"","tilhengerBremseforbindelse":[]},'
+    '"dekkOgFelg":{"akselDekkOgFelgKombinasjon":[{"akselDekkOgFelg":'
+    '[{"akselId":0,"belastningskodeDekk":"","dekkdimensjon":"",'
+    '"felgdimensjon":"","hastighetskodeDekk":"","innpress":""}]}]},'
+    '"dimensjoner":{"bredde":0,"hoyde":0,"lengde":0},'
+    '"generelt":{"fabrikant":[{"fabrikantAdresse":"","fabrikantNavn":""}],'
+    '"handelsbetegnelse":[""],"merke":[{"merke":"","merkeKode":""}],'
+    '"tekniskKode":{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"typebetegnelse":"","ukjentFabrikant":false},'
+    '"karosseriOgLasteplan":{"antallDorer":[0],"dorUtforming":[],'
+    '"karosseriArt":"","karosseritype":{"kodeBeskrivelse":"","kodeNavn":"",'
+    '"kodeVerdi":"","tidligereKodeVerdi":[]},"kjoringSide":"venstre",'
+    '"plasseringFabrikasjonsplate":[],"plasseringUnderstellsnummer":[],'
+    '"rFarge":[{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]}],"bussKategori":""},'
+    '"miljodata":{"euroKlasse":{"kodeBeskrivelse":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"miljoOgdrivstoffGruppe":[{"drivstoffKodeMiljodata":'
+    '{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"","tidligereKodeVerdi":[]},'
+    '"forbrukOgUtslipp":[{"co2BlandetKjoring":0,"forbrukBlandetKjoring":0,'
+    '"malemetode":{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"partikkelfilterFabrikkmontert":false,'
+    '"utslippNOxMgPrKm":0,"wltpKjoretoyspesifikk":{"co2Kombinert":0,'
+    '"co2Hoy":0,"co2Lav":0,"co2Middels":0,"co2SvartHoy":0,'
+    '"forbrukKombinert":0,"forbrukVektetKombinert":0,"elEnergiforbruk":0,'
+    '"rekkeviddeKmBlandetkjoring":0,"rekkeviddeKmBykjoring":0,'
+    '"utslippNOxMgPrKm":0,"utslippPartikkelAntallPrKm":0}}],'
+    '"lyd":{"innvendigStoyniva":0,"kjorestoy":0,"standstoy":0,'
+    '"stoyMalingOppgittAv":{"kodeBeskrivelse":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"vedAntallOmdreininger":0}}],'
+    '"okoInnovasjon":false},"motorOgDrivverk":{"girkassetype":'
+    '{"kodeBeskrivelse":"","kodeNavn":"","kodeVerdi":"","tidligereKodeVerdi":[]},'
+    '"girutvekslingPrGir":[],"hybridKategori":{"kodeBeskrivelse":"",'
+    '"kodeVerdi":"","tidligereKodeVerdi":[]},"maksimumHastighet":[0],'
+    '"maksimumHastighetMalt":[0],"motor":[{"antallSylindre":0,'
+    '"drivstoff":[{"drivstoffKode":{"kodeBeskrivelse":"","kodeNavn":"",'
+    '"kodeVerdi":"","tidligereKodeVerdi":[]},"maksNettoEffekt":0,'
+    '"maksNettoEffektVedOmdreiningstall":0,"maksOmdreining":0,'
+    '"effektVektForhold":0}],"motorKode":"","slagvolum":0,'
+    '"arbeidsprinsipp":{"kodeBeskrivelse":"","kodeVerdi":"",'
+    '"tidligereKodeVerdi":[]},"sylinderArrangement":{"kodeBeskrivelse":"",'
+    '"kodeVerdi":"","tidligereKodeVerdi":[]},"overladet":false,'
+    '"katalysator":false,"spenning":0}],"antallGir":0,"antallGirBakover":0,'
+    '"obd":false},"ovrigeTekniskeData":[],"persontall":{"sitteplassForan":0,'
+    '"sitteplasserTotalt":0,"sitteplasserTilhenger":0,"staplasser":0},'
+    '"tilhengerkopling":{"kopling":[]},"vekter":{"egenvekt":0,'
+    '"egenvektMinimum":0,"nyttelast":0,"tekniskTillattTotalvekt":0,'
+    '"tekniskTillattVektPaahengsvogn":0,"tillattTaklast":0,'
+    '"tillattTilhengervektMedBrems":0,"tillattTilhengervektUtenBrems":0,'
+    '"tillattTotalvekt":0,"tillattVertikalKoplingslast":0,'
+    '"tillattVogntogvekt":0,"vogntogvektAvhBremsesystem":[]}}},'
+    '"tilleggsgodkjenninger":[],"unntak":[]},'
+    '"periodiskKjoretoyKontroll":{"kontrollfrist":"","sistGodkjent":""}}'
+)
+
+_DICTIONARIES = {1: _HANDWRITTEN_SKELETON_V1}
+
+_DECODE_ERRORS: tuple[type[Exception], ...] = (zlib.error, KeyError)
+if zstandard is not None:
+    _DECODE_ERRORS += (zstandard.ZstdError,)
+
+
+@cache
+def _dictionary(version: int) -> bytes:
+    return _DICTIONARIES[version].encode()
+
+
+@cache
+def _zstd_dict(version: int) -> Any:
+    return zstandard.ZstdCompressionDict(
+        _dictionary(version), dict_type=zstandard.DICT_TYPE_RAWCONTENT
+    )
+
+
+def encode(data: dict) -> str:
+    """Encode a payload as "<codec>:<dict version>:<base64 blob>"."""
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    if zstandard is not None:
+        blob = zstandard.ZstdCompressor(
+            level=10, dict_data=_zstd_dict(_DICT_VERSION)
+        ).compress(raw)
+        codec = CODEC_ZSTD
+    else:
+        compressor = zlib.compressobj(9, zdict=_dictionary(_DICT_VERSION))
+        blob = compressor.compress(raw) + compressor.flush()
+        codec = CODEC_ZLIB
+    return f"{codec}:{_DICT_VERSION}:{base64.b64encode(blob).decode()}"
+
+
+def decode(encoded: str) -> dict:
+    """Decode a payload produced by encode().
+
+    Raises ValueError if the blob is corrupt or its codec is unavailable.
+    """
+    codec, version, text = encoded.split(":", 2)
+    blob = base64.b64decode(text)
+    try:
+        if codec == CODEC_ZSTD:
+            if zstandard is None:
+                raise ValueError("zstd payload but zstandard is not installed")
+            raw = zstandard.ZstdDecompressor(
+                dict_data=_zstd_dict(int(version))
+            ).decompress(blob)
+        elif codec == CODEC_ZLIB:
+            decompressor = zlib.decompressobj(zdict=_dictionary(int(version)))
+            raw = decompressor.decompress(blob) + decompressor.flush()
+        else:
+            raise ValueError(f"Unknown payload codec: {codec}")
+    except _DECODE_ERRORS as err:
+        raise ValueError(f"Corrupt payload: {err}") from err
+    return json.loads(raw)
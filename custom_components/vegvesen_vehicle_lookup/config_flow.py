@@ -3,22 +3,49 @@
 from __future__ import annotations
 
 import hashlib
+import importlib.util
 import logging
 
 import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.core import callback
+from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .api import VegvesenApi, VegvesenAuthError, VegvesenConnectionError
 from .const import (
+    CACHE_BACKEND_REDIS,
+    CACHE_BACKENDS,
     CONF_API_KEY,
+    CONF_CACHE_BACKEND,
+    CONF_CACHE_URL,
     CONF_DEBOUNCE_SECONDS,
+    CONF_ENTITY_MODE,
     CONF_FALLBACK_LOOKUP_SECONDS,
+    CONF_FLEET_SENSORS,
+    CONF_FRESHNESS_HOURS,
+    CONF_HEDGE_REQUESTS,
+    CONF_OVERLOAD_POLICY,
+    CONF_PLATE_ENTITIES,
+    CONF_PLATE_EVENT,
+    CONF_REVALIDATION_DAYS,
+    CONF_SCHEDULED_REVALIDATION,
+    CONF_STALE_WHILE_REVALIDATE,
+    DEFAULT_CACHE_BACKEND,
     DEFAULT_DEBOUNCE_SECONDS,
+    DEFAULT_ENTITY_MODE,
     DEFAULT_FALLBACK_LOOKUP_SECONDS,
+    DEFAULT_FLEET_SENSORS,
+    DEFAULT_FRESHNESS_HOURS,
+    DEFAULT_HEDGE_REQUESTS,
+    DEFAULT_OVERLOAD_POLICY,
+    DEFAULT_REVALIDATION_DAYS,
+    DEFAULT_SCHEDULED_REVALIDATION,
+    DEFAULT_STALE_WHILE_REVALIDATE,
     DOMAIN,
+    ENTITY_MODES,
+    OVERLOAD_POLICIES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -96,10 +123,23 @@ class VegvesenOptionsFlowHandler(config_entries.OptionsFlow):
         self, user_input: dict | None = None
     ) -> config_entries.ConfigFlowResult:
         """Manage the options."""
+        errors: dict[str, str] = {}
+
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            if user_input.get(CONF_CACHE_BACKEND) == CACHE_BACKEND_REDIS:
+                if not user_input.get(CONF_CACHE_URL):
+                    errors[CONF_CACHE_URL] = "cache_url_required"
+                elif importlib.util.find_spec("redis") is None:
+                    errors[CONF_CACHE_BACKEND] = "redis_unavailable"
+            if (
+                user_input.get(CONF_FLEET_SENSORS)
+                and importlib.util.find_spec("numpy") is None
+            ):
+                errors[CONF_FLEET_SENSORS] = "numpy_unavailable"
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
-        current = self._config_entry.options
+        current = {**self._config_entry.options, **(user_input or {})}
 
         schema = vol.Schema(
             {
@@ -116,7 +156,73 @@ class VegvesenOptionsFlowHandler(config_entries.OptionsFlow):
                         DEFAULT_FALLBACK_LOOKUP_SECONDS,
                     ),
                 ): vol.All(vol.Coerce(int), vol.Range(min=0, max=600)),
+                vol.Optional(
+                    CONF_FRESHNESS_HOURS,
+                    default=current.get(
+                        CONF_FRESHNESS_HOURS, DEFAULT_FRESHNESS_HOURS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=8760)),
+                vol.Optional(
+                    CONF_STALE_WHILE_REVALIDATE,
+                    default=current.get(
+                        CONF_STALE_WHILE_REVALIDATE,
+                        DEFAULT_STALE_WHILE_REVALIDATE,
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_ENTITY_MODE,
+                    default=current.get(CONF_ENTITY_MODE, DEFAULT_ENTITY_MODE),
+                ): vol.In(ENTITY_MODES),
+                vol.Optional(
+                    CONF_HEDGE_REQUESTS,
+                    default=current.get(
+                        CONF_HEDGE_REQUESTS, DEFAULT_HEDGE_REQUESTS
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_OVERLOAD_POLICY,
+                    default=current.get(
+                        CONF_OVERLOAD_POLICY, DEFAULT_OVERLOAD_POLICY
+                    ),
+                ): vol.In(OVERLOAD_POLICIES),
+                vol.Optional(
+                    CONF_SCHEDULED_REVALIDATION,
+                    default=current.get(
+                        CONF_SCHEDULED_REVALIDATION,
+                        DEFAULT_SCHEDULED_REVALIDATION,
+                    ),
+                ): bool,
+                vol.Optional(
+                    CONF_REVALIDATION_DAYS,
+                    default=current.get(
+                        CONF_REVALIDATION_DAYS, DEFAULT_REVALIDATION_DAYS
+                    ),
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=365)),
+                vol.Optional(
+                    CONF_CACHE_BACKEND,
+                    default=current.get(CONF_CACHE_BACKEND, DEFAULT_CACHE_BACKEND),
+                ): vol.In(CACHE_BACKENDS),
+                vol.Optional(
+                    CONF_CACHE_URL,
+                    default=current.get(CONF_CACHE_URL, ""),
+                ): str,
+                vol.Optional(
+                    CONF_FLEET_SENSORS,
+                    default=current.get(CONF_FLEET_SENSORS, DEFAULT_FLEET_SENSORS),
+                ): bool,
+                vol.Optional(
+                    CONF_PLATE_ENTITIES,
+                    default=current.get(CONF_PLATE_ENTITIES, []),
+                ): selector.EntitySelector(
+                    selector.EntitySelectorConfig(multiple=True)
+                ),
+                vol.Optional(
+                    CONF_PLATE_EVENT,
+                    default=current.get(CONF_PLATE_EVENT, ""),
+                ): str,
             }
         )
 
-        return self.async_show_form(step_id="init", data_schema=schema)
+        return self.async_show_form(
+            step_id="init", data_schema=schema, errors=errors
+        )
@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
@@ -19,8 +24,33 @@ from .api import (
     VegvesenAuthError,
     VegvesenConnectionError,
     VegvesenNotFoundError,
+    VegvesenOverloadError,
+    VegvesenQuotaExceededError,
 )
-from .const import DOMAIN
+from .cache import CachedLookup, VegvesenLookupCache
+from .const import (
+    CONF_FRESHNESS_HOURS,
+    CONF_OVERLOAD_POLICY,
+    CONF_SCHEDULED_REVALIDATION,
+    CONF_STALE_WHILE_REVALIDATE,
+    DEFAULT_FRESHNESS_HOURS,
+    DEFAULT_OVERLOAD_POLICY,
+    DEFAULT_SCHEDULED_REVALIDATION,
+    DEFAULT_STALE_WHILE_REVALIDATE,
+    DOMAIN,
+    EVENT_LOOKUP_RESULT,
+    EVENT_VEHICLE_CHANGED,
+    FLEET_UPDATE_DELAY,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    SIGNAL_FLEET_UPDATED,
+    SIGNAL_VEHICLE_UPDATED,
+)
+from .fleet import VegvesenFleetStore
+from .history import VegvesenChangeTracker
+from .lookup_queue import VegvesenLookupQueue
+from .metrics import PHASE_INPUT, PHASE_REFRESH, VegvesenMetrics
+from .revalidation import VegvesenRevalidationScheduler
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,30 +76,249 @@ class VegvesenCoordinator(DataUpdateCoordinator[dict]):
         )
         self.api = api
         self.config_entry = entry
+        self.metrics = VegvesenMetrics()
+        self.cache = VegvesenLookupCache(hass, entry.entry_id)
+        self.queue = VegvesenLookupQueue(
+            hass,
+            entry,
+            api,
+            policy=entry.options.get(CONF_OVERLOAD_POLICY, DEFAULT_OVERLOAD_POLICY),
+            metrics=self.metrics,
+        )
+        self.history = VegvesenChangeTracker(hass, entry.entry_id)
+        self.cache.on_change = self._async_cache_changed
+        self.revalidation = VegvesenRevalidationScheduler(hass, self)
+        # Columnar copy of the cache for the fleet sensors (if enabled)
+        self.fleet: VegvesenFleetStore | None = None
+        self._unsub_fleet_update: CALLBACK_TYPE | None = None
 
-        # Runtime state
+        # Runtime state (regnr holds the lookup key: a plate or a VIN)
         self.regnr: str | None = None
         self.last_status: str = "idle"
         self.last_updated_ts: str | None = None
         self.raw_json: str | None = None
+        self._raw_json_source: dict | None = None
+        self.data_fetched_at: float | None = None
+        # Extracted attribute values of the published data (one pass)
+        self.snapshot: dict[str, Any] = {}
+
+        # Plates with a background revalidation in flight
+        self._revalidating: set[str] = set()
+        # Queue priority for the next refresh (see async_request_lookup)
+        self._request_priority = PRIORITY_INTERACTIVE
+        # Latency tracking (monotonic): when the pending refresh was
+        # requested, when the user input behind it began, and that input
+        # once its result is about to reach the entities
+        self._refresh_requested: float | None = None
+        self._input_started: float | None = None
+        self._input_publish: float | None = None
+        # Immediate refresh in flight and the key it is looking up
+        self._refresh_task: asyncio.Task | None = None
+        self._refresh_key: str | None = None
+
+    # ------------------------------------------------------------------
+    # Options
+    # ------------------------------------------------------------------
+
+    @property
+    def freshness_seconds(self) -> float:
+        """Age after which a cached result is considered stale."""
+        hours = self.config_entry.options.get(
+            CONF_FRESHNESS_HOURS, DEFAULT_FRESHNESS_HOURS
+        )
+        return hours * 3600
+
+    @property
+    def stale_while_revalidate(self) -> bool:
+        """Whether stale results are served while a refresh runs."""
+        return self.config_entry.options.get(
+            CONF_STALE_WHILE_REVALIDATE, DEFAULT_STALE_WHILE_REVALIDATE
+        )
+
+    @property
+    def scheduled_revalidation(self) -> bool:
+        """Whether cached vehicles are re-looked up on a schedule."""
+        return self.config_entry.options.get(
+            CONF_SCHEDULED_REVALIDATION, DEFAULT_SCHEDULED_REVALIDATION
+        )
+
+    @property
+    def data_age(self) -> float | None:
+        """Age in seconds of the currently published data."""
+        if self.data_fetched_at is None:
+            return None
+        return max(0.0, dt_util.utcnow().timestamp() - self.data_fetched_at)
+
+    @property
+    def load(self) -> int:
+        """Lookups queued or running against this entry's API key."""
+        return self.queue.depth + self.queue.in_flight
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Push an update to entities (counted for the metrics endpoint)."""
+        self.metrics.updates += 1
+        super().async_update_listeners()
+        if self._input_publish is not None:
+            self.metrics.latency[PHASE_INPUT].observe(
+                time.monotonic() - self._input_publish
+            )
+            self._input_publish = None
 
     # ------------------------------------------------------------------
     # Core update
     # ------------------------------------------------------------------
 
+    async def async_lookup(
+        self, key: str, priority: int
+    ) -> tuple[str, dict[str, Any]]:
+        """Look up a vehicle without making it the entry's current vehicle.
+
+        Used for batch service calls and plate reads. The result goes to
+        the cache and the result event; the lookup status and extracted
+        snapshot are returned ({} unless a vehicle was found).
+        """
+        started = time.monotonic()
+        cached = await self._async_cached(key)
+        fresh = cached is not None and self._is_fresh_record(cached)
+        if cached is not None and (fresh or self.stale_while_revalidate):
+            status = "cached" if fresh else "stale"
+            if not fresh:
+                self.schedule_revalidation(key)
+            record = cached
+        else:
+            try:
+                data = await self.queue.async_lookup(key, priority)
+            except VegvesenNotFoundError:
+                self._drop_cached(key)
+                self._fire_result(
+                    key, started, {}, "not_found", dt_util.utcnow().isoformat()
+                )
+                return "not_found", {}
+            except VegvesenApiError as err:
+                _LOGGER.warning("Lookup of %s failed: %s", key, err)
+                status = _error_status(err)
+                self._fire_result(key, started, {}, status, None)
+                return status, {}
+            record = self._store_result(key, data)
+            status = "success"
+
+        snapshot = record.attributes()
+        self._fire_result(
+            key,
+            started,
+            snapshot,
+            status,
+            dt_util.utc_from_timestamp(record.fetched_at).isoformat(),
+        )
+        return status, snapshot
+
+    async def async_request_lookup(self, priority: int) -> None:
+        """Request a refresh whose API call is queued at the given priority.
+
+        Goes through the coordinator's request-refresh debouncer; used for
+        non-interactive triggers such as the startup lookup.
+        """
+        self._request_priority = priority
+        self._refresh_requested = time.monotonic()
+        await self.async_request_refresh()
+
+    async def async_lookup_now(
+        self, priority: int, input_started: float | None = None
+    ) -> None:
+        """Refresh immediately, bypassing the request-refresh debouncer.
+
+        For interactive triggers (text entity, Lookup Now, lookup service)
+        whose own debouncing has already happened: the debouncer's cooldown
+        would otherwise hold back a lookup requested within 10 s of the
+        previous one. Calls arriving while a refresh runs are coalesced:
+        they wait for it, and only if the key changed meanwhile is one
+        follow-up refresh started for all of them.
+
+        input_started is the monotonic time of the user input (first
+        keystroke, button press) behind the request, for the input
+        latency metric.
+        """
+        self._request_priority = priority
+        if self._refresh_requested is None:
+            self._refresh_requested = time.monotonic()
+        if input_started is not None and self._input_started is None:
+            self._input_started = input_started
+        while self._refresh_task is not None:
+            await asyncio.shield(self._refresh_task)
+            if self._refresh_key == self.regnr:
+                return  # the refresh that just ran covered this request
+        self._refresh_key = self.regnr
+        self._refresh_task = self.hass.async_create_task(
+            self._async_refresh_now(), f"{DOMAIN} lookup now"
+        )
+        await asyncio.shield(self._refresh_task)
+
+    async def _async_refresh_now(self) -> None:
+        try:
+            await self.async_refresh()
+        finally:
+            self._refresh_task = None
+
     async def _async_update_data(self) -> dict:
-        """Fetch vehicle data from the API.
+        """Return vehicle data from the cache or the API.
 
-        Called by async_request_refresh().
+        Called by async_request_refresh(). A fresh cached result is
+        returned as-is; a stale one is returned immediately when
+        stale-while-revalidate is enabled, with the API call moved to a
+        background task.
         """
+        started = time.monotonic()
+        if self._refresh_requested is not None:
+            self.metrics.latency[PHASE_REFRESH].observe(
+                started - self._refresh_requested
+            )
+            self._refresh_requested = None
+        input_started, self._input_started = self._input_started, None
+
         if not self.regnr:
             _LOGGER.debug("No registration number set – skipping lookup")
             return self.data or {}
 
-        _LOGGER.debug("Looking up vehicle: %s", self.regnr)
+        regnr = self.regnr
+        priority = self._request_priority
+        self._request_priority = PRIORITY_INTERACTIVE
+        try:
+            data = await self._async_resolve(regnr, priority)
+        except UpdateFailed:
+            self._fire_result(regnr, started, {}, self.last_status, None)
+            self._input_publish = input_started
+            raise
+        self._fire_result(
+            regnr, started, self.snapshot, self.last_status, self.last_updated_ts
+        )
+        # Measured when the coordinator pushes this result to the entities
+        self._input_publish = input_started
+        return data
+
+    async def _async_resolve(self, regnr: str, priority: int) -> dict:
+        """Serve regnr from the cache when possible, else from the API."""
+        cached = await self._async_cached(regnr)
+        if cached is not None:
+            age = cached.age(dt_util.utcnow().timestamp())
+            if age < self.freshness_seconds:
+                _LOGGER.debug("Serving %s from cache (age %.0fs)", regnr, age)
+                return self._publish_cached(cached, "cached")
+            if self.stale_while_revalidate:
+                _LOGGER.debug(
+                    "Serving stale %s (age %.0fs) – revalidating", regnr, age
+                )
+                self.schedule_revalidation(regnr)
+                return self._publish_cached(cached, "stale")
+
+        return await self._async_fetch(regnr, priority)
+
+    async def _async_fetch(self, regnr: str, priority: int) -> dict:
+        """Fetch vehicle data from the API and store it in the cache."""
+        _LOGGER.debug("Looking up vehicle: %s", regnr)
 
         try:
-            data = await self.api.async_lookup(self.regnr)
+            data = await self.queue.async_lookup(regnr, priority)
         except VegvesenAuthError as err:
             self.last_status = "auth_error"
             _LOGGER.error("Authentication error during lookup: %s", err)
@@ -77,28 +326,325 @@ class VegvesenCoordinator(DataUpdateCoordinator[dict]):
         except VegvesenNotFoundError:
             self.last_status = "not_found"
             self.last_updated_ts = dt_util.utcnow().isoformat()
-            _LOGGER.info("Vehicle not found for registration number: %s", self.regnr)
+            _LOGGER.info("Vehicle not found for registration number: %s", regnr)
             # Return empty dict – not an UpdateFailed (user mistake, not infra)
+            self._drop_cached(regnr)
             self.raw_json = None
+            self.data_fetched_at = None
+            self.snapshot = {}
             return {}
         except VegvesenConnectionError as err:
             self.last_status = "connection_error"
             _LOGGER.warning("Connection error during lookup: %s", err)
             raise UpdateFailed(f"Connection error: {err}") from err
+        except VegvesenOverloadError as err:
+            self.last_status = "overloaded"
+            raise UpdateFailed(str(err)) from err
+        except VegvesenQuotaExceededError as err:
+            self.last_status = "quota_exceeded"
+            _LOGGER.warning("Lookup skipped: %s", err)
+            raise UpdateFailed(str(err)) from err
         except VegvesenApiError as err:
             self.last_status = f"error"
             _LOGGER.error("API error during lookup: %s", err)
             raise UpdateFailed(str(err)) from err
 
-        self.last_status = "success"
-        self.last_updated_ts = dt_util.utcnow().isoformat()
+        record = self._store_result(regnr, data)
+        _LOGGER.debug("Lookup successful for %s", regnr)
+        return self._publish_cached(record, "success")
+
+    def _publish_cached(self, record: CachedLookup, status: str) -> dict:
+        """Update runtime state from a cached record and return its data."""
+        self.last_status = status
+        self.data_fetched_at = record.fetched_at
+        self.last_updated_ts = dt_util.utc_from_timestamp(
+            record.fetched_at
+        ).isoformat()
+        self._set_raw_json(record.data)
+        self.snapshot = record.attributes()
+        return record.data
 
-        # Store truncated raw JSON for the diagnostic entity
+    def _store_result(self, key: str, data: dict) -> CachedLookup:
+        """Cache a fresh API result and track changes against the last one."""
+        record = self.cache.put(key, data, dt_util.utcnow().timestamp())
+        snapshot = record.attributes()
+        # Tracked under the cache's record key (normalized plate, else VIN)
+        regnr = record.key
+        known = self.history.history(regnr) is not None
+        changes = self.history.record(regnr, snapshot, record.fetched_at)
+        # New vehicles get their full snapshot, known ones the delta, if any
+        if changes or not known:
+            self._notify_vehicle(
+                {
+                    "regnr": record.key,
+                    "fetched_at": dt_util.utc_from_timestamp(
+                        record.fetched_at
+                    ).isoformat(),
+                    "set": (
+                        {
+                            a: c["new"]
+                            for a, c in changes.items()
+                            if c["new"] is not None
+                        }
+                        if known
+                        else snapshot
+                    ),
+                    "unset": [a for a, c in changes.items() if c["new"] is None],
+                }
+            )
+        if changes:
+            _LOGGER.info(
+                "Vehicle %s changed: %s", regnr, ", ".join(sorted(changes))
+            )
+            self.hass.bus.async_fire(
+                EVENT_VEHICLE_CHANGED,
+                {
+                    "entry_id": self.config_entry.entry_id,
+                    "regnr": regnr,
+                    "fetched_at": dt_util.utc_from_timestamp(
+                        record.fetched_at
+                    ).isoformat(),
+                    "changes": changes,
+                },
+            )
+        return record
+
+    def _drop_cached(self, key: str) -> None:
+        """Forget a cached vehicle that no longer resolves."""
+        record = self.cache.pop(key)
+        if record is not None:
+            self._notify_vehicle({"regnr": record.key, "removed": True})
+
+    def _notify_vehicle(self, update: dict[str, Any]) -> None:
+        """Tell WebSocket subscribers that a cached vehicle changed."""
+        async_dispatcher_send(
+            self.hass, SIGNAL_VEHICLE_UPDATED, self.config_entry.entry_id, update
+        )
+
+    def _fire_result(
+        self,
+        regnr: str,
+        started: float,
+        snapshot: dict[str, Any],
+        status: str,
+        fetched_at: str | None,
+    ) -> None:
+        """Fire one compact bus event for a completed lookup."""
+        duration = time.monotonic() - started
+        self.metrics.lookup_done(status, duration)
+        self.hass.bus.async_fire(
+            EVENT_LOOKUP_RESULT,
+            {
+                "entry_id": self.config_entry.entry_id,
+                "regnr": regnr,
+                "status": status,
+                "duration_ms": round(duration * 1000, 1),
+                "fetched_at": fetched_at,
+                "data": snapshot,
+            },
+        )
+
+    def _set_raw_json(self, data: dict) -> None:
+        """Store truncated raw JSON for the diagnostic entity.
+
+        Serialized only when the published payload object changes, so
+        repeated cache hits don't re-encode (and churn) the same string.
+        """
+        if data is self._raw_json_source and self.raw_json is not None:
+            return
+        self._raw_json_source = data
         try:
             raw = json.dumps(data, ensure_ascii=False)
             self.raw_json = raw[:MAX_RAW_JSON_SIZE]
         except (TypeError, ValueError):
             self.raw_json = None
 
-        _LOGGER.debug("Lookup successful for %s", self.regnr)
-        return data
+    # ------------------------------------------------------------------
+    # Stale-while-revalidate
+    # ------------------------------------------------------------------
+
+    def publish_cached(self) -> bool:
+        """Publish the cached result for the current regnr without an API call.
+
+        Used at startup so restored plates show their stored data right
+        away. Returns True when a cached result was published.
+        """
+        if not self.regnr:
+            return False
+        cached = self.cache.get(self.regnr)
+        if cached is None:
+            return False
+        age = cached.age(dt_util.utcnow().timestamp())
+        status = "cached" if age < self.freshness_seconds else "stale"
+        self.async_set_updated_data(self._publish_cached(cached, status))
+        return True
+
+    def is_fresh(self, regnr: str) -> bool:
+        """Return True if a cached result for regnr is within the freshness window.
+
+        Only the record's fetch time is read; its payload is not decoded.
+        """
+        cached = self.cache.peek(regnr)
+        return cached is not None and self._is_fresh_record(cached)
+
+    def _is_fresh_record(self, record: CachedLookup) -> bool:
+        return record.age(dt_util.utcnow().timestamp()) < self.freshness_seconds
+
+    async def _async_cached(self, key: str) -> CachedLookup | None:
+        """Return the cached result for key.
+
+        When ours is missing or stale, a newer result stored by another
+        instance through the shared cache is adopted instead.
+        """
+        cached = self.cache.get(key)
+        if cached is not None and self._is_fresh_record(cached):
+            return cached
+        shared = await self.cache.async_get_shared(key)
+        if shared is None:
+            return cached
+        _LOGGER.debug("Using %s from the shared cache", key)
+        self._notify_vehicle(
+            {
+                "regnr": shared.key,
+                "fetched_at": dt_util.utc_from_timestamp(
+                    shared.fetched_at
+                ).isoformat(),
+                "set": shared.attributes(),
+                "unset": [],
+            }
+        )
+        return shared
+
+    def schedule_revalidation(self, regnr: str) -> None:
+        """Start a background revalidation unless one is already running."""
+        if regnr in self._revalidating:
+            return
+        self._revalidating.add(regnr)
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_revalidate(regnr),
+            f"{DOMAIN} revalidate {regnr}",
+        )
+
+    async def _async_revalidate(self, regnr: str) -> None:
+        """Re-fetch a stale result and publish it only if it changed."""
+        started = time.monotonic()
+        try:
+            cached = await self._async_cached(regnr)
+            if cached is not None and self._is_fresh_record(cached):
+                # Refreshed meanwhile, e.g. by another instance sharing the cache
+                if regnr == self.regnr:
+                    self.async_set_updated_data(
+                        self._publish_cached(cached, "cached")
+                    )
+                return
+            try:
+                data = await self.queue.async_lookup(regnr, PRIORITY_BACKGROUND)
+            except VegvesenNotFoundError:
+                _LOGGER.info("Cached vehicle %s no longer found", regnr)
+                self._drop_cached(regnr)
+                if regnr == self.regnr:
+                    self.last_status = "not_found"
+                    self.last_updated_ts = dt_util.utcnow().isoformat()
+                    self.raw_json = None
+                    self.data_fetched_at = None
+                    self.snapshot = {}
+                    self._fire_result(
+                        regnr, started, {}, "not_found", self.last_updated_ts
+                    )
+                    self.async_set_updated_data({})
+                return
+            except VegvesenApiError as err:
+                # Keep serving the stale result; the next lookup retries.
+                _LOGGER.warning("Revalidation of %s failed: %s", regnr, err)
+                return
+
+            now = dt_util.utcnow().timestamp()
+            cached = self.cache.get(regnr)
+            if cached is not None and cached.data == data:
+                self.cache.touch(regnr, now)
+                self._notify_vehicle(
+                    {
+                        "regnr": cached.key,
+                        "fetched_at": dt_util.utc_from_timestamp(now).isoformat(),
+                    }
+                )
+                record = cached
+                changed = False
+            else:
+                record = self._store_result(regnr, data)
+                changed = True
+
+            if regnr != self.regnr:
+                return
+
+            published = self._publish_cached(record, "success")
+            self._fire_result(
+                regnr, started, self.snapshot, "success", self.last_updated_ts
+            )
+            if changed:
+                _LOGGER.debug("Revalidated %s – data changed", regnr)
+                self.async_set_updated_data(published)
+            else:
+                # Same data object: entity states are unchanged, only the
+                # diagnostic status/age sensors pick up new values.
+                _LOGGER.debug("Revalidated %s – unchanged", regnr)
+                self.async_update_listeners()
+        finally:
+            self._revalidating.discard(regnr)
+
+    # ------------------------------------------------------------------
+    # Fleet aggregates
+    # ------------------------------------------------------------------
+
+    async def async_enable_fleet(self) -> None:
+        """Mirror the cache into a columnar store for the fleet sensors."""
+        fleet = VegvesenFleetStore()
+        # From the record indexes, so no payload is decoded
+        fleet.load((key, record.index or {}) for key, record in self.cache.items())
+        self.fleet = fleet
+        _LOGGER.debug("Fleet store holds %d vehicle(s)", len(fleet))
+
+    @callback
+    def async_disable_fleet(self) -> None:
+        self.fleet = None
+        if self._unsub_fleet_update is not None:
+            self._unsub_fleet_update()
+            self._unsub_fleet_update = None
+
+    @callback
+    def _async_cache_changed(self, key: str, record: CachedLookup | None) -> None:
+        """Keep the change history and the fleet store in step with the cache."""
+        if record is None:
+            self.history.forget(key)
+        if self.fleet is None:
+            return
+        if record is None:
+            self.fleet.remove(key)
+        else:
+            self.fleet.set(key, record.index or {})
+        # One sensor update per burst of stored results
+        if self._unsub_fleet_update is None:
+            self._unsub_fleet_update = async_call_later(
+                self.hass, FLEET_UPDATE_DELAY, self._async_fleet_updated
+            )
+
+    @callback
+    def _async_fleet_updated(self, _now: Any) -> None:
+        self._unsub_fleet_update = None
+        async_dispatcher_send(
+            self.hass, SIGNAL_FLEET_UPDATED.format(self.config_entry.entry_id)
+        )
+
+
+def _error_status(err: VegvesenApiError) -> str:
+    """Map an API exception to a lookup status string."""
+    if isinstance(err, VegvesenAuthError):
+        return "auth_error"
+    if isinstance(err, VegvesenConnectionError):
+        return "connection_error"
+    if isinstance(err, VegvesenOverloadError):
+        return "overloaded"
+    if isinstance(err, VegvesenQuotaExceededError):
+        return "quota_exceeded"
+    return "error"
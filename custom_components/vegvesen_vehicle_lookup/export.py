@@ -0,0 +1,186 @@
+"""Streaming export of cached vehicle snapshots to CSV, NDJSON or Parquet."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+import contextlib
+import csv
+from datetime import UTC, datetime
+import importlib.util
+import json
+import logging
+import os
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from .cache import CachedLookup
+from .const import (
+    DOMAIN,
+    EXPORT_DIR,
+    EXPORT_FORMAT_CSV,
+    EXPORT_FORMAT_NDJSON,
+    EXPORT_FORMAT_PARQUET,
+    EXPORT_PARQUET_BATCH_SIZE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_export(
+    hass: HomeAssistant, fmt: str, filename: str | None
+) -> dict[str, Any]:
+    """Export every cached vehicle and return the file path and row count.
+
+    Only the list of record references is built on the event loop; decoding,
+    attribute extraction and writing run in the executor one row at a time,
+    so memory stays flat regardless of fleet size.
+    """
+    if fmt == EXPORT_FORMAT_PARQUET and importlib.util.find_spec("pyarrow") is None:
+        raise HomeAssistantError("Parquet export requires the pyarrow package")
+
+    if not filename:
+        filename = f"vegvesen_export_{dt_util.now():%Y%m%d_%H%M%S}.{fmt}"
+    if os.path.basename(filename) != filename or filename.startswith("."):
+        raise HomeAssistantError(f"Invalid export filename: {filename}")
+
+    path = hass.config.path(EXPORT_DIR, filename)
+    records = collect_records(hass)
+    rows = await hass.async_add_executor_job(_write_export, path, fmt, records)
+    _LOGGER.info("Exported %d vehicle(s) to %s", rows, path)
+    return {"path": path, "rows": rows}
+
+
+def collect_records(hass: HomeAssistant) -> list[tuple[str, CachedLookup]]:
+    """Return the newest cached record per vehicle across all entries."""
+    newest: dict[str, CachedLookup] = {}
+    for entry_data in hass.data.get(DOMAIN, {}).values():
+        if not isinstance(entry_data, dict):
+            continue
+        for key, record in entry_data["coordinator"].cache.items():
+            current = newest.get(key)
+            if current is None or record.fetched_at > current.fetched_at:
+                newest[key] = record
+    return list(newest.items())
+
+
+def _write_export(
+    path: str, fmt: str, records: list[tuple[str, CachedLookup]]
+) -> int:
+    """Write the export file (executor). Returns the number of rows."""
+    from .attributes import SUPPORTED_ATTRIBUTES
+
+    columns = ["regnr", "fetched_at", *SUPPORTED_ATTRIBUTES]
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    rows = _iter_rows(records)
+
+    try:
+        if fmt == EXPORT_FORMAT_CSV:
+            count = _write_csv(tmp_path, columns, rows)
+        elif fmt == EXPORT_FORMAT_NDJSON:
+            count = _write_ndjson(tmp_path, rows)
+        elif fmt == EXPORT_FORMAT_PARQUET:
+            count = _write_parquet(tmp_path, columns, rows)
+        else:
+            raise HomeAssistantError(f"Unsupported export format: {fmt}")
+        os.replace(tmp_path, path)
+    except Exception:
+        # Don't leave a partial file in the config directory
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_path)
+        raise
+    return count
+
+
+def _iter_rows(records: Iterable[tuple[str, CachedLookup]]) -> Iterator[dict]:
+    """Yield one flat row per record without keeping decoded payloads."""
+    from .attributes import extract_snapshot
+
+    for key, record in records:
+        try:
+            snapshot = record.snapshot or extract_snapshot(record.read())
+        except ValueError as err:
+            _LOGGER.warning("Skipping unreadable cache record %s: %s", key, err)
+            continue
+        yield {
+            "regnr": key,
+            "fetched_at": datetime.fromtimestamp(
+                record.fetched_at, UTC
+            ).isoformat(),
+            **snapshot,
+        }
+
+
+def _write_csv(path: str, columns: list[str], rows: Iterator[dict]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=columns, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def _write_ndjson(path: str, rows: Iterator[dict]) -> int:
+    count = 0
+    with open(path, "w", encoding="utf-8") as file:
+        for row in rows:
+            file.write(json.dumps(row, ensure_ascii=False))
+            file.write("\n")
+            count += 1
+    return count
+
+
+def _write_parquet(path: str, columns: list[str], rows: Iterator[dict]) -> int:
+    """Write Parquet in row groups of EXPORT_PARQUET_BATCH_SIZE rows.
+
+    Attributes with a unit are stored as float64, everything else as
+    string, so the schema is fixed up front and identical across exports.
+    """
+    import pyarrow as pa  # noqa: PLC0415 – optional dependency
+    import pyarrow.parquet as pq  # noqa: PLC0415
+
+    from .attributes import SUPPORTED_ATTRIBUTES
+
+    numeric = {key for key, attr in SUPPORTED_ATTRIBUTES.items() if attr.unit}
+    schema = pa.schema(
+        [
+            pa.field(col, pa.float64() if col in numeric else pa.string())
+            for col in columns
+        ]
+    )
+
+    def _convert(col: str, value: Any) -> Any:
+        if value is None:
+            return None
+        if col in numeric:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+        return str(value)
+
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        batch: list[dict] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= EXPORT_PARQUET_BATCH_SIZE:
+                writer.write_table(_to_table(pa, schema, columns, batch, _convert))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(_to_table(pa, schema, columns, batch, _convert))
+            count += len(batch)
+    return count
+
+
+def _to_table(pa, schema, columns, batch, convert) -> Any:
+    return pa.table(
+        {col: [convert(col, row.get(col)) for row in batch] for col in columns},
+        schema=schema,
+    )
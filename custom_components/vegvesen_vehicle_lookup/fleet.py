@@ -0,0 +1,241 @@
+"""Columnar store of cached vehicles for fleet aggregate sensors.
+
+The few figures the fleet sensors need are kept in NumPy columns, one row
+per cached vehicle, and updated in place whenever the lookup cache stores
+or drops a vehicle. Rows are filled from the record index (see
+INDEXED_ATTRIBUTES), so no payload is decoded for them. Aggregates are
+vectorized reductions over the columns (computed at most once per change
+and day), instead of walking every cached payload on each update.
+
+Requires numpy; without it, fleet sensors are not available.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+from .const import (
+    FLEET_INITIAL_CAPACITY,
+    FLEET_INSPECTION_DUE_DAYS,
+    FLEET_WEIGHT_BINS,
+    FleetAggregateDefinition,
+)
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency
+    np = None
+
+# Source attributes of the columns (all in INDEXED_ATTRIBUTES)
+_CO2 = "wltp_co2_combined"
+_WEIGHT = "curb_weight"
+_FUEL = "fuel_type"
+_INSPECTION = "next_inspection_date"
+
+
+def _weight_bin_labels() -> list[str]:
+    bounds = FLEET_WEIGHT_BINS
+    return [
+        f"<{bounds[0]}",
+        *(f"{lo}-{hi}" for lo, hi in zip(bounds, bounds[1:])),
+        f">={bounds[-1]}",
+    ]
+
+
+class VegvesenFleetStore:
+    """One row per cached vehicle; missing values are NaN (fuel: -1)."""
+
+    def __init__(self, capacity: int = FLEET_INITIAL_CAPACITY) -> None:
+        from .attributes import parse_api_date
+
+        self._parse_date = parse_api_date
+        self._co2 = np.full(capacity, np.nan)
+        self._weight = np.full(capacity, np.nan)
+        self._inspection = np.full(capacity, np.nan)  # date ordinal
+        self._fuel = np.full(capacity, -1, dtype=np.int16)
+        self._valid = np.zeros(capacity, dtype=bool)
+        self._size = 0  # rows ever used; valid ones are flagged
+        self._rows: dict[str, int] = {}  # record key → row
+        self._free: list[int] = []
+        self._fuel_codes: dict[str, int] = {}
+        self._fuel_names: list[str] = []
+        self._version = 0
+        self._memo: tuple[int, date, dict[str, Any]] | None = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    # -- updates ---------------------------------------------------------------
+
+    def load(self, records: Iterable[tuple[str, dict]]) -> None:
+        """Fill the store from (record key, record index) pairs."""
+        for key, values in records:
+            self.set(key, values)
+
+    def set(self, key: str, values: dict[str, Any]) -> None:
+        """Store or replace the row of a vehicle from its record index."""
+        row = self._rows.get(key)
+        if row is None:
+            row = self._free.pop() if self._free else self._append_row()
+            self._rows[key] = row
+        self._co2[row] = _number(values.get(_CO2))
+        self._weight[row] = _number(values.get(_WEIGHT))
+        self._fuel[row] = self._fuel_code(values.get(_FUEL))
+        deadline = self._parse_date(values.get(_INSPECTION))
+        self._inspection[row] = (
+            deadline.toordinal() if deadline is not None else np.nan
+        )
+        self._valid[row] = True
+        self._version += 1
+
+    def remove(self, key: str) -> None:
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._valid[row] = False
+        self._co2[row] = self._weight[row] = self._inspection[row] = np.nan
+        self._fuel[row] = -1
+        self._free.append(row)
+        self._version += 1
+
+    def _append_row(self) -> int:
+        if self._size == len(self._valid):
+            grow = len(self._valid) or FLEET_INITIAL_CAPACITY  # double
+            self._co2 = np.concatenate((self._co2, np.full(grow, np.nan)))
+            self._weight = np.concatenate((self._weight, np.full(grow, np.nan)))
+            self._inspection = np.concatenate(
+                (self._inspection, np.full(grow, np.nan))
+            )
+            self._fuel = np.concatenate(
+                (self._fuel, np.full(grow, -1, dtype=np.int16))
+            )
+            self._valid = np.concatenate((self._valid, np.zeros(grow, dtype=bool)))
+        self._size += 1
+        return self._size - 1
+
+    def _fuel_code(self, name: Any) -> int:
+        if not isinstance(name, str):
+            return -1
+        code = self._fuel_codes.get(name)
+        if code is None:
+            code = self._fuel_codes[name] = len(self._fuel_names)
+            self._fuel_names.append(name)
+        return code
+
+    # -- aggregates ------------------------------------------------------------
+
+    def aggregates(self, today: date) -> dict[str, Any]:
+        """Return all fleet figures; recomputed only after changes."""
+        if (
+            self._memo is not None
+            and self._memo[0] == self._version
+            and self._memo[1] == today
+        ):
+            return self._memo[2]
+        result = self._compute(today)
+        self._memo = (self._version, today, result)
+        return result
+
+    def _compute(self, today: date) -> dict[str, Any]:
+        # Removed rows hold NaN / -1, so only counts need the valid mask
+        n = self._size
+        co2 = self._co2[:n]
+        co2 = co2[~np.isnan(co2)]
+        weight = self._weight[:n]
+        weight = weight[~np.isnan(weight)]
+
+        fuel = self._fuel[:n]
+        fuel_counts = np.bincount(fuel[fuel >= 0], minlength=len(self._fuel_names))
+        fuel_mix = {
+            self._fuel_names[code]: int(count)
+            for code in np.argsort(-fuel_counts, kind="stable")
+            if (count := fuel_counts[code])
+        }
+
+        days_left = self._inspection[:n] - today.toordinal()  # NaN stays NaN
+        with np.errstate(invalid="ignore"):
+            due = int(np.count_nonzero(days_left <= FLEET_INSPECTION_DUE_DAYS))
+            overdue = int(np.count_nonzero(days_left < 0))
+
+        weight_bins = np.bincount(
+            np.searchsorted(FLEET_WEIGHT_BINS, weight, side="right"),
+            minlength=len(FLEET_WEIGHT_BINS) + 1,
+        )
+        percentiles = (
+            np.percentile(weight, (10, 50, 90)) if weight.size else (None,) * 3
+        )
+        return {
+            "vehicles": int(np.count_nonzero(self._valid[:n])),
+            "co2_total": float(co2.sum()) if co2.size else None,
+            "co2_mean": round(float(co2.mean()), 1) if co2.size else None,
+            "co2_vehicles": int(co2.size),
+            "weight_mean": round(float(weight.mean())) if weight.size else None,
+            "weight_percentiles": {
+                f"p{pct}": round(float(value)) if value is not None else None
+                for pct, value in zip((10, 50, 90), percentiles)
+            },
+            "weight_bins": dict(
+                zip(_weight_bin_labels(), map(int, weight_bins))
+            ),
+            "fuel_mix": fuel_mix,
+            "inspection_due": due,
+            "inspection_overdue": overdue,
+        }
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+FLEET_AGGREGATES: dict[str, FleetAggregateDefinition] = {
+    "fleet_vehicles": FleetAggregateDefinition(
+        name="Fleet Vehicles",
+        icon="mdi:car-multiple",
+        value=lambda agg: agg["vehicles"],
+    ),
+    "fleet_co2_total": FleetAggregateDefinition(
+        name="Fleet CO₂ Total (WLTP)",
+        icon="mdi:molecule-co2",
+        unit="g/km",
+        value=lambda agg: agg["co2_total"],
+        attributes=lambda agg: {"vehicles_with_value": agg["co2_vehicles"]},
+    ),
+    "fleet_co2_mean": FleetAggregateDefinition(
+        name="Fleet CO₂ Mean (WLTP)",
+        icon="mdi:molecule-co2",
+        unit="g/km",
+        value=lambda agg: agg["co2_mean"],
+        attributes=lambda agg: {"vehicles_with_value": agg["co2_vehicles"]},
+    ),
+    "fleet_curb_weight": FleetAggregateDefinition(
+        name="Fleet Curb Weight",
+        icon="mdi:weight-kilogram",
+        unit="kg",
+        value=lambda agg: agg["weight_mean"],
+        attributes=lambda agg: {
+            **agg["weight_percentiles"],
+            "distribution": agg["weight_bins"],
+        },
+    ),
+    "fleet_fuel_mix": FleetAggregateDefinition(
+        name="Fleet Fuel Mix",
+        icon="mdi:fuel",
+        # Most common fuel type; counts per type in the attributes
+        value=lambda agg: next(iter(agg["fuel_mix"]), None),
+        attributes=lambda agg: agg["fuel_mix"],
+    ),
+    "fleet_inspection_due": FleetAggregateDefinition(
+        name="Fleet Inspections Due",
+        icon="mdi:calendar-alert",
+        value=lambda agg: agg["inspection_due"],
+        attributes=lambda agg: {
+            "within_days": FLEET_INSPECTION_DUE_DAYS,
+            "overdue": agg["inspection_overdue"],
+        },
+    ),
+}
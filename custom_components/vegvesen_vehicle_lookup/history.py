@@ -0,0 +1,148 @@
+"""Per-vehicle change tracking between lookups."""
+
+from __future__ import annotations
+
+from collections.abc import Container
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    HISTORY_MAX_DELTAS,
+    HISTORY_STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VegvesenChangeTracker:
+    """Baseline snapshot plus compact deltas for every tracked vehicle.
+
+    Vehicles are keyed like the lookup cache (normalized record key).
+    Stored per vehicle:
+        baseline:    snapshot from the first lookup
+        baseline_at: fetch time of the baseline (UTC epoch seconds)
+        deltas:      [{"at": ts, "set": {attr: value}, "unset": [attr]}]
+
+    A delta is only appended when something changed, so storage grows with
+    the number of changes rather than the number of lookups. Beyond
+    HISTORY_MAX_DELTAS, the oldest delta is folded into the baseline, and
+    vehicles that leave the cache are forgotten. The current snapshot is
+    rebuilt in memory by replaying the deltas on load.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{HISTORY_STORAGE_KEY}.{entry_id}"
+        )
+        self._vehicles: dict[str, dict[str, Any]] = {}
+        self._current: dict[str, dict[str, Any]] = {}
+
+    # -- persistence -----------------------------------------------------------
+
+    async def async_load(self) -> None:
+        """Load stored baselines and deltas from disk."""
+        stored = await self._store.async_load()
+        if not stored:
+            return
+        # Older versions keyed vehicles by the plate as the API spells it
+        self._vehicles = {
+            regnr.upper().replace(" ", ""): vehicle
+            for regnr, vehicle in stored.get("vehicles", {}).items()
+        }
+        for regnr, vehicle in self._vehicles.items():
+            current = dict(vehicle["baseline"])
+            for delta in vehicle["deltas"]:
+                _apply(current, delta)
+            self._current[regnr] = current
+
+    async def async_remove(self) -> None:
+        """Delete the stored history (config entry removed)."""
+        await self._store.async_remove()
+
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"vehicles": self._vehicles}
+
+    def retain(self, keys: Container[str]) -> None:
+        """Forget every vehicle whose key is not in keys (e.g. the cache)."""
+        gone = [regnr for regnr in self._vehicles if regnr not in keys]
+        for regnr in gone:
+            del self._vehicles[regnr]
+            self._current.pop(regnr, None)
+        if gone:
+            _LOGGER.debug("Dropped history of %d uncached vehicle(s)", len(gone))
+            self._schedule_save()
+
+    def forget(self, regnr: str) -> None:
+        """Drop the history of a vehicle that left the cache."""
+        if self._vehicles.pop(regnr, None) is not None:
+            self._current.pop(regnr, None)
+            self._schedule_save()
+
+    # -- access ----------------------------------------------------------------
+
+    def history(self, regnr: str) -> dict[str, Any] | None:
+        """Return the stored baseline and deltas for a vehicle."""
+        return self._vehicles.get(regnr)
+
+    def record(
+        self, regnr: str, snapshot: dict[str, Any], fetched_at: float
+    ) -> dict[str, dict[str, Any]]:
+        """Compare a new snapshot with the tracked one and store the delta.
+
+        Returns {attr: {"old": …, "new": …}} for every changed attribute;
+        empty on the first lookup of a vehicle or when nothing changed.
+        """
+        current = self._current.get(regnr)
+        if current is None:
+            self._vehicles[regnr] = {
+                "baseline": dict(snapshot),
+                "baseline_at": fetched_at,
+                "deltas": [],
+            }
+            self._current[regnr] = dict(snapshot)
+            self._schedule_save()
+            return {}
+
+        changes: dict[str, dict[str, Any]] = {}
+        delta_set: dict[str, Any] = {}
+        for attr, value in snapshot.items():
+            old = current.get(attr)
+            if old != value:
+                changes[attr] = {"old": old, "new": value}
+                delta_set[attr] = value
+        delta_unset = [attr for attr in current if attr not in snapshot]
+        for attr in delta_unset:
+            changes[attr] = {"old": current[attr], "new": None}
+
+        if not changes:
+            return {}
+
+        delta: dict[str, Any] = {"at": fetched_at}
+        if delta_set:
+            delta["set"] = delta_set
+        if delta_unset:
+            delta["unset"] = delta_unset
+        vehicle = self._vehicles[regnr]
+        vehicle["deltas"].append(delta)
+        if len(vehicle["deltas"]) > HISTORY_MAX_DELTAS:
+            oldest = vehicle["deltas"].pop(0)
+            _apply(vehicle["baseline"], oldest)
+            vehicle["baseline_at"] = oldest["at"]
+        _apply(current, delta)
+        self._schedule_save()
+        return changes
+
+    def _schedule_save(self) -> None:
+        self._store.async_delay_save(self._data_to_save, STORAGE_SAVE_DELAY)
+
+
+def _apply(snapshot: dict[str, Any], delta: dict[str, Any]) -> None:
+    """Apply one delta to a snapshot in place."""
+    snapshot.update(delta.get("set", {}))
+    for attr in delta.get("unset", ()):
+        snapshot.pop(attr, None)
@@ -0,0 +1,224 @@
+"""Ingestion of plate reads from ANPR (number plate recognition) cameras.
+
+Gate cameras report the same plate many times while a car passes or
+waits. Each read goes through a pipeline costing O(1) on the event loop,
+so hundreds of reads per second can be absorbed:
+
+1. normalize: upper-case, drop spaces and hyphens, validate against
+   REGNR_PATTERN
+2. dedupe: a plate read again within PLATE_DEDUPE_SECONDS of its previous
+   read is dropped; the window slides with every read, so a car waiting
+   at the gate is looked up once
+3. batch: new plates are collected for up to PLATE_BATCH_SECONDS and then
+   looked up; fresh cache hits are answered at once, API lookups run at
+   most LOOKUP_QUEUE_WORKERS at a time so the bounded queue and the quota
+   are not flooded
+4. emit: one vegvesen_vehicle_lookup_plate_read event per accepted read,
+   carrying the lookup outcome (found, not_found, quota, shed or error)
+   and the vehicle data
+
+Reads are counted by the stage they reached (accepted, duplicate, invalid,
+dropped) in the plate_reads metric, accepted ones by lookup outcome in
+plate_lookups.
+
+Reads come from entities whose state is the plate text, and/or from a bus
+event with the plate in its "plate" (or "regnr") field.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import re
+import time
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_state_change_event,
+)
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    ATTR_REGNR,
+    DOMAIN,
+    EVENT_PLATE_READ,
+    LOOKUP_QUEUE_WORKERS,
+    PLATE_BATCH_SECONDS,
+    PLATE_BATCH_SIZE,
+    PLATE_DEDUPE_SECONDS,
+    PLATE_MAX_BACKLOG,
+    PRIORITY_AUTOMATION,
+    REGNR_PATTERN,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import VegvesenCoordinator
+
+# Lookup status → outcome of an accepted read; anything else is "error"
+_LOOKUP_OUTCOMES = {
+    "success": "found",
+    "cached": "found",
+    "stale": "found",
+    "not_found": "not_found",
+    "quota_exceeded": "quota",
+    "overloaded": "shed",
+}
+
+_PLATE_DELETE = str.maketrans("", "", " -")
+_REGNR_RE = re.compile(REGNR_PATTERN)
+
+
+def normalize_plate(value: str) -> str | None:
+    """Return a camera read as a registration number, or None if invalid."""
+    plate = value.translate(_PLATE_DELETE).upper()
+    return plate if _REGNR_RE.match(plate) else None
+
+
+class VegvesenPlateIngest:
+    """Turns a stream of plate reads into deduplicated, batched lookups."""
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: VegvesenCoordinator
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._seen: OrderedDict[str, float] = OrderedDict()  # plate → last read
+        self._batch: dict[str, tuple[str, float]] = {}  # plate → (source, at)
+        self._backlog = 0  # accepted reads whose result is not emitted yet
+        self._semaphore = asyncio.Semaphore(LOOKUP_QUEUE_WORKERS)
+        self._unsubs: list[CALLBACK_TYPE] = []
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    # -- lifecycle -------------------------------------------------------------
+
+    @callback
+    def async_start(self, entity_ids: list[str], event_type: str | None) -> None:
+        """Subscribe to plate entities and/or a plate event."""
+        if entity_ids:
+            self._unsubs.append(
+                async_track_state_change_event(
+                    self._hass, entity_ids, self._async_state_changed
+                )
+            )
+        if event_type:
+            self._unsubs.append(
+                self._hass.bus.async_listen(event_type, self._async_event)
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        while self._unsubs:
+            self._unsubs.pop()()
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        self._batch.clear()
+
+    # -- sources ---------------------------------------------------------------
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        new_state = event.data["new_state"]
+        if new_state is None or new_state.state in (
+            STATE_UNKNOWN,
+            STATE_UNAVAILABLE,
+        ):
+            return
+        self.async_ingest(new_state.state, event.data["entity_id"])
+
+    @callback
+    def _async_event(self, event: Event) -> None:
+        raw = event.data.get("plate") or event.data.get(ATTR_REGNR)
+        if isinstance(raw, str):
+            self.async_ingest(raw, event.data.get("source") or event.event_type)
+
+    # -- pipeline --------------------------------------------------------------
+
+    @callback
+    def async_ingest(self, raw: str, source: str) -> None:
+        """Accept one plate read; cheap enough to call for every frame."""
+        stages = self._coordinator.metrics.plate_reads
+        plate = normalize_plate(raw)
+        if plate is None:
+            stages["invalid"] += 1
+            return
+
+        now = time.monotonic()
+        cutoff = now - PLATE_DEDUPE_SECONDS
+        seen = self._seen
+        last = seen.pop(plate, None)
+        seen[plate] = now  # most recent read last
+        while (oldest := next(iter(seen))) != plate and seen[oldest] < cutoff:
+            del seen[oldest]
+        if last is not None and last >= cutoff:
+            stages["duplicate"] += 1
+            return
+
+        if self._backlog >= PLATE_MAX_BACKLOG:
+            del seen[plate]  # a later read may try again
+            stages["dropped"] += 1
+            return
+        stages["accepted"] += 1
+        self._backlog += 1
+        self._batch[plate] = (source, time.time())
+        if len(self._batch) >= PLATE_BATCH_SIZE:
+            self._async_flush()
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, PLATE_BATCH_SECONDS, self._async_flush
+            )
+
+    @callback
+    def _async_flush(self, _now: Any = None) -> None:
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        batch, self._batch = self._batch, {}
+        if batch:
+            self._coordinator.config_entry.async_create_background_task(
+                self._hass, self._async_process(batch), f"{DOMAIN} plate batch"
+            )
+
+    async def _async_process(self, batch: dict[str, tuple[str, float]]) -> None:
+        coordinator = self._coordinator
+
+        async def _one(plate: str, source: str, read_at: float) -> None:
+            try:
+                if coordinator.is_fresh(plate):
+                    status, data = await coordinator.async_lookup(
+                        plate, PRIORITY_AUTOMATION
+                    )
+                else:
+                    async with self._semaphore:
+                        status, data = await coordinator.async_lookup(
+                            plate, PRIORITY_AUTOMATION
+                        )
+            finally:
+                self._backlog -= 1
+            outcome = _LOOKUP_OUTCOMES.get(status, "error")
+            coordinator.metrics.plate_lookups[outcome] += 1
+            self._hass.bus.async_fire(
+                EVENT_PLATE_READ,
+                {
+                    "entry_id": coordinator.config_entry.entry_id,
+                    "regnr": plate,
+                    "source": source,
+                    "read_at": dt_util.utc_from_timestamp(read_at).isoformat(),
+                    "status": outcome,
+                    "found": outcome == "found",
+                    "data": data,
+                },
+            )
+
+        await asyncio.gather(
+            *(_one(plate, *read) for plate, read in batch.items())
+        )
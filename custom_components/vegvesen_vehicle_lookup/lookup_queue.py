@@ -0,0 +1,204 @@
+"""Priority lookup queue and worker pool in front of the Vegvesen API."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import logging
+import time
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .api import VegvesenApi, VegvesenOverloadError
+from .const import (
+    DEFAULT_OVERLOAD_POLICY,
+    DOMAIN,
+    LOOKUP_QUEUE_MAX_SIZE,
+    LOOKUP_QUEUE_WORKERS,
+    OVERLOAD_POLICY_SHED_LOWEST,
+    PRIORITY_INTERACTIVE,
+    SIGNAL_QUEUE_UPDATED,
+    is_vin,
+)
+from .metrics import PHASE_API, PHASE_QUEUE, VegvesenMetrics
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(order=True, slots=True)
+class _Job:
+    """A queued lookup; ordered by priority, then submission order."""
+
+    priority: int
+    seq: int
+    key: str = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    enqueued: float = field(compare=False)
+    running: bool = field(default=False, compare=False)
+
+
+class VegvesenLookupQueue:
+    """Bounded priority queue drained by a small pool of workers.
+
+    Lookups for a key that is already queued or running share the same
+    result; a queued job takes the highest priority among its waiters. When
+    the queue is full the overload policy either sheds the lowest-priority
+    queued job in favour of a more important one, or rejects the new job;
+    both surface as VegvesenOverloadError.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        api: VegvesenApi,
+        *,
+        workers: int = LOOKUP_QUEUE_WORKERS,
+        max_size: int = LOOKUP_QUEUE_MAX_SIZE,
+        policy: str = DEFAULT_OVERLOAD_POLICY,
+        metrics: VegvesenMetrics | None = None,
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._api = api
+        self._workers = workers
+        self._max_size = max_size
+        self._policy = policy
+        self._signal = SIGNAL_QUEUE_UPDATED.format(entry.entry_id)
+        self._metrics = metrics or VegvesenMetrics()
+
+        self._heap: list[_Job] = []
+        self._pending: dict[str, _Job] = {}  # queued or running, by key
+        self._seq = itertools.count()
+        self._active_workers = 0
+
+        # Stats
+        self.last_wait: float | None = None  # seconds
+        self.shed_count = 0
+
+    @property
+    def depth(self) -> int:
+        """Number of lookups waiting for a worker."""
+        return len(self._heap)
+
+    @property
+    def in_flight(self) -> int:
+        """Number of lookups currently being executed."""
+        return len(self._pending) - len(self._heap)
+
+    # -- public ----------------------------------------------------------------
+
+    async def async_lookup(
+        self, key: str, priority: int = PRIORITY_INTERACTIVE
+    ) -> dict:
+        """Queue a lookup by registration number or VIN and wait for it."""
+        job = self._pending.get(key)
+        if job is None:
+            job = self._enqueue(key, priority)
+        else:
+            self._metrics.coalesced += 1
+            if not job.running and priority < job.priority:
+                # Don't leave a more urgent waiter behind (or shed with)
+                # the priority of whoever queued the job first
+                job.priority = priority
+                heapq.heapify(self._heap)
+        # Shield: one waiter giving up must not cancel a shared lookup
+        return await asyncio.shield(job.future)
+
+    def shutdown(self) -> None:
+        """Cancel queued and running lookups (config entry unloading)."""
+        for job in self._pending.values():
+            job.future.cancel()
+        self._heap.clear()
+        self._pending.clear()
+
+    # -- private ---------------------------------------------------------------
+
+    def _enqueue(self, key: str, priority: int) -> _Job:
+        if len(self._heap) >= self._max_size:
+            self._shed(key, priority)
+
+        job = _Job(
+            priority=priority,
+            seq=next(self._seq),
+            key=key,
+            future=self._hass.loop.create_future(),
+            enqueued=time.monotonic(),
+        )
+        heapq.heappush(self._heap, job)
+        self._pending[key] = job
+        self._notify()
+
+        if self._active_workers < self._workers:
+            self._active_workers += 1
+            self._entry.async_create_background_task(
+                self._hass, self._async_worker(), f"{DOMAIN} lookup worker"
+            )
+        return job
+
+    def _shed(self, key: str, priority: int) -> None:
+        """Make room for a new job or raise VegvesenOverloadError."""
+        victim = max(self._heap)  # lowest priority, newest
+        if (
+            self._policy == OVERLOAD_POLICY_SHED_LOWEST
+            and victim.priority > priority
+        ):
+            self._heap.remove(victim)
+            heapq.heapify(self._heap)
+            self._pending.pop(victim.key, None)
+            self.shed_count += 1
+            _LOGGER.warning(
+                "Lookup queue full – shedding %s in favour of %s",
+                victim.key,
+                key,
+            )
+            victim.future.set_exception(
+                VegvesenOverloadError("Lookup shed: queue full")
+            )
+            return
+
+        self.shed_count += 1
+        _LOGGER.warning("Lookup queue full – rejecting %s", key)
+        raise VegvesenOverloadError("Lookup rejected: queue full")
+
+    async def _async_worker(self) -> None:
+        """Drain the queue, then exit."""
+        try:
+            while self._heap:
+                job = heapq.heappop(self._heap)
+                job.running = True
+                started = time.monotonic()
+                self.last_wait = started - job.enqueued
+                self._metrics.latency[PHASE_QUEUE].observe(self.last_wait)
+                self._notify()
+                try:
+                    if is_vin(job.key):
+                        result = await self._api.async_lookup_vin(job.key)
+                    else:
+                        result = await self._api.async_lookup(job.key)
+                    self._metrics.latency[PHASE_API].observe(
+                        time.monotonic() - started
+                    )
+                except asyncio.CancelledError:
+                    # Worker cancelled (entry unloading): release the waiters
+                    job.future.cancel()
+                    raise
+                except Exception as err:  # noqa: BLE001 – forwarded to waiters
+                    if not job.future.done():
+                        job.future.set_exception(err)
+                else:
+                    if not job.future.done():
+                        job.future.set_result(result)
+                finally:
+                    if self._pending.get(job.key) is job:
+                        del self._pending[job.key]
+        finally:
+            self._active_workers -= 1
+            self._notify()
+
+    def _notify(self) -> None:
+        async_dispatcher_send(self._hass, self._signal)
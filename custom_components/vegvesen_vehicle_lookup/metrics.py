@@ -0,0 +1,216 @@
+"""Lookup, cache and quota metrics in OpenMetrics text format.
+
+Recording is plain integer arithmetic on the event loop. Text is only
+built when /api/vegvesen_vehicle_lookup/metrics is scraped. The endpoint
+requires authentication (a long-lived access token as bearer token).
+"""
+
+from __future__ import annotations
+
+import bisect
+from collections import Counter
+from collections.abc import Iterable
+
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN, METRICS_LATENCY_BUCKETS
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+PHASE_QUEUE = "queue"  # waiting for a worker
+PHASE_API = "api"  # API call, including hedged duplicates
+PHASE_TOTAL = "total"  # request to result event
+PHASE_REFRESH = "refresh"  # refresh requested to refresh started
+PHASE_INPUT = "input"  # first keystroke / button press to entities updated
+
+
+class Histogram:
+    """Fixed-bucket histogram; bucket counts are stored non-cumulative."""
+
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(METRICS_LATENCY_BUCKETS) + 1)  # last: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(METRICS_LATENCY_BUCKETS, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class VegvesenMetrics:
+    """Counters and latency histograms for one config entry."""
+
+    def __init__(self) -> None:
+        self.lookups: Counter[str] = Counter()  # by status
+        self.latency = {
+            phase: Histogram()
+            for phase in (
+                PHASE_QUEUE,
+                PHASE_API,
+                PHASE_TOTAL,
+                PHASE_REFRESH,
+                PHASE_INPUT,
+            )
+        }
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0  # lookups that joined one already queued/running
+        self.retries = 0  # revalidations restarted after an incomplete attempt
+        self.updates = 0  # coordinator updates pushed to entities
+        self.entity_writes = 0  # state writes of the entry's entities
+        self.plate_reads: Counter[str] = Counter()  # ANPR reads by stage
+        self.plate_lookups: Counter[str] = Counter()  # accepted reads by result
+
+    def lookup_done(self, status: str, duration: float) -> None:
+        self.lookups[status] += 1
+        self.latency[PHASE_TOTAL].observe(duration)
+        if status in ("cached", "stale"):
+            self.cache_hits += 1
+        elif status in ("success", "not_found"):
+            # Answered by the API; failed lookups are only counted by status
+            self.cache_misses += 1
+
+
+class VegvesenMetricsView(HomeAssistantView):
+    """Serve the metrics of all config entries."""
+
+    url = f"/api/{DOMAIN}/metrics"
+    name = f"api:{DOMAIN}:metrics"
+
+    async def get(self, request: web.Request) -> web.Response:
+        hass: HomeAssistant = request.app["hass"]
+        entries = [
+            (entry_id, entry_data)
+            for entry_id, entry_data in hass.data.get(DOMAIN, {}).items()
+            if isinstance(entry_data, dict)
+        ]
+        return web.Response(
+            body="".join(_render(entries)).encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+
+def _render(entries: list[tuple[str, dict]]) -> Iterable[str]:
+    prefix = "vegvesen"
+
+    def family(name: str, kind: str, help_text: str) -> str:
+        return (
+            f"# TYPE {prefix}_{name} {kind}\n"
+            f"# HELP {prefix}_{name} {help_text}\n"
+        )
+
+    yield family("lookups", "counter", "Completed lookups by status.")
+    for entry_id, data in entries:
+        lookups = data["coordinator"].metrics.lookups
+        for status, value in sorted(lookups.items()):
+            yield (
+                f'{prefix}_lookups_total{{entry_id="{entry_id}",'
+                f'status="{status}"}} {value}\n'
+            )
+
+    yield family(
+        "plate_reads", "counter", "ANPR plate reads by pipeline stage reached."
+    )
+    for entry_id, data in entries:
+        plate_reads = data["coordinator"].metrics.plate_reads
+        for stage, value in sorted(plate_reads.items()):
+            yield (
+                f'{prefix}_plate_reads_total{{entry_id="{entry_id}",'
+                f'stage="{stage}"}} {value}\n'
+            )
+
+    yield family(
+        "plate_lookups", "counter", "Accepted ANPR plate reads by lookup result."
+    )
+    for entry_id, data in entries:
+        plate_lookups = data["coordinator"].metrics.plate_lookups
+        for result, value in sorted(plate_lookups.items()):
+            yield (
+                f'{prefix}_plate_lookups_total{{entry_id="{entry_id}",'
+                f'result="{result}"}} {value}\n'
+            )
+
+    yield family(
+        "lookup_duration_seconds", "histogram", "Lookup latency by phase."
+    )
+    for entry_id, data in entries:
+        for phase, hist in data["coordinator"].metrics.latency.items():
+            labels = f'entry_id="{entry_id}",phase="{phase}"'
+            cumulative = 0
+            for bound, count in zip(
+                (*METRICS_LATENCY_BUCKETS, "+Inf"), hist.counts, strict=True
+            ):
+                cumulative += count
+                yield (
+                    f"{prefix}_lookup_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}\n'
+                )
+            yield f"{prefix}_lookup_duration_seconds_sum{{{labels}}} {hist.sum}\n"
+            yield (
+                f"{prefix}_lookup_duration_seconds_count{{{labels}}} {hist.count}\n"
+            )
+
+    def metric(attr: str):
+        return lambda data: getattr(data["coordinator"].metrics, attr)
+
+    counters = (
+        ("cache_hits", "Lookups served from the cache.", metric("cache_hits")),
+        (
+            "cache_misses",
+            "Lookups not in the cache that the API answered.",
+            metric("cache_misses"),
+        ),
+        (
+            "coalesced_lookups",
+            "Lookups that joined one already in progress.",
+            metric("coalesced"),
+        ),
+        (
+            "api_requests",
+            "API requests made, not counting hedged duplicates.",
+            lambda data: data["api"].request_count,
+        ),
+        (
+            "api_hedged_requests",
+            "Duplicate requests sent for slow calls.",
+            lambda data: data["api"].hedge_count,
+        ),
+        (
+            "retries",
+            "Scheduled revalidations restarted after an incomplete attempt.",
+            metric("retries"),
+        ),
+        (
+            "queue_shed",
+            "Lookups shed or rejected by a full queue.",
+            lambda data: data["coordinator"].queue.shed_count,
+        ),
+        (
+            "entity_updates",
+            "Coordinator updates pushed to entities.",
+            metric("updates"),
+        ),
+        (
+            "entity_writes",
+            "State writes of the entry's entities.",
+            metric("entity_writes"),
+        ),
+    )
+    for name, help_text, read in counters:
+        yield family(name, "counter", help_text)
+        for entry_id, data in entries:
+            yield f'{prefix}_{name}_total{{entry_id="{entry_id}"}} {read(data)}\n'
+
+    yield family("quota_remaining", "gauge", "API calls left today.")
+    for entry_id, data in entries:
+        yield (
+            f'{prefix}_quota_remaining{{entry_id="{entry_id}"}} '
+            f"{data['api'].quota.remaining}\n"
+        )
+    yield "# EOF\n"
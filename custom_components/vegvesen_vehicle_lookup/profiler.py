@@ -0,0 +1,122 @@
+"""On-demand cProfile capture of lookups.
+
+Nothing is hooked into the lookup path: the profiler and its result-event
+listener only exist while a capture started by the profile service runs,
+so there is no overhead otherwise. A capture profiles everything that
+runs on the event loop thread while it lasts – the API client, the
+coordinator and entity updates, but also every other integration and
+Home Assistant itself, all of which are slowed down by the profiler.
+Work handed to the executor, such as payload decoding for exports, is
+not included. A capture therefore ends after a number of completed
+lookups or at most PROFILE_MAX_SECONDS, whichever comes first, and
+writes a pstats file, readable with ``python -m pstats`` or snakeviz, to
+<config>/vegvesen_vehicle_lookup/.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import logging
+import os
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
+
+from .const import DATA_PROFILE, DOMAIN, EVENT_LOOKUP_RESULT, EXPORT_DIR
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_start_profile(
+    hass: HomeAssistant, lookups: int, seconds: int, filename: str | None
+) -> dict[str, Any]:
+    """Start a capture and return the path its stats will be written to."""
+    if hass.data.get(DATA_PROFILE) is not None:
+        raise HomeAssistantError("A profile capture is already running")
+
+    if not filename:
+        filename = f"vegvesen_profile_{dt_util.now():%Y%m%d_%H%M%S}.prof"
+    if os.path.basename(filename) != filename or filename.startswith("."):
+        raise HomeAssistantError(f"Invalid profile filename: {filename}")
+
+    capture = _ProfileCapture(hass, hass.config.path(EXPORT_DIR, filename), lookups)
+    capture.async_start(seconds)
+    hass.data[DATA_PROFILE] = capture
+    return {"path": capture.path, "lookups": lookups, "seconds": seconds}
+
+
+@callback
+def async_stop_profile(hass: HomeAssistant) -> None:
+    """End a running capture early (its stats are still written)."""
+    if (capture := hass.data.get(DATA_PROFILE)) is not None:
+        capture.async_finish()
+
+
+class _ProfileCapture:
+    """One running capture."""
+
+    def __init__(self, hass: HomeAssistant, path: str, lookups: int) -> None:
+        self._hass = hass
+        self.path = path
+        self._remaining = lookups
+        self._profiler = cProfile.Profile()
+        self._unsubs: list[CALLBACK_TYPE] = []
+
+    @callback
+    def async_start(self, seconds: int) -> None:
+        try:
+            self._profiler.enable()
+        except ValueError as err:  # another profiler is active
+            raise HomeAssistantError(f"Cannot start profiler: {err}") from err
+        self._unsubs = [
+            self._hass.bus.async_listen(EVENT_LOOKUP_RESULT, self._async_result),
+            async_call_later(self._hass, seconds, self._async_timeout),
+        ]
+        _LOGGER.info(
+            "Profiling the next %d lookup(s) or %d s into %s",
+            self._remaining,
+            seconds,
+            self.path,
+        )
+
+    @callback
+    def _async_result(self, event: Event) -> None:
+        self._remaining -= 1
+        if self._remaining <= 0:
+            self.async_finish()
+
+    @callback
+    def _async_timeout(self, _now: Any) -> None:
+        self.async_finish()
+
+    @callback
+    def async_finish(self) -> None:
+        if self._hass.data.get(DATA_PROFILE) is not self:
+            return
+        self._profiler.disable()
+        while self._unsubs:
+            self._unsubs.pop()()
+        del self._hass.data[DATA_PROFILE]
+        self._hass.async_create_background_task(
+            self._async_write(), f"{DOMAIN} write profile"
+        )
+
+    async def _async_write(self) -> None:
+        try:
+            await self._hass.async_add_executor_job(
+                _write_stats, self._profiler, self.path
+            )
+        except OSError as err:
+            _LOGGER.error("Could not write profile to %s: %s", self.path, err)
+            return
+        _LOGGER.info("Profile written to %s", self.path)
+
+
+def _write_stats(profiler: cProfile.Profile, path: str) -> None:
+    """Write the collected stats (executor)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    profiler.dump_stats(path)
@@ -0,0 +1,297 @@
+"""Deadline-driven background revalidation of cached vehicles.
+
+Most vehicle data never changes. What does change is tied to the periodic
+inspection (EU-kontroll): once a vehicle passes, its kontrollfrist moves
+forward and the last-approval date updates. Vehicles are therefore
+re-looked up densely around their deadline and only rarely otherwise:
+
+- long before the deadline: once the inspection window opens
+- inside the window (up to the deadline plus a few days of registry
+  delay): every REVALIDATION_WINDOW_INTERVAL_DAYS
+- deadline passed but unchanged (overdue): every REVALIDATION_OVERDUE_DAYS
+- and never later than the configured baseline interval
+
+The projected daily call count follows the same rules: each vehicle's
+lookups over the projection horizon are counted once when it is
+(re)scheduled, and the whole fleet only again when the horizon has
+moved on by a day.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import logging
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.dispatcher import (
+    async_dispatcher_connect,
+    async_dispatcher_send,
+)
+from homeassistant.helpers.event import (
+    async_call_later,
+    async_track_point_in_utc_time,
+)
+import homeassistant.util.dt as dt_util
+
+from .cache import CachedLookup
+from .const import (
+    CONF_REVALIDATION_DAYS,
+    DEFAULT_REVALIDATION_DAYS,
+    REVALIDATION_BATCH_INTERVAL,
+    REVALIDATION_BATCH_SIZE,
+    REVALIDATION_GRACE_DAYS,
+    REVALIDATION_INSPECTION_WINDOW_DAYS,
+    REVALIDATION_OVERDUE_DAYS,
+    REVALIDATION_PROJECTION_DAYS,
+    REVALIDATION_PROJECTION_DELAY,
+    REVALIDATION_RETRY_SECONDS,
+    REVALIDATION_WINDOW_INTERVAL_DAYS,
+    SIGNAL_PROJECTION_UPDATED,
+    SIGNAL_VEHICLE_UPDATED,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import VegvesenCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+_DAY = 86400
+
+# Inspection window as (start, end) UTC epoch seconds; None without deadline
+_Window = tuple[float, float] | None
+
+
+def next_revalidation(
+    fetched_at: float, snapshot: dict[str, Any], baseline_days: int
+) -> float:
+    """Return when a vehicle fetched at fetched_at should be looked up again."""
+    return _next_due(fetched_at, _inspection_window(snapshot), baseline_days)
+
+
+def projected_calls(
+    due: float, window: _Window, baseline_days: int, start: float, end: float
+) -> int:
+    """Count the lookups of a vehicle due at ``due`` between start and end.
+
+    Steps through the schedule of next_revalidation, assuming every lookup
+    leaves the deadline unchanged – an upper bound, as a passed inspection
+    moves the deadline out and the vehicle back to the baseline interval.
+    """
+    calls = 0
+    at = max(due, start)
+    while at <= end:
+        calls += 1
+        at = _next_due(at, window, baseline_days)
+    return calls
+
+
+def _inspection_window(values: dict[str, Any]) -> _Window:
+    """Window around next_inspection_date in a snapshot or record index."""
+    from .attributes import parse_api_date
+
+    deadline = parse_api_date(values.get("next_inspection_date"))
+    if deadline is None:
+        return None
+    return (
+        dt_util.start_of_local_day(
+            deadline - timedelta(days=REVALIDATION_INSPECTION_WINDOW_DAYS)
+        ).timestamp(),
+        dt_util.start_of_local_day(
+            deadline + timedelta(days=REVALIDATION_GRACE_DAYS)
+        ).timestamp(),
+    )
+
+
+def _next_due(fetched_at: float, window: _Window, baseline_days: int) -> float:
+    baseline = fetched_at + baseline_days * _DAY
+    if window is None:
+        return baseline
+
+    window_start, window_end = window
+    if fetched_at < window_start:
+        candidate = window_start
+    elif fetched_at < window_end:
+        candidate = min(
+            fetched_at + REVALIDATION_WINDOW_INTERVAL_DAYS * _DAY, window_end
+        )
+    else:
+        candidate = fetched_at + REVALIDATION_OVERDUE_DAYS * _DAY
+    return min(baseline, candidate)
+
+
+class VegvesenRevalidationScheduler:
+    """Keeps every cached vehicle of an entry on its revalidation schedule.
+
+    Due times are kept in memory and updated from the vehicle-updated
+    signal, so each stored or revalidated result reschedules only its own
+    vehicle. A single timer fires at the earliest due time and starts at
+    most REVALIDATION_BATCH_SIZE background revalidations per run.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: VegvesenCoordinator
+    ) -> None:
+        self._hass = hass
+        self._coordinator = coordinator
+        self._due: dict[str, float] = {}  # record key → UTC epoch seconds
+        self._windows: dict[str, _Window] = {}  # record key → window
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_at: float | None = None
+        self._unsub_signal: Callable[[], None] | None = None
+        # Started, but no result has arrived yet
+        self._pending: set[str] = set()
+
+        # Projected lookups per vehicle over _horizon, and their sum
+        self._calls: dict[str, int] = {}
+        self._calls_total = 0
+        self._horizon: tuple[float, float] | None = None
+        self._unsub_projection: CALLBACK_TYPE | None = None
+
+    @property
+    def baseline_days(self) -> int:
+        return self._coordinator.config_entry.options.get(
+            CONF_REVALIDATION_DAYS, DEFAULT_REVALIDATION_DAYS
+        )
+
+    def projected_daily_calls(self) -> float:
+        """Average API calls per day over the projection horizon."""
+        now = dt_util.utcnow().timestamp()
+        if self._horizon is None or now - self._horizon[0] >= _DAY:
+            self._project_all(now)
+        return round(self._calls_total / REVALIDATION_PROJECTION_DAYS, 2)
+
+    # -- lifecycle -------------------------------------------------------------
+
+    @callback
+    def async_start(self) -> None:
+        """Plan every cached vehicle and start the timer."""
+        for key, record in self._coordinator.cache.items():
+            self._plan(key, record)
+        self._unsub_signal = async_dispatcher_connect(
+            self._hass, SIGNAL_VEHICLE_UPDATED, self._async_vehicle_updated
+        )
+        self._schedule()
+        _LOGGER.debug(
+            "Scheduled revalidation for %d vehicle(s), ~%.2f call(s)/day",
+            len(self._due),
+            self.projected_daily_calls(),
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        if self._unsub_signal is not None:
+            self._unsub_signal()
+            self._unsub_signal = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self._timer_at = None
+        if self._unsub_projection is not None:
+            self._unsub_projection()
+            self._unsub_projection = None
+
+    # -- private ---------------------------------------------------------------
+
+    def _plan(self, key: str, record: CachedLookup) -> None:
+        # From the deadline in the record's index: no payload is decoded
+        self._pending.discard(key)
+        window = self._windows[key] = _inspection_window(record.index or {})
+        self._due[key] = _next_due(record.fetched_at, window, self.baseline_days)
+        if self._horizon is not None:
+            self._set_calls(key, self._project(key))
+
+    def _forget(self, key: str) -> None:
+        self._pending.discard(key)
+        self._due.pop(key, None)
+        self._windows.pop(key, None)
+        self._calls_total -= self._calls.pop(key, 0)
+
+    def _project(self, key: str) -> int:
+        return projected_calls(
+            self._due[key], self._windows[key], self.baseline_days, *self._horizon
+        )
+
+    def _set_calls(self, key: str, calls: int) -> None:
+        self._calls_total += calls - self._calls.get(key, 0)
+        self._calls[key] = calls
+
+    def _project_all(self, now: float) -> None:
+        self._horizon = (now, now + REVALIDATION_PROJECTION_DAYS * _DAY)
+        self._calls = {key: self._project(key) for key in self._due}
+        self._calls_total = sum(self._calls.values())
+
+    @callback
+    def _async_vehicle_updated(
+        self, entry_id: str, update: dict[str, Any]
+    ) -> None:
+        if entry_id != self._coordinator.config_entry.entry_id:
+            return
+        key = update["regnr"]
+        record = (
+            None if update.get("removed") else self._coordinator.cache.peek(key)
+        )
+        if record is None:
+            self._forget(key)
+        else:
+            self._plan(key, record)
+        self._schedule()
+        # One projection sensor update per burst of stored results
+        if self._unsub_projection is None:
+            self._unsub_projection = async_call_later(
+                self._hass, REVALIDATION_PROJECTION_DELAY, self._async_projected
+            )
+
+    @callback
+    def _async_projected(self, _now: Any) -> None:
+        self._unsub_projection = None
+        async_dispatcher_send(
+            self._hass,
+            SIGNAL_PROJECTION_UPDATED.format(
+                self._coordinator.config_entry.entry_id
+            ),
+        )
+
+    def _schedule(self) -> None:
+        """Make sure the timer fires by the earliest due time.
+
+        An earlier timer is kept as is, so a steady stream of updates
+        cannot keep pushing due revalidations back.
+        """
+        if not self._due:
+            return
+        # Never sooner than one batch interval: spreads bursts (startup,
+        # many vehicles sharing a deadline) over time.
+        at = max(
+            min(self._due.values()),
+            dt_util.utcnow().timestamp() + REVALIDATION_BATCH_INTERVAL,
+        )
+        if self._unsub_timer is not None:
+            if self._timer_at is not None and self._timer_at <= at:
+                return
+            self._unsub_timer()
+        self._timer_at = at
+        self._unsub_timer = async_track_point_in_utc_time(
+            self._hass, self._async_run, dt_util.utc_from_timestamp(at)
+        )
+
+    @callback
+    def _async_run(self, now: datetime) -> None:
+        self._unsub_timer = None
+        self._timer_at = None
+        timestamp = now.timestamp()
+        due = sorted(
+            (at, key) for key, at in self._due.items() if at <= timestamp
+        )[:REVALIDATION_BATCH_SIZE]
+        for _, key in due:
+            # Pushed back until the result arrives via the signal; if the
+            # lookup fails, it is retried after REVALIDATION_RETRY_SECONDS.
+            self._due[key] = timestamp + REVALIDATION_RETRY_SECONDS
+            if key in self._pending:
+                self._coordinator.metrics.retries += 1
+            self._pending.add(key)
+            self._coordinator.schedule_revalidation(key)
+        if due:
+            _LOGGER.debug("Revalidating %d due vehicle(s)", len(due))
+        self._schedule()
@@ -3,23 +3,38 @@
 from __future__ import annotations
 
 import logging
+from datetime import datetime
 from typing import Any
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_time_change
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
+import homeassistant.util.dt as dt_util
 
+from .attributes import DERIVED_ATTRIBUTES, derive
 from .const import (
+    CONF_ENTITY_MODE,
+    DEFAULT_ENTITY_MODE,
     DOMAIN,
+    ENTITY_MODE_SENSORS,
+    ENTITY_MODE_VEHICLE,
+    QUEUE_UPDATE_DELAY,
+    SIGNAL_FLEET_UPDATED,
+    SIGNAL_PROJECTION_UPDATED,
+    SIGNAL_QUEUE_UPDATED,
     SUPPORTED_ATTRIBUTES,
     AttributeDefinition,
-    safe_get,
+    DerivedAttributeDefinition,
+    FleetAggregateDefinition,
 )
 from .coordinator import VegvesenCoordinator
+from .fleet import FLEET_AGGREGATES
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,16 +49,33 @@ async def async_setup_entry(
 
     entities: list[SensorEntity] = []
 
-    # Vehicle attribute sensors
-    for attr_key, attr_def in SUPPORTED_ATTRIBUTES.items():
-        entities.append(
-            VegvesenAttributeSensor(coordinator, entry, attr_key, attr_def)
-        )
+    # Vehicle attribute sensors (not in events-only mode)
+    entity_mode = entry.options.get(CONF_ENTITY_MODE, DEFAULT_ENTITY_MODE)
+    if entity_mode == ENTITY_MODE_SENSORS:
+        for attr_key, attr_def in SUPPORTED_ATTRIBUTES.items():
+            entities.append(
+                VegvesenAttributeSensor(coordinator, entry, attr_key, attr_def)
+            )
+        for attr_key, derived_def in DERIVED_ATTRIBUTES.items():
+            entities.append(
+                VegvesenDerivedSensor(coordinator, entry, attr_key, derived_def)
+            )
+    elif entity_mode == ENTITY_MODE_VEHICLE:
+        entities.append(VegvesenVehicleSensor(coordinator, entry))
 
     # Diagnostic sensors (always created)
     entities.append(VegvesenLastStatusSensor(coordinator, entry))
     entities.append(VegvesenLastUpdatedSensor(coordinator, entry))
     entities.append(VegvesenRawResponseSensor(coordinator, entry))
+    entities.append(VegvesenQueueDepthSensor(coordinator, entry))
+    entities.append(VegvesenQueueWaitSensor(coordinator, entry))
+    if coordinator.scheduled_revalidation:
+        entities.append(VegvesenProjectedLookupsSensor(coordinator, entry))
+    if coordinator.fleet is not None:
+        for aggregate_key, aggregate_def in FLEET_AGGREGATES.items():
+            entities.append(
+                VegvesenFleetSensor(coordinator, entry, aggregate_key, aggregate_def)
+            )
 
     async_add_entities(entities)
 
@@ -75,6 +107,12 @@ class _VegvesenSensorBase(CoordinatorEntity[VegvesenCoordinator], SensorEntity):
             entry_type=DeviceEntryType.SERVICE,
         )
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counted in the entry's entity_writes metric."""
+        self.coordinator.metrics.entity_writes += 1
+        super().async_write_ha_state()
+
 
 # ---------------------------------------------------------------------------
 # Vehicle attribute sensor
@@ -99,18 +137,156 @@ class VegvesenAttributeSensor(_VegvesenSensorBase):
         self._attr_entity_registry_enabled_default = attr_def.enabled_default
         if attr_def.unit:
             self._attr_native_unit_of_measurement = attr_def.unit
+        self._last_written: tuple[bool, Any] | None = None
 
     @property
     def native_value(self) -> Any | None:
         """Return the attribute value from the latest lookup data."""
-        data = self.coordinator.data
-        if not data:
-            return None
-        value = safe_get(data, *self._attr_def.path)
-        # Convert numeric types to a string-safe representation
-        if value is not None:
-            return value
-        return None
+        return self.coordinator.snapshot.get(self._attr_key)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value or availability changed.
+
+        Most attributes (VIN, make, dimensions …) never change for a plate.
+        An unchanged write would still reach the recorder as a
+        state_reported update, so it is skipped here.
+        """
+        current = (self.available, self.native_value)
+        if current == self._last_written:
+            return
+        self._last_written = current
+        self.async_write_ha_state()
+
+
+# ---------------------------------------------------------------------------
+# Whole-vehicle sensor
+# ---------------------------------------------------------------------------
+
+class VegvesenVehicleSensor(_VegvesenSensorBase):
+    """Single sensor for the whole vehicle (the "vehicle" entity mode).
+
+    State is make and model; every available attribute, including the
+    date-derived ones, is in one attribute map. One registry entry and at
+    most one state write per lookup instead of one per attribute.
+    """
+
+    _attr_name = "Vehicle"
+    _attr_icon = "mdi:car-info"
+    # Up to ~100 attributes per vehicle – only the identifying ones are
+    # kept in the recorder database
+    _unrecorded_attributes = frozenset(
+        (SUPPORTED_ATTRIBUTES.keys() | DERIVED_ATTRIBUTES.keys())
+        - {"registration_number", "make", "model"}
+    )
+
+    def __init__(
+        self,
+        coordinator: VegvesenCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_vehicle"
+        self._last_written: tuple[bool, dict[str, Any]] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_daily_tick, hour=0, minute=0, second=1
+            )
+        )
+
+    @property
+    def native_value(self) -> str | None:
+        snapshot = self.coordinator.snapshot
+        name = " ".join(
+            str(part)
+            for part in (snapshot.get("make"), snapshot.get("model"))
+            if part
+        )
+        return name or None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        snapshot = self.coordinator.snapshot
+        today = dt_util.now().date()
+        derived = {
+            key: value
+            for key in DERIVED_ATTRIBUTES
+            if (value := derive(snapshot, key, today)) is not None
+        }
+        return {**snapshot, **derived}
+
+    @callback
+    def _async_daily_tick(self, now: datetime) -> None:
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when availability or any attribute changed."""
+        current = (self.available, self.extra_state_attributes)
+        if current == self._last_written:
+            return
+        self._last_written = current
+        self.async_write_ha_state()
+
+
+# ---------------------------------------------------------------------------
+# Date-derived sensor
+# ---------------------------------------------------------------------------
+
+class VegvesenDerivedSensor(_VegvesenSensorBase):
+    """Sensor computed locally from a date attribute and today's date.
+
+    Recomputed on every lookup and once a day just after local midnight,
+    so values like "days until next inspection" stay current without
+    re-querying the API.
+    """
+
+    def __init__(
+        self,
+        coordinator: VegvesenCoordinator,
+        entry: ConfigEntry,
+        attr_key: str,
+        derived_def: DerivedAttributeDefinition,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_key = attr_key
+        self._attr_unique_id = f"{entry.entry_id}_{attr_key}"
+        self._attr_name = derived_def.name
+        self._attr_icon = derived_def.icon
+        self._attr_entity_registry_enabled_default = derived_def.enabled_default
+        if derived_def.unit:
+            self._attr_native_unit_of_measurement = derived_def.unit
+        self._last_written: tuple[bool, Any] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_daily_tick, hour=0, minute=0, second=1
+            )
+        )
+
+    @property
+    def native_value(self) -> int | float | None:
+        return derive(
+            self.coordinator.snapshot, self._attr_key, dt_util.now().date()
+        )
+
+    @callback
+    def _async_daily_tick(self, now: datetime) -> None:
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when the value or availability changed."""
+        current = (self.available, self.native_value)
+        if current == self._last_written:
+            return
+        self._last_written = current
+        self.async_write_ha_state()
 
 
 # ---------------------------------------------------------------------------
@@ -147,6 +323,7 @@ class VegvesenLastUpdatedSensor(_VegvesenSensorBase):
     _attr_name = "Last Updated"
     _attr_icon = "mdi:clock-outline"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({"age_seconds", "stale"})
 
     def __init__(
         self,
@@ -160,6 +337,16 @@ class VegvesenLastUpdatedSensor(_VegvesenSensorBase):
     def native_value(self) -> str | None:
         return self.coordinator.last_updated_ts
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        age = self.coordinator.data_age
+        if age is None:
+            return {}
+        return {
+            "age_seconds": int(age),
+            "stale": age >= self.coordinator.freshness_seconds,
+        }
+
 
 # ---------------------------------------------------------------------------
 # Diagnostic: Raw JSON response
@@ -176,6 +363,8 @@ class VegvesenRawResponseSensor(_VegvesenSensorBase):
     _attr_icon = "mdi:code-json"
     _attr_entity_category = EntityCategory.DIAGNOSTIC
     _attr_entity_registry_enabled_default = False  # disabled by default
+    # Up to 16 KB per update – keep it out of the recorder database
+    _unrecorded_attributes = frozenset({"raw_response"})
 
     def __init__(
         self,
@@ -195,3 +384,239 @@ class VegvesenRawResponseSensor(_VegvesenSensorBase):
         if self.coordinator.raw_json:
             attrs["raw_response"] = self.coordinator.raw_json
         return attrs
+
+
+# ---------------------------------------------------------------------------
+# Diagnostic: Lookup queue
+# ---------------------------------------------------------------------------
+
+class _VegvesenQueueSensorBase(_VegvesenSensorBase):
+    """Base for sensors that follow the lookup queue instead of lookups.
+
+    The queue signals every enqueued, started and finished lookup; those
+    are coalesced into at most one write per QUEUE_UPDATE_DELAY, skipped
+    when the value and attributes did not change.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: VegvesenCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._unsub_update: CALLBACK_TYPE | None = None
+        self._last_written: tuple[bool, Any, dict[str, Any]] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_QUEUE_UPDATED.format(self._entry.entry_id),
+                self._async_queue_updated,
+            )
+        )
+        self.async_on_remove(self._async_cancel_update)
+
+    @callback
+    def _async_queue_updated(self) -> None:
+        if self._unsub_update is None:
+            self._unsub_update = async_call_later(
+                self.hass, QUEUE_UPDATE_DELAY, self._async_delayed_update
+            )
+
+    @callback
+    def _async_cancel_update(self) -> None:
+        if self._unsub_update is not None:
+            self._unsub_update()
+            self._unsub_update = None
+
+    @callback
+    def _async_delayed_update(self, _now: Any) -> None:
+        self._unsub_update = None
+        self._handle_coordinator_update()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when availability, value or attributes changed."""
+        current = (
+            self.available,
+            self.native_value,
+            self.extra_state_attributes or {},
+        )
+        if current == self._last_written:
+            return
+        self._last_written = current
+        self.async_write_ha_state()
+
+
+class VegvesenQueueDepthSensor(_VegvesenQueueSensorBase):
+    """Diagnostic sensor showing lookups waiting for a worker."""
+
+    _attr_name = "Lookup Queue Depth"
+    _attr_icon = "mdi:tray-full"
+
+    def __init__(
+        self,
+        coordinator: VegvesenCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_queue_depth"
+
+    @property
+    def native_value(self) -> int:
+        return self.coordinator.queue.depth
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "in_flight": self.coordinator.queue.in_flight,
+            "shed_count": self.coordinator.queue.shed_count,
+        }
+
+
+class VegvesenQueueWaitSensor(_VegvesenQueueSensorBase):
+    """Diagnostic sensor showing how long the last lookup waited in the queue."""
+
+    _attr_name = "Lookup Queue Wait"
+    _attr_icon = "mdi:timer-sand"
+    _attr_native_unit_of_measurement = "ms"
+
+    def __init__(
+        self,
+        coordinator: VegvesenCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_queue_wait"
+
+    @property
+    def native_value(self) -> float | None:
+        wait = self.coordinator.queue.last_wait
+        return round(wait * 1000, 1) if wait is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Diagnostic: Scheduled revalidation
+# ---------------------------------------------------------------------------
+
+class VegvesenProjectedLookupsSensor(_VegvesenSensorBase):
+    """Diagnostic sensor showing the API calls scheduled revalidation will make."""
+
+    _attr_name = "Projected Daily Lookups"
+    _attr_icon = "mdi:chart-timeline-variant"
+    _attr_native_unit_of_measurement = "calls/d"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: VegvesenCoordinator,
+        entry: ConfigEntry,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._attr_unique_id = f"{entry.entry_id}_projected_daily_lookups"
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_PROJECTION_UPDATED.format(self._entry.entry_id),
+                self.async_write_ha_state,
+            )
+        )
+        # The projection horizon moves on daily, also without new results
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_daily_tick, hour=0, minute=0, second=1
+            )
+        )
+
+    @property
+    def native_value(self) -> float:
+        return self.coordinator.revalidation.projected_daily_calls()
+
+    @callback
+    def _async_daily_tick(self, now: datetime) -> None:
+        self.async_write_ha_state()
+
+
+# ---------------------------------------------------------------------------
+# Fleet aggregates
+# ---------------------------------------------------------------------------
+
+class VegvesenFleetSensor(_VegvesenSensorBase):
+    """Sensor for a figure computed over all cached vehicles.
+
+    Follows the fleet store instead of lookups: updated once per burst of
+    stored results, and just after local midnight for date-based figures.
+    """
+
+    def __init__(
+        self,
+        coordinator: VegvesenCoordinator,
+        entry: ConfigEntry,
+        aggregate_key: str,
+        aggregate_def: FleetAggregateDefinition,
+    ) -> None:
+        super().__init__(coordinator, entry)
+        self._definition = aggregate_def
+        self._attr_unique_id = f"{entry.entry_id}_{aggregate_key}"
+        self._attr_name = aggregate_def.name
+        self._attr_icon = aggregate_def.icon
+        self._attr_entity_registry_enabled_default = aggregate_def.enabled_default
+        if aggregate_def.unit:
+            self._attr_native_unit_of_measurement = aggregate_def.unit
+        self._last_written: tuple[Any, dict[str, Any]] | None = None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass,
+                SIGNAL_FLEET_UPDATED.format(self._entry.entry_id),
+                self._async_fleet_updated,
+            )
+        )
+        self.async_on_remove(
+            async_track_time_change(
+                self.hass, self._async_daily_tick, hour=0, minute=0, second=1
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        return True  # independent of the last lookup
+
+    def _aggregates(self) -> dict[str, Any]:
+        return self.coordinator.fleet.aggregates(dt_util.now().date())
+
+    @property
+    def native_value(self) -> Any:
+        return self._definition.value(self._aggregates())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        if self._definition.attributes is None:
+            return None
+        return self._definition.attributes(self._aggregates())
+
+    @callback
+    def _async_daily_tick(self, now: datetime) -> None:
+        self._async_fleet_updated()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Lookups reach this sensor through the fleet store instead."""
+
+    @callback
+    def _async_fleet_updated(self) -> None:
+        """Write state only when the value or attributes changed."""
+        current = (self.native_value, self.extra_state_attributes or {})
+        if current == self._last_written:
+            return
+        self._last_written = current
+        self.async_write_ha_state()
@@ -0,0 +1,408 @@
+"""Cache tier shared between Home Assistant instances.
+
+Several instances using the same API keys can share lookup results and
+daily quota counters through a SQLite file, for instances on one host,
+or a Redis-protocol server (Redis, Valkey, KeyDB …), for instances on
+any host. The shared tier sits behind the per-entry
+VegvesenLookupCache: results are written behind to it, and it is read
+through when the local cache has no fresh result.
+
+Records use the same form as the local storage file:
+    {"payload": <codec blob>, "fetched_at": <UTC epoch>, "vin": <VIN|None>}
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .api import VegvesenQuota
+from .const import (
+    CACHE_BACKEND_REDIS,
+    CACHE_BACKEND_SQLITE,
+    CONF_CACHE_BACKEND,
+    CONF_CACHE_URL,
+    DEFAULT_CACHE_BACKEND,
+    DOMAIN,
+    SHARED_QUOTA_TTL,
+    SHARED_SQLITE_FILENAME,
+)
+
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+except ImportError:  # optional dependency
+    aioredis = None
+    RedisError = OSError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SharedCacheError(Exception):
+    """The shared cache could not be reached or returned bad data."""
+
+
+class SharedCacheBackend(ABC):
+    """Storage for lookup records and counters shared between instances."""
+
+    @abstractmethod
+    async def async_setup(self) -> None:
+        """Connect and prepare the storage."""
+
+    @abstractmethod
+    async def async_close(self) -> None:
+        """Release connections."""
+
+    @abstractmethod
+    async def async_get(self, key: str) -> dict[str, Any] | None:
+        """Return the record for a registration number or VIN."""
+
+    @abstractmethod
+    async def async_put(self, key: str, record: dict[str, Any]) -> None:
+        """Store a record under its record key."""
+
+    @abstractmethod
+    async def async_delete(self, key: str) -> None:
+        """Remove a record."""
+
+    @abstractmethod
+    async def async_incr(self, name: str, ttl: int) -> int:
+        """Increment a counter expiring ttl seconds after creation; return it."""
+
+
+def create_shared_backend(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> SharedCacheBackend | None:
+    """Return the shared backend configured for an entry, if any."""
+    backend = entry.options.get(CONF_CACHE_BACKEND, DEFAULT_CACHE_BACKEND)
+    url = entry.options.get(CONF_CACHE_URL) or ""
+    if backend == CACHE_BACKEND_SQLITE:
+        return SQLiteSharedCache(
+            hass, url or hass.config.path(SHARED_SQLITE_FILENAME)
+        )
+    if backend == CACHE_BACKEND_REDIS:
+        if aioredis is None:
+            _LOGGER.error("Redis cache backend requires the redis package")
+            return None
+        return RedisSharedCache(url)
+    return None
+
+
+@callback
+def async_share_quota(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    backend: SharedCacheBackend,
+    quota: VegvesenQuota,
+    api_key: str,
+) -> None:
+    """Count an API key's calls in a counter shared by all instances."""
+    # Hashed: the shared store must not learn the key itself
+    key_id = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+
+    async def _async_count(day: str) -> None:
+        try:
+            used = await backend.async_incr(
+                f"quota:{key_id}:{day}", SHARED_QUOTA_TTL
+            )
+        except SharedCacheError as err:
+            _LOGGER.debug("Shared quota counter unavailable: %s", err)
+            return
+        quota.update_shared(day, used)
+
+    @callback
+    def _on_acquire(day: str) -> None:
+        entry.async_create_background_task(
+            hass, _async_count(day), f"{DOMAIN} shared quota"
+        )
+
+    quota.on_acquire = _on_acquire
+
+
+# ---------------------------------------------------------------------------
+# SQLite file
+# ---------------------------------------------------------------------------
+
+# File systems on which SQLite's locking, and WAL's shared memory, cannot
+# be relied on between hosts
+_NETWORK_FILESYSTEMS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "9p", "fuse.sshfs"}
+
+
+def _network_filesystem(path: str) -> str | None:
+    """Return the type of the network file system holding path, if any.
+
+    Reads /proc/self/mounts, so only detects anything on Linux.
+    """
+    try:
+        with open("/proc/self/mounts", encoding="utf-8") as mounts:
+            entries = [line.split()[1:3] for line in mounts]
+    except OSError:
+        return None
+    directory = os.path.dirname(os.path.realpath(path))
+    best = ""
+    fstype = None
+    for mount_point, mount_type in entries:
+        mount_point = mount_point.replace("\\040", " ")
+        if (
+            directory == mount_point
+            or directory.startswith(mount_point.rstrip("/") + "/")
+        ) and len(mount_point) >= len(best):
+            best, fstype = mount_point, mount_type
+    return fstype if fstype in _NETWORK_FILESYSTEMS else None
+
+
+class SQLiteSharedCache(SharedCacheBackend):
+    """Shared cache in a SQLite file (WAL mode) for instances on one host.
+
+    WAL keeps readers and the writer of different instances out of each
+    other's way, but needs shared memory between the processes: the file
+    must be on a local file system of the host all instances run on
+    (containers sharing a bind-mounted directory qualify). A file on a
+    network share (NFS, SMB) is refused; instances on different hosts
+    share through the Redis backend instead.
+
+    Queries run in the executor on one connection guarded by a lock. When
+    two instances store the same vehicle, the newer fetch wins.
+    """
+
+    def __init__(self, hass: HomeAssistant, path: str) -> None:
+        self._hass = hass
+        self._path = path
+        self._conn: sqlite3.Connection | None = None
+        self._lock = threading.Lock()
+
+    async def async_setup(self) -> None:
+        await self._run(self._setup)
+
+    async def async_close(self) -> None:
+        # Later calls fail with sqlite3.ProgrammingError → SharedCacheError
+        if self._conn is not None:
+            await self._hass.async_add_executor_job(self._conn.close)
+
+    async def async_get(self, key: str) -> dict[str, Any] | None:
+        return await self._run(self._get, key)
+
+    async def async_put(self, key: str, record: dict[str, Any]) -> None:
+        await self._run(self._put, key, record)
+
+    async def async_delete(self, key: str) -> None:
+        await self._run(self._delete, key)
+
+    async def async_incr(self, name: str, ttl: int) -> int:
+        return await self._run(self._incr, name, ttl)
+
+    # -- executor --------------------------------------------------------------
+
+    async def _run(self, func, *args) -> Any:
+        try:
+            return await self._hass.async_add_executor_job(func, *args)
+        except sqlite3.Error as err:
+            raise SharedCacheError(f"SQLite: {err}") from err
+
+    def _setup(self) -> None:
+        if fstype := _network_filesystem(self._path):
+            raise sqlite3.OperationalError(
+                f"{self._path} is on a network file system ({fstype}), "
+                "which does not support sharing it between hosts; "
+                "use the redis backend"
+            )
+        conn = sqlite3.connect(self._path, timeout=5, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS records (
+                key TEXT PRIMARY KEY,
+                vin TEXT,
+                payload TEXT NOT NULL,
+                fetched_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS records_vin ON records (vin);
+            CREATE TABLE IF NOT EXISTS counters (
+                name TEXT PRIMARY KEY,
+                value INTEGER NOT NULL,
+                expires REAL NOT NULL
+            );
+            """
+        )
+        conn.commit()
+        self._conn = conn
+
+    def _get(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at, vin FROM records "
+                "WHERE key = ? OR vin = ? ORDER BY fetched_at DESC LIMIT 1",
+                (key, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"payload": row[0], "fetched_at": row[1], "vin": row[2]}
+
+    def _put(self, key: str, record: dict[str, Any]) -> None:
+        with self._lock, self._conn:
+            stored = self._conn.execute(
+                "INSERT INTO records (key, vin, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?) ON CONFLICT (key) DO UPDATE SET "
+                "vin = excluded.vin, payload = excluded.payload, "
+                "fetched_at = excluded.fetched_at "
+                "WHERE excluded.fetched_at >= records.fetched_at",
+                (key, record["vin"], record["payload"], record["fetched_at"]),
+            ).rowcount
+            if stored and record["vin"]:
+                # The vehicle under an old plate
+                self._conn.execute(
+                    "DELETE FROM records WHERE vin = ? AND key != ?",
+                    (record["vin"], key),
+                )
+
+    def _delete(self, key: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM records WHERE key = ?", (key,))
+
+    def _incr(self, name: str, ttl: int) -> int:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM counters WHERE expires < ?", (now,))
+            self._conn.execute(
+                "INSERT INTO counters (name, value, expires) VALUES (?, 1, ?) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + 1",
+                (name, now + ttl),
+            )
+            (value,) = self._conn.execute(
+                "SELECT value FROM counters WHERE name = ?", (name,)
+            ).fetchone()
+        return value
+
+
+# ---------------------------------------------------------------------------
+# Redis protocol
+# ---------------------------------------------------------------------------
+
+class RedisSharedCache(SharedCacheBackend):
+    """Shared cache on a Redis-protocol server (requires the redis package).
+
+    Each record is a hash under "<domain>:record:<key>", with a
+    "<domain>:vin:<VIN>" alias pointing at it. Puts follow the same rules
+    as the SQLite backend, atomically in a script: the newer fetch wins,
+    and a vehicle stored under a new plate is removed from its old one.
+    """
+
+    _PREFIX = f"{DOMAIN}:"
+
+    # Stores a record unless the stored one was fetched later; then points
+    # the VIN alias at it and deletes the vehicle's record under another
+    # plate. KEYS[1]: record; ARGV: alias prefix, record prefix, record
+    # key, payload, fetched_at, VIN ('' if none). Returns 1 if stored.
+    _PUT_SCRIPT = """
+        local current = redis.call('HGET', KEYS[1], 'fetched_at')
+        if current and tonumber(current) > tonumber(ARGV[5]) then
+            return 0
+        end
+        redis.call('HSET', KEYS[1], 'payload', ARGV[4],
+                   'fetched_at', ARGV[5], 'vin', ARGV[6])
+        if ARGV[6] ~= '' then
+            local alias = ARGV[1] .. ARGV[6]
+            local previous = redis.call('GET', alias)
+            if previous and previous ~= ARGV[3] then
+                redis.call('DEL', ARGV[2] .. previous)
+            end
+            redis.call('SET', alias, ARGV[3])
+        end
+        return 1
+    """
+
+    # Deletes a record and its VIN alias, unless the alias has meanwhile
+    # been pointed at another plate. KEYS[1]: record; ARGV: alias prefix,
+    # record key.
+    _DELETE_SCRIPT = """
+        local vin = redis.call('HGET', KEYS[1], 'vin')
+        redis.call('DEL', KEYS[1])
+        if vin and vin ~= '' then
+            local alias = ARGV[1] .. vin
+            if redis.call('GET', alias) == ARGV[2] then
+                redis.call('DEL', alias)
+            end
+        end
+    """
+
+    def __init__(self, url: str) -> None:
+        self._url = url
+        self._client = None
+        self._put = None
+        self._delete = None
+
+    async def async_setup(self) -> None:
+        self._client = aioredis.from_url(self._url, decode_responses=True)
+        self._put = self._client.register_script(self._PUT_SCRIPT)
+        self._delete = self._client.register_script(self._DELETE_SCRIPT)
+        await self._call(self._client.ping)
+
+    async def async_close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+
+    async def async_get(self, key: str) -> dict[str, Any] | None:
+        fields = await self._call(self._client.hgetall, self._record(key))
+        if not fields:
+            record_key = await self._call(self._client.get, self._vin(key))
+            if record_key is None:
+                return None
+            fields = await self._call(
+                self._client.hgetall, self._record(record_key)
+            )
+            if not fields:
+                return None
+        try:
+            return {
+                "payload": fields["payload"],
+                "fetched_at": float(fields["fetched_at"]),
+                "vin": fields.get("vin") or None,
+            }
+        except (KeyError, ValueError) as err:
+            raise SharedCacheError(f"Malformed record {key}") from err
+
+    async def async_put(self, key: str, record: dict[str, Any]) -> None:
+        await self._call(
+            self._put,
+            [self._record(key)],
+            [
+                self._vin(""),
+                self._record(""),
+                key,
+                record["payload"],
+                record["fetched_at"],
+                record["vin"] or "",
+            ],
+        )
+
+    async def async_delete(self, key: str) -> None:
+        await self._call(self._delete, [self._record(key)], [self._vin(""), key])
+
+    async def async_incr(self, name: str, ttl: int) -> int:
+        counter = f"{self._PREFIX}{name}"
+        value = int(await self._call(self._client.incr, counter))
+        if value == 1:
+            await self._call(self._client.expire, counter, ttl)
+        return value
+
+    def _record(self, key: str) -> str:
+        return f"{self._PREFIX}record:{key}"
+
+    def _vin(self, vin: str) -> str:
+        return f"{self._PREFIX}vin:{vin}"
+
+    @staticmethod
+    async def _call(func, *args) -> Any:
+        try:
+            return await func(*args)
+        except (RedisError, OSError) as err:
+            raise SharedCacheError(f"Redis: {err}") from err
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import logging
-import re
+import random
+import time
 
 from homeassistant.components.text import TextEntity, TextMode
 from homeassistant.config_entries import ConfigEntry
@@ -12,6 +13,7 @@ from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.start import async_at_started
 
 from .const import (
     CONF_DEBOUNCE_SECONDS,
@@ -19,7 +21,11 @@ from .const import (
     DEFAULT_DEBOUNCE_SECONDS,
     DEFAULT_FALLBACK_LOOKUP_SECONDS,
     DOMAIN,
-    REGNR_PATTERN,
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTERACTIVE,
+    STARTUP_LOOKUP_DELAY,
+    STARTUP_LOOKUP_JITTER,
+    normalize_lookup_key,
 )
 from .coordinator import VegvesenCoordinator
 
@@ -48,8 +54,9 @@ class VegvesenRegnrText(TextEntity, RestoreEntity):
     _attr_icon = "mdi:card-text-outline"
     _attr_mode = TextMode.TEXT
     _attr_native_min = 7
-    _attr_native_max = 8
-    _attr_pattern = r"[A-Za-z]{2} ?\d{5}"
+    _attr_native_max = 17
+    # Registration number, or a 17-character chassis number (VIN)
+    _attr_pattern = r"[A-Za-z]{2} ?\d{5}|[A-HJ-NPR-Za-hj-npr-z0-9]{17}"
 
     def __init__(
         self,
@@ -62,6 +69,8 @@ class VegvesenRegnrText(TextEntity, RestoreEntity):
         self._attr_native_value: str | None = None
         self._debounce_unsub: CALLBACK_TYPE | None = None
         self._fallback_unsub: CALLBACK_TYPE | None = None
+        # First edit since the last lookup (monotonic), for latency metrics
+        self._input_started: float | None = None
 
     # -- Device info -----------------------------------------------------------
 
@@ -75,6 +84,12 @@ class VegvesenRegnrText(TextEntity, RestoreEntity):
             entry_type=DeviceEntryType.SERVICE,
         )
 
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write the state, counted in the entry's entity_writes metric."""
+        self.coordinator.metrics.entity_writes += 1
+        super().async_write_ha_state()
+
     # -- Lifecycle -------------------------------------------------------------
 
     async def async_added_to_hass(self) -> None:
@@ -83,14 +98,17 @@ class VegvesenRegnrText(TextEntity, RestoreEntity):
 
         last_state = await self.async_get_last_state()
         if last_state and last_state.state not in (None, "unknown", "unavailable", ""):
-            restored = last_state.state.upper().replace(" ", "")
-            if re.match(REGNR_PATTERN, restored):
+            restored = normalize_lookup_key(last_state.state)
+            if restored is not None:
                 self._attr_native_value = restored
                 self.coordinator.regnr = restored
-                _LOGGER.debug("Restored regnr: %s – triggering lookup", restored)
-                # Schedule initial lookup shortly after startup
-                async_call_later(
-                    self.hass, 5, self._startup_lookup
+                # Show the stored result right away; the lookup below
+                # revalidates it if it has gone stale.
+                self.coordinator.publish_cached()
+                # Defer the initial lookup until HA has finished starting
+                _LOGGER.debug("Restored regnr: %s", restored)
+                self.async_on_remove(
+                    async_at_started(self.hass, self._schedule_startup_lookup)
                 )
 
     async def async_will_remove_from_hass(self) -> None:
@@ -106,11 +124,13 @@ class VegvesenRegnrText(TextEntity, RestoreEntity):
         self._attr_native_value = normalized
         self.async_write_ha_state()
 
-        if re.match(REGNR_PATTERN, normalized):
+        if normalize_lookup_key(normalized) is not None:
             self.coordinator.regnr = normalized
+            if self._input_started is None:
+                self._input_started = time.monotonic()
             self._schedule_debounced_lookup()
         else:
-            _LOGGER.debug("Value '%s' does not match regnr pattern – no lookup", value)
+            _LOGGER.debug("Value '%s' is not a valid regnr or VIN – no lookup", value)
 
     def set_regnr_from_service(self, value: str) -> None:
         """Set the displayed value *without* triggering debounce.
@@ -120,6 +140,7 @@ class VegvesenRegnrText(TextEntity, RestoreEntity):
         self._attr_native_value = value
         self._cancel_debounce()
         self._cancel_fallback()
+        self._input_started = None
         self.async_write_ha_state()
 
     # -- Debounce logic --------------------------------------------------------
@@ -165,14 +186,28 @@ class VegvesenRegnrText(TextEntity, RestoreEntity):
         self._cancel_debounce()
         self.hass.async_create_task(self._trigger_lookup())
 
+    @callback
+    def _schedule_startup_lookup(self, _hass: HomeAssistant) -> None:
+        """Schedule the initial lookup, jittered so many entries don't
+        hit the API at the same moment."""
+        delay = STARTUP_LOOKUP_DELAY + random.uniform(0, STARTUP_LOOKUP_JITTER)
+        _LOGGER.debug("Startup lookup in %.1fs", delay)
+        self.async_on_remove(
+            async_call_later(self.hass, delay, self._startup_lookup)
+        )
+
     @callback
     def _startup_lookup(self, _now) -> None:
         """Initial lookup after HA start."""
-        self.hass.async_create_task(self._trigger_lookup())
+        self.hass.async_create_task(self._trigger_lookup(PRIORITY_BACKGROUND))
 
-    async def _trigger_lookup(self) -> None:
+    async def _trigger_lookup(self, priority: int = PRIORITY_INTERACTIVE) -> None:
         """Request a refresh from the coordinator."""
-        await self.coordinator.async_request_refresh()
+        input_started, self._input_started = self._input_started, None
+        if priority == PRIORITY_INTERACTIVE:
+            await self.coordinator.async_lookup_now(priority, input_started)
+        else:
+            await self.coordinator.async_request_lookup(priority)
 
     def _cancel_debounce(self) -> None:
         if self._debounce_unsub is not None:
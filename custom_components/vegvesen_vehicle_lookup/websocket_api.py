@@ -0,0 +1,336 @@
+"""WebSocket commands for reading cached vehicle data.
+
+Frontend cards read compact snapshots straight from the lookup cache
+instead of the state machine:
+
+    vegvesen_vehicle_lookup/vehicle    one vehicle by plate or VIN
+    vegvesen_vehicle_lookup/vehicles   paginated fleet list, filterable on
+                                       the FILTER_ATTRIBUTES
+    vegvesen_vehicle_lookup/suggest    plate autocomplete by prefix
+    vegvesen_vehicle_lookup/subscribe  pushes {regnr, set, unset} deltas
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+import homeassistant.util.dt as dt_util
+
+from .cache import CachedLookup, VegvesenLookupCache
+from .const import (
+    ATTR_ENTRY_ID,
+    ATTR_REGNR,
+    DOMAIN,
+    FILTER_ATTRIBUTES,
+    SIGNAL_VEHICLE_UPDATED,
+    WS_PAGE_SIZE_DEFAULT,
+    WS_PAGE_SIZE_MAX,
+    WS_SUGGEST_LIMIT_DEFAULT,
+    WS_SUGGEST_LIMIT_MAX,
+    is_vin,
+    normalize_lookup_key,
+)
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the WebSocket commands (re-registering is harmless)."""
+    websocket_api.async_register_command(hass, ws_get_vehicle)
+    websocket_api.async_register_command(hass, ws_list_vehicles)
+    websocket_api.async_register_command(hass, ws_suggest_vehicles)
+    websocket_api.async_register_command(hass, ws_subscribe_vehicles)
+
+
+def _record_snapshot(record: CachedLookup) -> dict[str, Any]:
+    """Return the record's attributes without keeping its decoded payload."""
+    try:
+        return record.attributes()
+    except ValueError:
+        return {}  # corrupt; dropped when next read via cache.get()
+
+
+def _serialize(
+    key: str, record: CachedLookup, fields: list[str] | None
+) -> dict[str, Any]:
+    snapshot = _record_snapshot(record)
+    if fields is not None:
+        snapshot = {f: snapshot[f] for f in fields if f in snapshot}
+    return {
+        "regnr": key,
+        "fetched_at": dt_util.utc_from_timestamp(record.fetched_at).isoformat(),
+        "data": snapshot,
+    }
+
+
+def _caches(
+    hass: HomeAssistant, entry_id: str | None
+) -> list[VegvesenLookupCache]:
+    """Return the lookup cache of one entry, or those of all entries."""
+    entries = hass.data.get(DOMAIN, {})
+    if entry_id is not None:
+        entries = {entry_id: entries.get(entry_id)}
+    return [
+        entry_data["coordinator"].cache
+        for entry_data in entries.values()
+        if isinstance(entry_data, dict)
+    ]
+
+
+def _records(
+    hass: HomeAssistant, entry_id: str | None, prefix: str | None
+) -> list[tuple[str, CachedLookup]]:
+    """Return cached records of one entry, or the newest per vehicle of all.
+
+    With a prefix, only record keys starting with it, looked up in each
+    cache's sorted key index.
+    """
+    newest: dict[str, CachedLookup] = {}
+    for cache in _caches(hass, entry_id):
+        if prefix:
+            items = [
+                (key, cache.peek(key))
+                for key in cache.keys_with_prefix(prefix, len(cache))
+            ]
+        else:
+            items = cache.items()
+        for key, record in items:
+            current = newest.get(key)
+            if current is None or record.fetched_at > current.fetched_at:
+                newest[key] = record
+    return list(newest.items())
+
+
+def _unknown_attributes(names: list[str]) -> list[str]:
+    from .attributes import SUPPORTED_ATTRIBUTES
+
+    return [name for name in names if name not in SUPPORTED_ATTRIBUTES]
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/vehicle",
+        vol.Required(ATTR_REGNR): str,
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Optional("fields"): [str],
+    }
+)
+@callback
+def ws_get_vehicle(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the cached snapshot of one vehicle."""
+    key = normalize_lookup_key(msg[ATTR_REGNR])
+    if key is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_INVALID_FORMAT, "Invalid regnr/VIN"
+        )
+        return
+
+    best: CachedLookup | None = None
+    for cache in _caches(hass, msg.get(ATTR_ENTRY_ID)):
+        record = cache.get(key)
+        if record is None:
+            continue
+        if best is None or record.fetched_at > best.fetched_at:
+            best = record
+
+    if best is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"{key} is not cached"
+        )
+        return
+    connection.send_result(
+        msg["id"], _serialize(best.key or key, best, msg.get("fields"))
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/vehicles",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Optional("offset", default=0): vol.All(int, vol.Range(min=0)),
+        vol.Optional("limit", default=WS_PAGE_SIZE_DEFAULT): vol.All(
+            int, vol.Range(min=1, max=WS_PAGE_SIZE_MAX)
+        ),
+        # Plate prefix, e.g. "EF5"
+        vol.Optional("prefix"): str,
+        # {attribute: value or [values]} – all must match; FILTER_ATTRIBUTES
+        # only, which are indexed, so filtering never decodes payloads
+        vol.Optional("filter"): {
+            vol.In(FILTER_ATTRIBUTES): vol.Any(str, int, float, bool, list)
+        },
+        vol.Optional("fields"): [str],
+    }
+)
+@callback
+def ws_list_vehicles(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return one page of cached vehicles, sorted by plate.
+
+    The plate prefix uses each cache's sorted key index and attribute
+    filters the per-record index values; only the records on the returned
+    page are decoded.
+    """
+    filters: dict[str, Any] = msg.get("filter", {})
+    fields: list[str] | None = msg.get("fields")
+    if unknown := _unknown_attributes(fields or []):
+        connection.send_error(
+            msg["id"],
+            websocket_api.ERR_INVALID_FORMAT,
+            f"Unknown attribute(s): {', '.join(unknown)}",
+        )
+        return
+
+    prefix = msg.get("prefix", "").upper().replace(" ", "")
+    records = _records(hass, msg.get(ATTR_ENTRY_ID), prefix)
+    if filters:
+        wanted = {
+            attr: value if isinstance(value, list) else [value]
+            for attr, value in filters.items()
+        }
+        records = [
+            (k, r)
+            for k, r in records
+            if all(
+                (r.index or {}).get(attr) in values
+                for attr, values in wanted.items()
+            )
+        ]
+    records.sort(key=lambda item: item[0])
+
+    offset, limit = msg["offset"], msg["limit"]
+    connection.send_result(
+        msg["id"],
+        {
+            "total": len(records),
+            "offset": offset,
+            "vehicles": [
+                _serialize(k, r, fields) for k, r in records[offset : offset + limit]
+            ],
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/suggest",
+        vol.Required("prefix"): vol.All(str, vol.Length(min=1)),
+        vol.Optional("limit", default=WS_SUGGEST_LIMIT_DEFAULT): vol.All(
+            int, vol.Range(min=1, max=WS_SUGGEST_LIMIT_MAX)
+        ),
+    }
+)
+@callback
+def ws_suggest_vehicles(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return cached plates starting with a prefix, with make and model.
+
+    Served from each cache's sorted key index and the records' index
+    values, so the cost depends on the number of suggestions, not on the
+    number of cached vehicles, and no payload is decoded.
+    """
+    prefix = msg["prefix"].upper().replace(" ", "")
+    limit = msg["limit"]
+    caches = _caches(hass, None)
+
+    # Each cache returns sorted keys; merge and drop keys cached twice
+    merged = heapq.merge(
+        *(cache.keys_with_prefix(prefix, limit) for cache in caches)
+    )
+    suggestions: list[dict[str, Any]] = []
+    for key, _ in itertools.islice(itertools.groupby(merged), limit):
+        records = [r for cache in caches if (r := cache.peek(key)) is not None]
+        index = max(records, key=lambda r: r.fetched_at).index or {}
+        suggestions.append(
+            {"regnr": key, "make": index.get("make"), "model": index.get("model")}
+        )
+    connection.send_result(msg["id"], {"suggestions": suggestions})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Optional(ATTR_ENTRY_ID): str,
+        vol.Optional(ATTR_REGNR): vol.Any(str, [str]),
+    }
+)
+@callback
+def ws_subscribe_vehicles(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Push changes of cached vehicles as they are stored.
+
+    Each event is {"entry_id", "regnr", "fetched_at", "set", "unset"} with
+    only the attributes that changed, or {"entry_id", "regnr", "removed"};
+    a refresh that changed nothing is not pushed.
+    Clients fetch the starting state with the vehicle/vehicles commands.
+    Updates carry the record key (the plate); a VIN given as filter is
+    matched through the VIN index of the cache the update came from.
+    """
+    entry_id: str | None = msg.get(ATTR_ENTRY_ID)
+    regnrs: set[str] | None = None
+    vins: set[str] = set()
+    if raw := msg.get(ATTR_REGNR):
+        regnrs = {
+            key
+            for value in (raw if isinstance(raw, list) else [raw])
+            if (key := normalize_lookup_key(value)) is not None
+        }
+        vins = {key for key in regnrs if is_vin(key)}
+        # Plates of those vehicles that are already cached
+        for cache in _caches(hass, None):
+            regnrs.update(
+                record.key
+                for vin in vins
+                if (record := cache.peek(vin)) is not None and record.key
+            )
+
+    @callback
+    def _matches(source_entry_id: str, key: str) -> bool:
+        if regnrs is None or key in regnrs:
+            return True
+        if not vins:
+            return False
+        entry_data = hass.data.get(DOMAIN, {}).get(source_entry_id)
+        if not isinstance(entry_data, dict):
+            return False
+        record = entry_data["coordinator"].cache.peek(key)
+        if record is None or record.vin not in vins:
+            return False
+        # Remember the plate, so its later removal is forwarded as well
+        regnrs.add(key)
+        return True
+
+    @callback
+    def _forward(source_entry_id: str, update: dict[str, Any]) -> None:
+        if entry_id is not None and source_entry_id != entry_id:
+            return
+        if not _matches(source_entry_id, update["regnr"]):
+            return
+        connection.send_message(
+            websocket_api.event_message(
+                msg["id"], {"entry_id": source_entry_id, **update}
+            )
+        )
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_VEHICLE_UPDATED, _forward
+    )
+    connection.send_result(msg["id"])
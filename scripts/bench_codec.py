@@ -0,0 +1,190 @@
+"""Benchmark the stored-payload codec against plain JSON strings.
+
+Reports stored size, compression ratio and encode/decode throughput per
+record for:
+
+    json          json.dumps() strings, as the cache stored them before
+    zlib          zlib level 9 without a preset dictionary
+    codec/zlib    codec.encode() without zstandard (hand-written dictionary)
+    codec/zstd    codec.encode() with zstandard, when it is installed
+    zstd/trained  with --train: zstd with a dictionary trained on half of
+                  the payloads and measured on the other half
+
+Sizes are of the stored strings (base64 for compressed blobs). Payloads
+come from a directory of recorded enkeltoppslag responses (--payloads,
+one JSON file per response or item), or are synthetic (tests/vehicles.py).
+
+    python scripts/bench_codec.py [--count 2000] [--payloads DIR] [--train]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+import importlib.util
+import json
+from pathlib import Path
+import statistics
+import sys
+import time
+import zlib
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from tests.vehicles import make_regnr, make_vehicle  # noqa: E402
+
+# codec.py has no Home Assistant or package-relative imports; load it on
+# its own so the benchmark runs without Home Assistant installed
+_spec = importlib.util.spec_from_file_location(
+    "vegvesen_codec",
+    ROOT / "custom_components" / "vegvesen_vehicle_lookup" / "codec.py",
+)
+codec = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(codec)
+
+REPEAT = 3
+
+
+def load_payloads(directory: Path) -> list[dict]:
+    payloads = []
+    for path in sorted(directory.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict) and "kjoretoydataListe" in data:
+            payloads.extend(data["kjoretoydataListe"])
+        elif isinstance(data, dict):
+            payloads.append(data)
+    return payloads
+
+
+@contextmanager
+def without_zstd() -> Iterator[None]:
+    saved, codec.zstandard = codec.zstandard, None
+    try:
+        yield
+    finally:
+        codec.zstandard = saved
+
+
+def _zlib_encode(data: dict) -> str:
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+    return base64.b64encode(zlib.compress(raw, 9)).decode()
+
+
+def _zlib_decode(text: str) -> dict:
+    return json.loads(zlib.decompress(base64.b64decode(text)))
+
+
+def measure(
+    payloads: list[dict],
+    encode: Callable[[dict], str],
+    decode: Callable[[str], dict],
+) -> dict[str, float]:
+    encode_times, decode_times = [], []
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        encoded = [encode(data) for data in payloads]
+        encode_times.append(time.perf_counter() - started)
+        started = time.perf_counter()
+        for text in encoded:
+            decode(text)
+        decode_times.append(time.perf_counter() - started)
+    assert decode(encoded[0]) == payloads[0]
+    return {
+        "bytes": sum(len(text.encode()) for text in encoded),
+        "encode_us": min(encode_times) / len(payloads) * 1e6,
+        "decode_us": min(decode_times) / len(payloads) * 1e6,
+    }
+
+
+def trained_zstd(payloads: list[dict], size: int) -> tuple[list[dict], dict]:
+    """Train on the first half, return (test half, its measurement)."""
+    zstandard = codec.zstandard
+    raws = [
+        json.dumps(p, ensure_ascii=False, separators=(",", ":")).encode()
+        for p in payloads
+    ]
+    half = len(raws) // 2
+    trained = zstandard.train_dictionary(size, raws[:half])
+    compressor = zstandard.ZstdCompressor(level=10, dict_data=trained)
+    decompressor = zstandard.ZstdDecompressor(dict_data=trained)
+
+    def _encode(data: dict) -> str:
+        raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode()
+        return base64.b64encode(compressor.compress(raw)).decode()
+
+    def _decode(text: str) -> dict:
+        return json.loads(decompressor.decompress(base64.b64decode(text)))
+
+    test = payloads[half:]
+    return test, measure(test, _encode, _decode)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--payloads", type=Path)
+    parser.add_argument("--train", action="store_true")
+    parser.add_argument("--dict-size", type=int, default=16384)
+    args = parser.parse_args()
+
+    if args.payloads:
+        payloads = load_payloads(args.payloads)
+        source = f"{len(payloads)} recorded payloads from {args.payloads}"
+    else:
+        payloads = [make_vehicle(make_regnr(i)) for i in range(args.count)]
+        source = f"{len(payloads)} synthetic payloads"
+    if not payloads:
+        sys.exit("No payloads")
+
+    results: dict[str, tuple[int, dict[str, float]]] = {}
+
+    def _json_encode(data: dict) -> str:
+        return json.dumps(data, ensure_ascii=False)
+
+    baseline = measure(payloads, _json_encode, json.loads)
+    results["json"] = (len(payloads), baseline)
+    results["zlib"] = (len(payloads), measure(payloads, _zlib_encode, _zlib_decode))
+    with without_zstd():
+        results["codec/zlib"] = (
+            len(payloads),
+            measure(payloads, codec.encode, codec.decode),
+        )
+    if codec.zstandard is not None:
+        results["codec/zstd"] = (
+            len(payloads),
+            measure(payloads, codec.encode, codec.decode),
+        )
+        if args.train:
+            test, result = trained_zstd(payloads, args.dict_size)
+            results["zstd/trained"] = (len(test), result)
+    elif args.train:
+        print("--train needs the zstandard package; skipped")
+
+    mean_json = baseline["bytes"] / len(payloads)
+    print(f"{source}, mean plain JSON {mean_json:.0f} B")
+    if codec.zstandard is None:
+        print("zstandard not installed: codec/zstd not measured")
+    print(
+        f"{'variant':<14}{'B/record':>10}{'ratio':>8}"
+        f"{'encode µs':>11}{'decode µs':>11}{'enc MB/s':>10}{'dec MB/s':>10}"
+    )
+    for name, (count, result) in results.items():
+        per_record = result["bytes"] / count
+        print(
+            f"{name:<14}{per_record:>10.0f}{mean_json / per_record:>8.2f}"
+            f"{result['encode_us']:>11.1f}{result['decode_us']:>11.1f}"
+            f"{mean_json / result['encode_us']:>10.1f}"
+            f"{mean_json / result['decode_us']:>10.1f}"
+        )
+    sizes = [len(json.dumps(p, ensure_ascii=False)) for p in payloads]
+    print(
+        f"plain JSON size: median {statistics.median(sizes):.0f} B, "
+        f"max {max(sizes)} B"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests and load harnesses for the Vegvesen Vehicle Lookup integration."""
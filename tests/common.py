@@ -0,0 +1,56 @@
+"""Helpers for setting up entries against the stand-in API."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup.const import (
+    ATTR_REGNR,
+    CONF_API_KEY,
+    CONF_BASE_URL,
+    DOMAIN,
+    SERVICE_LOOKUP,
+)
+
+from .fake_vegvesen import FakeVegvesen
+
+
+def make_entry(server: FakeVegvesen, **options: Any) -> MockConfigEntry:
+    """Return an entry whose API calls go to the stand-in server."""
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="Vegvesen",
+        data={CONF_API_KEY: server.api_key, CONF_BASE_URL: server.url},
+        options=options,
+    )
+
+
+async def async_setup_entries(
+    hass: HomeAssistant, server: FakeVegvesen, count: int = 1, **options: Any
+) -> list[MockConfigEntry]:
+    """Add and set up entries pointed at the stand-in server."""
+    entries = [make_entry(server, **options) for _ in range(count)]
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    return entries
+
+
+async def async_unload_entries(
+    hass: HomeAssistant, entries: list[MockConfigEntry]
+) -> None:
+    for entry in entries:
+        await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+
+async def async_lookup(hass: HomeAssistant, regnr: str | list[str]) -> None:
+    """Call the lookup service and wait for it to finish."""
+    await hass.services.async_call(
+        DOMAIN, SERVICE_LOOKUP, {ATTR_REGNR: regnr}, blocking=True
+    )
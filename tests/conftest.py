@@ -0,0 +1,47 @@
+"""Fixtures for the tests and harnesses (pytest-homeassistant-custom-component)."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup import api as api_module
+
+from .common import async_setup_entries, async_unload_entries
+from .fake_vegvesen import FakeVegvesen
+
+# Client deadline for tests that expect a timeout, seconds
+TEST_API_TIMEOUT = 0.5
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations: None) -> None:
+    """Load the integration from custom_components/."""
+
+
+@pytest.fixture
+async def fake_vegvesen(socket_enabled: None) -> AsyncIterator[FakeVegvesen]:
+    """The stand-in API server (on 127.0.0.1, so sockets are allowed)."""
+    async with FakeVegvesen() as server:
+        yield server
+
+
+@pytest.fixture
+def short_api_timeout(monkeypatch: pytest.MonkeyPatch) -> float:
+    """Shorten the client's total request deadline."""
+    monkeypatch.setattr(api_module, "API_TIMEOUT", TEST_API_TIMEOUT)
+    return TEST_API_TIMEOUT
+
+
+@pytest.fixture
+async def loaded_entry(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen
+) -> AsyncIterator[MockConfigEntry]:
+    """One entry set up against the stand-in server."""
+    entries = await async_setup_entries(hass, fake_vegvesen)
+    yield entries[0]
+    await async_unload_entries(hass, entries)
@@ -0,0 +1,192 @@
+"""Stand-in for the Vegvesen enkeltoppslag API.
+
+An aiohttp app on 127.0.0.1 (random port) that answers
+``?kjennemerke=`` / ``?understellsnummer=`` queries the way the real API
+does, for the end-to-end tests and the load harnesses. Point an entry at
+it with ``base_url=server.url`` in its data.
+
+Vehicles come from recorded responses (``vehicles=`` or
+``FakeVegvesen.from_directory``) or, for any other valid plate, from
+tests/vehicles.py. Latency is drawn per request from ``latency`` (see
+``lognormal_latency``), and faults are injected per key or for all
+requests (a list of faults is used up one per request, None meaning a
+normal answer):
+
+    an HTTP status   400, 401, 404, 429, 500, 503 …
+    FAULT_TIMEOUT    never answer (the client's deadline fires)
+    FAULT_SLOW_BODY  send the headers, then trickle the body
+    FAULT_DROP       close the connection without a response
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Callable, Iterable
+import json
+import math
+from pathlib import Path
+import random
+import re
+from typing import Any
+
+from aiohttp import web
+
+from .vehicles import make_response, make_vehicle
+
+API_KEY = "test-api-key"
+PATH = "/enkeltoppslag/kjoretoydata"
+
+FAULT_TIMEOUT = "timeout"
+FAULT_SLOW_BODY = "slow_body"
+FAULT_DROP = "drop"
+
+_REGNR = re.compile(r"^[A-Z]{2}\d{5}$")
+
+Fault = int | str
+
+
+def lognormal_latency(
+    median: float, sigma: float = 0.5, *, seed: int = 0
+) -> Callable[[], float]:
+    """Return a latency source with the given median (seconds)."""
+    rng = random.Random(seed)
+    mu = math.log(median)
+    return lambda: rng.lognormvariate(mu, sigma)
+
+
+class FakeVegvesen:
+    """The stand-in server; use ``async with`` or start()/stop()."""
+
+    def __init__(
+        self,
+        *,
+        vehicles: Iterable[dict[str, Any]] = (),
+        synthetic: bool = True,
+        latency: Callable[[], float] | None = None,
+        api_key: str = API_KEY,
+    ) -> None:
+        self.api_key = api_key
+        self.synthetic = synthetic
+        self.latency = latency
+        self.vehicles: dict[str, dict[str, Any]] = {}
+        for vehicle in vehicles:
+            self.add_vehicle(vehicle)
+        # Per key, or None for every request; checked before the vehicle
+        self.faults: dict[str | None, Fault | list[Fault | None]] = {}
+        self.slow_body_seconds = 1.0
+        self.requests: Counter[str] = Counter()  # key → requests received
+        self.statuses: Counter[int | str] = Counter()
+        self._runner: web.AppRunner | None = None
+        self.url = ""
+
+    @classmethod
+    def from_directory(cls, directory: Path, **kwargs: Any) -> FakeVegvesen:
+        """Serve recorded responses (one JSON file per response or item)."""
+        server = cls(**kwargs)
+        for path in sorted(directory.glob("*.json")):
+            data = json.loads(path.read_text(encoding="utf-8"))
+            for vehicle in data.get("kjoretoydataListe", [data]):
+                server.add_vehicle(vehicle)
+        return server
+
+    def add_vehicle(self, vehicle: dict[str, Any]) -> None:
+        """Serve a vehicle under its plate and its VIN."""
+        ids = vehicle.get("kjoretoyId", {})
+        for key in (ids.get("kjennemerke"), ids.get("understellsnummer")):
+            if key:
+                self.vehicles[key.upper().replace(" ", "")] = vehicle
+
+    @property
+    def open_connections(self) -> int:
+        """Client connections currently open to the server."""
+        if self._runner is None or self._runner.server is None:
+            return 0
+        return len(self._runner.server.connections)
+
+    # -- lifecycle -------------------------------------------------------------
+
+    async def start(self) -> str:
+        app = web.Application()
+        app.router.add_get(PATH, self._handle)
+        # Cancel handlers whose client has gone (like a timed-out request)
+        self._runner = web.AppRunner(
+            app, handle_signals=False, handler_cancellation=True
+        )
+        await self._runner.setup()
+        await web.TCPSite(self._runner, "127.0.0.1", 0).start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}{PATH}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> FakeVegvesen:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.stop()
+
+    # -- requests --------------------------------------------------------------
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        if request.headers.get("SVV-Authorization") != f"Apikey {self.api_key}":
+            return self._error(401)
+        raw = request.query.get("kjennemerke") or request.query.get(
+            "understellsnummer"
+        )
+        if not raw:
+            return self._error(400)
+        key = raw.upper().replace(" ", "")
+        self.requests[key] += 1
+
+        fault = self.faults.get(key, self.faults.get(None))
+        if isinstance(fault, list):
+            fault = fault.pop(0) if fault else None
+        if fault == FAULT_TIMEOUT:
+            self.statuses[FAULT_TIMEOUT] += 1
+            await asyncio.Event().wait()  # cancelled when the client leaves
+        if self.latency is not None:
+            await asyncio.sleep(self.latency())
+        if fault == FAULT_DROP:
+            self.statuses[FAULT_DROP] += 1
+            request.transport.close()
+            return web.Response()
+        if isinstance(fault, int):
+            return self._error(fault)
+
+        vehicle = self.vehicles.get(key)
+        if vehicle is None and self.synthetic and _REGNR.match(key):
+            vehicle = make_vehicle(key)
+            self.add_vehicle(vehicle)  # also served by VIN from now on
+        if vehicle is None:
+            return self._error(404)
+
+        body = json.dumps(make_response(vehicle), ensure_ascii=False).encode()
+        self.statuses[200] += 1
+        if fault != FAULT_SLOW_BODY:
+            return web.Response(body=body, content_type="application/json")
+
+        self.statuses[FAULT_SLOW_BODY] += 1
+        response = web.StreamResponse(
+            headers={"Content-Type": "application/json"}
+        )
+        response.content_length = len(body)
+        await response.prepare(request)
+        chunks = 10
+        size = -(-len(body) // chunks)
+        for start in range(0, len(body), size):
+            await response.write(body[start : start + size])
+            await asyncio.sleep(self.slow_body_seconds / chunks)
+        await response.write_eof()
+        return response
+
+    def _error(self, status: int) -> web.Response:
+        self.statuses[status] += 1
+        return web.json_response(
+            {"gjeldendeFeilmelding": f"HTTP {status}"}, status=status
+        )
@@ -0,0 +1,126 @@
+"""VegvesenApi against the stand-in server, over real HTTP."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+import time
+
+import aiohttp
+import pytest
+
+from custom_components.vegvesen_vehicle_lookup.api import (
+    VegvesenApi,
+    VegvesenApiError,
+    VegvesenAuthError,
+    VegvesenConnectionError,
+    VegvesenInvalidRequestError,
+    VegvesenNotFoundError,
+    VegvesenQuotaExceededError,
+)
+
+from .fake_vegvesen import FAULT_DROP, FAULT_SLOW_BODY, FAULT_TIMEOUT, FakeVegvesen
+
+REGNR = "EF12345"
+
+
+@pytest.fixture
+async def api(fake_vegvesen: FakeVegvesen) -> AsyncIterator[VegvesenApi]:
+    async with aiohttp.ClientSession() as session:
+        yield VegvesenApi(session, fake_vegvesen.api_key, base_url=fake_vegvesen.url)
+
+
+async def test_lookup(api: VegvesenApi, fake_vegvesen: FakeVegvesen) -> None:
+    vehicle = await api.async_lookup(REGNR)
+
+    assert vehicle["kjoretoyId"]["kjennemerke"] == "EF 12345"
+    assert fake_vegvesen.requests[REGNR] == 1
+    assert api.quota.used == 1
+    assert api.request_count == 1
+    assert len(api.latency) == 1
+
+
+async def test_lookup_vin(api: VegvesenApi, fake_vegvesen: FakeVegvesen) -> None:
+    vin = (await api.async_lookup(REGNR))["kjoretoyId"]["understellsnummer"]
+
+    vehicle = await api.async_lookup_vin(vin)
+
+    assert vehicle["kjoretoyId"]["kjennemerke"] == "EF 12345"
+    assert fake_vegvesen.requests[vin] == 1
+
+
+async def test_not_found(api: VegvesenApi, fake_vegvesen: FakeVegvesen) -> None:
+    fake_vegvesen.synthetic = False
+
+    with pytest.raises(VegvesenNotFoundError):
+        await api.async_lookup(REGNR)
+    assert fake_vegvesen.statuses[404] == 1
+
+
+@pytest.mark.parametrize(
+    ("status", "error"),
+    [
+        (400, VegvesenInvalidRequestError),
+        (401, VegvesenAuthError),
+        (403, VegvesenAuthError),
+        (404, VegvesenNotFoundError),
+        (429, VegvesenQuotaExceededError),
+        (500, VegvesenApiError),
+        (503, VegvesenApiError),
+    ],
+)
+async def test_error_status(
+    api: VegvesenApi,
+    fake_vegvesen: FakeVegvesen,
+    status: int,
+    error: type[VegvesenApiError],
+) -> None:
+    fake_vegvesen.faults[REGNR] = status
+
+    with pytest.raises(error):
+        await api.async_lookup(REGNR)
+
+    # The error response released its connection; the next call works
+    del fake_vegvesen.faults[REGNR]
+    assert await api.async_lookup(REGNR)
+    assert fake_vegvesen.open_connections <= 1
+
+
+async def test_timeout(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen, short_api_timeout: float
+) -> None:
+    fake_vegvesen.faults[REGNR] = FAULT_TIMEOUT
+
+    started = time.monotonic()
+    with pytest.raises(VegvesenConnectionError):
+        await api.async_lookup(REGNR)
+
+    assert time.monotonic() - started < short_api_timeout * 4
+    assert len(api.latency) == 0  # failures are not latency samples
+
+
+async def test_slow_body_times_out(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen, short_api_timeout: float
+) -> None:
+    fake_vegvesen.faults[REGNR] = FAULT_SLOW_BODY
+    fake_vegvesen.slow_body_seconds = short_api_timeout * 10
+
+    with pytest.raises(VegvesenConnectionError):
+        await api.async_lookup(REGNR)
+
+
+async def test_connection_dropped(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen
+) -> None:
+    fake_vegvesen.faults[REGNR] = FAULT_DROP
+
+    with pytest.raises(VegvesenConnectionError):
+        await api.async_lookup(REGNR)
+
+
+async def test_validate_api_key(fake_vegvesen: FakeVegvesen) -> None:
+    async with aiohttp.ClientSession() as session:
+        valid = VegvesenApi(session, fake_vegvesen.api_key, base_url=fake_vegvesen.url)
+        invalid = VegvesenApi(session, "wrong", base_url=fake_vegvesen.url)
+
+        assert await valid.async_validate_api_key()
+        assert not await invalid.async_validate_api_key()
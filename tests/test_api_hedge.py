@@ -0,0 +1,171 @@
+"""Request hedging and the adaptive read timeout, against the stand-in server.
+
+The observed p95 is pinned at P95, so every request answered later than
+that is hedged when the budget allows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+import time
+
+import aiohttp
+import pytest
+
+from custom_components.vegvesen_vehicle_lookup.api import (
+    VegvesenApi,
+    VegvesenApiError,
+    VegvesenNotFoundError,
+)
+from custom_components.vegvesen_vehicle_lookup.const import (
+    API_READ_TIMEOUT,
+    API_READ_TIMEOUT_MIN,
+    HEDGE_MAX_RATIO,
+    LATENCY_MIN_SAMPLES,
+)
+
+from .fake_vegvesen import FAULT_TIMEOUT, Fault, FakeVegvesen
+
+REGNR = "EF12345"
+P95 = 0.05
+
+
+@pytest.fixture
+async def api(
+    fake_vegvesen: FakeVegvesen, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[VegvesenApi]:
+    """A hedging client whose observed p95 is P95."""
+    async with aiohttp.ClientSession() as session:
+        api = VegvesenApi(
+            session, fake_vegvesen.api_key, hedge=True, base_url=fake_vegvesen.url
+        )
+        monkeypatch.setattr(api.latency, "percentile", lambda pct: P95)
+        yield api
+
+
+def _latencies(fake_vegvesen: FakeVegvesen, *seconds: float) -> None:
+    """Answer the next requests after these delays, in order."""
+    delays = list(seconds)
+    fake_vegvesen.latency = lambda: delays.pop(0) if delays else 0.0
+
+
+async def test_no_hedge_within_p95(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen
+) -> None:
+    await api.async_lookup(REGNR)
+
+    assert api.hedge_count == 0
+    assert fake_vegvesen.requests[REGNR] == 1
+
+
+async def test_hedge_after_p95(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen
+) -> None:
+    _latencies(fake_vegvesen, 0.5, 0.0)
+    started = time.monotonic()
+
+    vehicle = await api.async_lookup(REGNR)
+
+    # The hedge's answer, not the original's
+    assert time.monotonic() - started < 0.5
+    assert vehicle["kjoretoyId"]["kjennemerke"] == "EF 12345"
+    assert api.hedge_count == 1
+    assert fake_vegvesen.requests[REGNR] == 2
+    assert api.quota.used == 2
+
+
+async def test_hedges_capped(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen
+) -> None:
+    fake_vegvesen.latency = lambda: 2 * P95
+    lookups = 40
+
+    for _ in range(lookups):
+        await api.async_lookup(REGNR)
+
+    assert api.hedge_count == lookups * HEDGE_MAX_RATIO
+    assert fake_vegvesen.requests[REGNR] == lookups + api.hedge_count
+
+
+@pytest.mark.parametrize(
+    ("faults", "latencies"),
+    [
+        # The original fails after the hedge was sent
+        ([500, None], (0.2, 0.3)),
+        ([FAULT_TIMEOUT, None], (0.1,)),
+        # The hedge fails while the original is pending
+        ([None, 503], (0.3, 0.0)),
+        ([None, 429], (0.3, 0.0)),
+    ],
+    ids=["original 500", "original timeout", "hedge 503", "hedge 429"],
+)
+async def test_other_copy_answers(
+    api: VegvesenApi,
+    fake_vegvesen: FakeVegvesen,
+    faults: list[Fault | None],
+    latencies: tuple[float, ...],
+) -> None:
+    fake_vegvesen.faults[REGNR] = faults
+    _latencies(fake_vegvesen, *latencies)
+
+    vehicle = await api.async_lookup(REGNR)
+
+    assert vehicle["kjoretoyId"]["kjennemerke"] == "EF 12345"
+    assert fake_vegvesen.requests[REGNR] == 2
+
+
+async def test_hedge_over_quota_ignored(
+    api: VegvesenApi,
+    fake_vegvesen: FakeVegvesen,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A hedge finding the quota used up (e.g. by another instance)."""
+    api.quota.limit = 1
+    monkeypatch.setattr(api, "_may_hedge", lambda: True)
+    _latencies(fake_vegvesen, 0.2)
+
+    vehicle = await api.async_lookup(REGNR)
+
+    assert vehicle["kjoretoyId"]["kjennemerke"] == "EF 12345"
+    assert api.hedge_count == 1
+    assert fake_vegvesen.requests[REGNR] == 1
+
+
+async def test_definitive_error_raised_at_once(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen
+) -> None:
+    fake_vegvesen.faults[REGNR] = [None, 404]
+    _latencies(fake_vegvesen, 0.5, 0.0)
+    started = time.monotonic()
+
+    with pytest.raises(VegvesenNotFoundError):
+        await api.async_lookup(REGNR)
+    assert time.monotonic() - started < 0.5
+
+
+async def test_original_error_when_all_fail(
+    api: VegvesenApi, fake_vegvesen: FakeVegvesen
+) -> None:
+    fake_vegvesen.faults[REGNR] = [500, 429]
+    _latencies(fake_vegvesen, 0.1, 0.2)
+
+    with pytest.raises(VegvesenApiError, match="Server error"):
+        await api.async_lookup(REGNR)
+
+
+@pytest.mark.parametrize(
+    ("p95", "read_timeout"),
+    [
+        (None, API_READ_TIMEOUT),
+        (0.1, API_READ_TIMEOUT_MIN),  # 0.4 s, raised to the minimum
+        (2.0, 8.0),
+        (10.0, API_READ_TIMEOUT),  # 40 s, capped
+    ],
+)
+def test_client_timeout(p95: float | None, read_timeout: float) -> None:
+    api = VegvesenApi(None, "key")
+    if p95 is not None:
+        for _ in range(LATENCY_MIN_SAMPLES):
+            api.latency.add(p95)
+
+    assert api._client_timeout().sock_read == read_timeout
@@ -0,0 +1,150 @@
+"""Benchmark: end-to-end lookup throughput and latency through an entry.
+
+Lookups go through the coordinator (cache, lookup queue, API client,
+attribute extraction and the result event) the way batch service calls
+and plate reads do, against the stand-in server with log-normal latency.
+The server serves recorded responses from a directory, written here from
+synthetic vehicles; other plates answer 404. The traffic mixes cache
+hits, misses, 404s and faults (HTTP 500, dropped connections, timeouts)
+in fixed shares, shuffled with a fixed seed.
+
+Reports p50/p95/p99 latency per lookup status and overall, and lookups
+per second. BENCH_LOOKUPS (default 2000) sets the number of lookups.
+
+    pytest -m benchmark -s tests/test_bench_e2e.py
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import defaultdict
+from collections.abc import AsyncIterator
+import json
+import os
+from pathlib import Path
+import random
+import statistics
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup.const import (
+    DOMAIN,
+    PRIORITY_AUTOMATION,
+)
+
+from .common import async_setup_entries, async_unload_entries
+from .fake_vegvesen import FAULT_DROP, FAULT_TIMEOUT, FakeVegvesen, lognormal_latency
+from .vehicles import make_regnr, make_response, make_vehicle
+
+pytestmark = pytest.mark.benchmark
+
+LOOKUPS = int(os.environ.get("BENCH_LOOKUPS", "2000"))
+CONCURRENCY = 10  # lookups in flight at once
+MEDIAN_LATENCY = 0.02  # seconds, API answers
+
+# Share of the lookups per kind; the rest are cache hits
+MISS_SHARE = 0.2  # first lookup of a recorded vehicle
+NOT_FOUND_SHARE = 0.1
+ERROR_SHARE = 0.04  # HTTP 500
+DROP_SHARE = 0.02
+TIMEOUT_SHARE = 0.005
+CACHED = 100  # vehicles looked up before timing, the hits cycle through them
+
+
+@pytest.fixture
+async def server(
+    socket_enabled: None, tmp_path: Path
+) -> AsyncIterator[FakeVegvesen]:
+    """The stand-in, serving recorded responses for the hit and miss plates."""
+    misses = int(LOOKUPS * MISS_SHARE)
+    for index in range(CACHED + misses):
+        regnr = make_regnr(index)
+        (tmp_path / f"{regnr}.json").write_text(
+            json.dumps(make_response(make_vehicle(regnr))), encoding="utf-8"
+        )
+    async with FakeVegvesen.from_directory(
+        tmp_path, synthetic=False, latency=lognormal_latency(MEDIAN_LATENCY)
+    ) as server:
+        yield server
+
+
+def _traffic(server: FakeVegvesen) -> list[str]:
+    """Plates to look up, with faults injected for theirs."""
+    misses = int(LOOKUPS * MISS_SHARE)
+    plates = [make_regnr(CACHED + index) for index in range(misses)]
+    # Plates without a recorded response, from another letter prefix
+    unknown = (make_regnr(100000 + index) for index in range(LOOKUPS))
+    plates += [next(unknown) for _ in range(int(LOOKUPS * NOT_FOUND_SHARE))]
+    for share, fault in (
+        (ERROR_SHARE, 500),
+        (DROP_SHARE, FAULT_DROP),
+        (TIMEOUT_SHARE, FAULT_TIMEOUT),
+    ):
+        for _ in range(int(LOOKUPS * share)):
+            plate = next(unknown)
+            server.faults[plate] = fault
+            plates.append(plate)
+    plates += [make_regnr(i % CACHED) for i in range(LOOKUPS - len(plates))]
+    random.Random(0).shuffle(plates)
+    return plates
+
+
+def _percentiles(samples: list[float]) -> tuple[float, float, float]:
+    """p50, p95 and p99 in ms."""
+    if len(samples) < 2:
+        return (samples[0] * 1000,) * 3 if samples else (float("nan"),) * 3
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return cuts[49] * 1000, cuts[94] * 1000, cuts[98] * 1000
+
+
+async def test_lookup_throughput(
+    hass: HomeAssistant, server: FakeVegvesen, short_api_timeout: float
+) -> None:
+    entries = await async_setup_entries(hass, server)
+    entry_data = hass.data[DOMAIN][entries[0].entry_id]
+    entry_data["api"].quota.limit = 10**9
+    coordinator = entry_data["coordinator"]
+    for index in range(CACHED):
+        await coordinator.async_lookup(make_regnr(index), PRIORITY_AUTOMATION)
+
+    plates = iter(_traffic(server))
+    latencies: dict[str, list[float]] = defaultdict(list)
+
+    async def _worker() -> None:
+        for plate in plates:
+            lookup_started = time.perf_counter()
+            status, _ = await coordinator.async_lookup(plate, PRIORITY_AUTOMATION)
+            latencies[status].append(time.perf_counter() - lookup_started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(CONCURRENCY)))
+    elapsed = time.perf_counter() - started
+    await hass.async_block_till_done()
+
+    every = [seconds for samples in latencies.values() for seconds in samples]
+    rows = [
+        (status, len(samples), *_percentiles(samples))
+        for status, samples in sorted(latencies.items())
+    ]
+    rows.append(("all", len(every), *_percentiles(every)))
+    print(
+        f"\n{LOOKUPS} lookups, {CONCURRENCY} at once, API median "
+        f"{MEDIAN_LATENCY * 1000:.0f} ms: {len(every) / elapsed:.0f} lookups/s\n"
+        f"{'status':<18}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}\n"
+        + "\n".join(
+            f"{status:<18}{count:>7}{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}"
+            for status, count, p50, p95, p99 in rows
+        )
+    )
+
+    assert len(every) == LOOKUPS
+    assert len(latencies["success"]) == int(LOOKUPS * MISS_SHARE)
+    assert len(latencies["not_found"]) == int(LOOKUPS * NOT_FOUND_SHARE)
+    # Hits never wait for the API
+    assert _percentiles(latencies["cached"])[1] < _percentiles(
+        latencies["success"]
+    )[0]
+    await async_unload_entries(hass, entries)
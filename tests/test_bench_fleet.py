@@ -0,0 +1,141 @@
+"""Benchmark: the fleet store at 10k vehicles.
+
+Times loading the store, single-vehicle updates and removals, and the
+aggregates: recomputed after a change, and served from the memo. The
+store is fed record indexes, as the coordinator does. As a baseline, the
+same figures are computed by walking every payload with safe_get, which
+is what each fleet sensor update would cost without the store; both must
+agree.
+
+    pytest -m benchmark -s tests/test_bench_fleet.py
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Callable
+from datetime import date
+import time
+from typing import Any
+
+import pytest
+
+from custom_components.vegvesen_vehicle_lookup.attributes import (
+    SUPPORTED_ATTRIBUTES,
+    parse_api_date,
+)
+from custom_components.vegvesen_vehicle_lookup.cache import _index_values
+from custom_components.vegvesen_vehicle_lookup.const import (
+    FLEET_INSPECTION_DUE_DAYS,
+    safe_get,
+)
+from custom_components.vegvesen_vehicle_lookup.fleet import VegvesenFleetStore
+
+from .vehicles import make_regnr, make_vehicle
+
+pytest.importorskip("numpy")  # VegvesenFleetStore needs it
+
+pytestmark = pytest.mark.benchmark
+
+VEHICLES = 10_000
+UPDATES = 1_000  # single-vehicle set/remove calls timed
+RUNS = 5
+
+
+def _best(func: Callable[[], Any], runs: int = RUNS) -> float:
+    """Fastest of runs calls, in ms."""
+    best = float("inf")
+    for _ in range(runs):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _baseline(records: dict[str, dict], today: date) -> dict[str, Any]:
+    """Vehicle count, CO₂ total, fuel mix and inspections due, per payload."""
+    paths = {
+        name: SUPPORTED_ATTRIBUTES[name].path
+        for name in ("wltp_co2_combined", "fuel_type", "next_inspection_date")
+    }
+    co2_total = 0.0
+    fuel: Counter[str] = Counter()
+    due = 0
+    for data in records.values():
+        co2 = safe_get(data, *paths["wltp_co2_combined"])
+        if isinstance(co2, (int, float)):
+            co2_total += co2
+        if isinstance(name := safe_get(data, *paths["fuel_type"]), str):
+            fuel[name] += 1
+        deadline = parse_api_date(safe_get(data, *paths["next_inspection_date"]))
+        if deadline is not None and (
+            (deadline - today).days <= FLEET_INSPECTION_DUE_DAYS
+        ):
+            due += 1
+    return {
+        "vehicles": len(records),
+        "co2_total": co2_total,
+        "fuel_mix": dict(fuel.most_common()),
+        "inspection_due": due,
+    }
+
+
+def test_fleet_store() -> None:
+    today = date.today()
+    records = {
+        regnr: make_vehicle(regnr, today=today)
+        for regnr in map(make_regnr, range(VEHICLES))
+    }
+    indexes = {regnr: _index_values(data) for regnr, data in records.items()}
+    changed = [
+        (regnr, _index_values(make_vehicle(regnr, seed=index, today=today)))
+        for index, regnr in enumerate(list(records)[:UPDATES])
+    ]
+
+    store = VegvesenFleetStore()
+    load_ms = _best(lambda: VegvesenFleetStore().load(indexes.items()))
+    store.load(indexes.items())
+
+    def _set() -> None:
+        for key, values in changed:
+            store.set(key, values)
+
+    def _remove_and_restore() -> None:
+        for key, _ in changed:
+            store.remove(key)
+        for key, values in changed:
+            store.set(key, values)
+
+    set_ms = _best(_set)
+    remove_ms = _best(_remove_and_restore) - set_ms
+    store.load(indexes.items())
+
+    def _recompute() -> None:
+        store.set(*changed[0])  # a change invalidates the memo
+        store.aggregates(today)
+
+    recompute_ms = _best(_recompute)
+    store.load(indexes.items())
+    memo_ms = _best(lambda: store.aggregates(today), runs=1000)
+    baseline_ms = _best(lambda: _baseline(records, today))
+
+    expected = _baseline(records, today)
+    aggregates = store.aggregates(today)
+    assert {key: aggregates[key] for key in expected} == expected
+
+    rows = [
+        ("load", load_ms, VEHICLES),
+        ("set", set_ms, UPDATES),
+        ("remove", remove_ms, UPDATES),
+        ("aggregates, after a change", recompute_ms, 1),
+        ("aggregates, memo", memo_ms, 1),
+        ("baseline, payload walk", baseline_ms, 1),
+    ]
+    print(
+        f"\n{VEHICLES} vehicles\n{'operation':<28}{'ms':>10}{'µs/call':>10}\n"
+        + "\n".join(
+            f"{name:<28}{ms:>10.2f}{ms * 1000 / calls:>10.2f}"
+            for name, ms, calls in rows
+        )
+    )
+    assert recompute_ms < baseline_ms
@@ -0,0 +1,135 @@
+"""Benchmark: keystroke to sensor value, per debounce setting.
+
+Replays typing patterns into the text entity on a simulated clock (the
+debounce and fallback timers fire as simulated time passes) with the
+stand-in as the API, and reports the simulated time from the first and
+from the last keystroke until the Registration Number sensor shows the
+typed vehicle. The lookup itself runs in zero simulated time; its real
+processing cost (API client, stand-in, coordinator and entity writes,
+all on the event loop thread) is reported as CPU time.
+
+    pytest -m benchmark -s tests/test_bench_input_latency.py
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import time
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_DEBOUNCE_SECONDS,
+    DEFAULT_FALLBACK_LOOKUP_SECONDS,
+    DOMAIN,
+)
+
+from .common import async_setup_entries, async_unload_entries
+from .fake_vegvesen import FakeVegvesen
+from .vehicles import make_regnr
+
+pytestmark = pytest.mark.benchmark
+
+DEBOUNCE_SETTINGS = (0, 1, 2, 5, 10, 15, 30)
+STEP = 0.1  # simulated seconds per clock step
+GIVE_UP = DEFAULT_FALLBACK_LOOKUP_SECONDS + 60  # simulated seconds
+
+
+def _typed(plate: str, interval: float, start: float = 0.0) -> list[tuple]:
+    """One keystroke per character, interval seconds apart."""
+    return [
+        (start + i * interval, plate[: i + 1]) for i in range(len(plate))
+    ]
+
+
+# name → (final plate → [(simulated offset, text entity value)])
+PATTERNS = {
+    # Steady typing, 4 keystrokes per second
+    "steady": lambda plate: _typed(plate, 0.25),
+    # Letters, a 3 s look at the plate, then the digits
+    "pause": lambda plate: [
+        *_typed(plate[:2], 0.3),
+        *_typed(plate, 0.3, 3.0)[2:],
+    ],
+    # Typo in the last digit, noticed and fixed 2 s later
+    "correction": lambda plate: [
+        *_typed(plate[:-1] + "0", 0.25),
+        (3.75, plate[:-1]),
+        (4.0, plate),
+    ],
+    # Another vehicle first; the second typed 20 s later
+    "second_vehicle": lambda plate: [
+        *_typed("ZZ" + plate[2:], 0.25),
+        *_typed(plate, 0.25, 20.0),
+    ],
+}
+
+
+async def _replay(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entry_id: str,
+    keystrokes: list[tuple[float, str]],
+    sensor_id: str,
+    expected: str,
+) -> tuple[float, float, float]:
+    """Return (s from first keystroke, s from last, CPU ms) to the value."""
+    text = hass.data[DOMAIN][entry_id]["text_entity"]
+    now = 0.0
+    cpu = 0.0
+    pending = list(keystrokes)
+    while now <= keystrokes[-1][0] + GIVE_UP:
+        while pending and pending[0][0] <= now:
+            await text.async_set_value(pending.pop(0)[1])
+        started = time.thread_time()
+        await hass.async_block_till_done()
+        cpu += time.thread_time() - started
+        state = hass.states.get(sensor_id)
+        if not pending and state is not None and state.state == expected:
+            return now - keystrokes[0][0], now - keystrokes[-1][0], cpu * 1000
+        freezer.tick(timedelta(seconds=STEP))
+        async_fire_time_changed(hass)
+        now += STEP
+    raise AssertionError(f"{expected} never reached {sensor_id}")
+
+
+@pytest.mark.parametrize("debounce", DEBOUNCE_SETTINGS)
+async def test_input_latency(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    fake_vegvesen: FakeVegvesen,
+    debounce: int,
+) -> None:
+    entries = await async_setup_entries(
+        hass, fake_vegvesen, **{CONF_DEBOUNCE_SECONDS: debounce}
+    )
+    entry_id = entries[0].entry_id
+    sensor_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry_id}_registration_number"
+    )
+    assert sensor_id is not None
+
+    rows = []
+    for index, (name, pattern) in enumerate(PATTERNS.items()):
+        plate = make_regnr(debounce * 100 + index)
+        first, last, cpu = await _replay(
+            hass,
+            freezer,
+            entry_id,
+            pattern(plate),
+            sensor_id,
+            f"{plate[:2]} {plate[2:]}",
+        )
+        rows.append(f"{name:<16}{first:>10.1f}{last:>10.1f}{cpu:>10.1f}")
+    await async_unload_entries(hass, entries)
+
+    print(
+        f"\ndebounce {debounce} s, fallback {DEFAULT_FALLBACK_LOOKUP_SECONDS} s\n"
+        f"{'pattern':<16}{'first s':>10}{'last s':>10}{'CPU ms':>10}\n"
+        + "\n".join(rows)
+    )
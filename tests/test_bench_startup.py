@@ -0,0 +1,114 @@
+"""Benchmark: integration import time and async_setup_entry time.
+
+Import time is measured in a fresh interpreter with ``-X importtime``,
+after the Home Assistant modules the integration uses have been imported,
+so only the integration's own modules are counted: once for the package
+(what loading the integration imports) and once with its platforms. The
+attribute catalog is reported separately, as it should only be loaded by
+the platforms.
+
+Setup time is the wall time of setting up 1 and 50 entries against the
+stand-in API, platforms and entities included (modules already
+imported).
+
+    pytest -m benchmark -s tests/test_bench_startup.py
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from .common import async_setup_entries, async_unload_entries
+from .fake_vegvesen import FakeVegvesen
+
+pytestmark = pytest.mark.benchmark
+
+ROOT = Path(__file__).resolve().parent.parent
+PACKAGE = "custom_components.vegvesen_vehicle_lookup"
+CATALOG = f"{PACKAGE}.attributes"
+PLATFORMS = ("button", "sensor", "text")
+RUNS = 5
+
+# Imported first, so their cost is not attributed to the integration
+_HA_PRELOAD = (
+    "homeassistant.components.http",
+    "homeassistant.components.sensor",
+    "homeassistant.components.text",
+    "homeassistant.components.button",
+    "homeassistant.components.websocket_api",
+    "homeassistant.helpers.aiohttp_client",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.restore_state",
+    "homeassistant.helpers.storage",
+)
+
+
+def _import_times(modules: list[str]) -> dict[str, int]:
+    """Return the self time (µs) of each of our modules imported."""
+    code = "; ".join(f"import {name}" for name in (*_HA_PRELOAD, *modules))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        name = name.strip()
+        if name.startswith(PACKAGE) and self_us.strip().isdigit():
+            times[name] = int(self_us)
+    return times
+
+
+def _best_of(modules: list[str]) -> dict[str, int]:
+    """Per module, the fastest of RUNS fresh imports."""
+    best: dict[str, int] = {}
+    for _ in range(RUNS):
+        for name, us in _import_times(modules).items():
+            best[name] = min(us, best.get(name, us))
+    return best
+
+
+def test_import_time() -> None:
+    package = _best_of([PACKAGE])
+    platforms = _best_of([f"{PACKAGE}.{platform}" for platform in PLATFORMS])
+
+    lines = [f"{'module':<48}{'self ms':>10}"]
+    for name, us in sorted(platforms.items(), key=lambda item: -item[1]):
+        lines.append(f"{name:<48}{us / 1000:>10.2f}")
+    lines.append(f"{'package import':<48}{sum(package.values()) / 1000:>10.2f}")
+    lines.append(f"{'with platforms':<48}{sum(platforms.values()) / 1000:>10.2f}")
+    print("\n" + "\n".join(lines))
+
+    # The catalog is loaded lazily, by the platforms
+    assert CATALOG not in package
+
+
+@pytest.mark.parametrize("count", [1, 50])
+async def test_setup_time(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen, count: int
+) -> None:
+    started = time.perf_counter()
+    entries = await async_setup_entries(hass, fake_vegvesen, count)
+    elapsed = time.perf_counter() - started
+
+    entities = len(hass.states.async_all())
+    await async_unload_entries(hass, entries)
+    print(
+        f"\n{count} entr{'y' if count == 1 else 'ies'}: "
+        f"{elapsed * 1000:.0f} ms total, {elapsed * 1000 / count:.1f} ms/entry, "
+        f"{entities} entities"
+    )
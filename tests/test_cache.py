@@ -0,0 +1,91 @@
+"""Lookup cache: the sorted key index and the bound on its size."""
+
+from __future__ import annotations
+
+import copy
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup import cache as cache_module
+from custom_components.vegvesen_vehicle_lookup.cache import VegvesenLookupCache
+
+from .vehicles import make_vehicle
+
+PLATES = ["AB12345", "EF10000", "EF19999", "EF30000", "ZZ99999"]
+
+
+@pytest.fixture
+def cache(hass: HomeAssistant) -> VegvesenLookupCache:
+    """A cache holding PLATES, stored in shuffled order."""
+    cache = VegvesenLookupCache(hass, "test")
+    for index, regnr in enumerate(reversed(PLATES)):
+        cache.put(regnr, make_vehicle(regnr), float(index))
+    return cache
+
+
+@pytest.mark.parametrize(
+    ("prefix", "keys"),
+    [
+        ("", PLATES),
+        ("EF", ["EF10000", "EF19999", "EF30000"]),
+        ("EF1", ["EF10000", "EF19999"]),
+        ("EF19999", ["EF19999"]),
+        # Between, before and after the stored keys
+        ("EF2", []),
+        ("AA", []),
+        ("ZZ999999", []),
+        ("ZZ", ["ZZ99999"]),
+    ],
+)
+def test_keys_with_prefix(
+    cache: VegvesenLookupCache, prefix: str, keys: list[str]
+) -> None:
+    assert cache.keys_with_prefix(prefix, 10) == keys
+
+
+def test_keys_with_prefix_limit(cache: VegvesenLookupCache) -> None:
+    assert cache.keys_with_prefix("EF", 2) == ["EF10000", "EF19999"]
+    assert cache.keys_with_prefix("", 1) == ["AB12345"]
+
+
+def test_keys_with_prefix_vin_keys(cache: VegvesenLookupCache) -> None:
+    """VINs are record keys only for vehicles stored without a plate."""
+    vehicle = copy.deepcopy(make_vehicle("CD55555"))
+    del vehicle["kjoretoyId"]["kjennemerke"]
+    vin = vehicle["kjoretoyId"]["understellsnummer"]
+    cache.put(vin, vehicle, 10.0)
+    plate_vin = cache.peek("EF10000").vin
+
+    assert cache.keys_with_prefix(vin[:3], 10) == [vin]
+    assert cache.keys_with_prefix(plate_vin, 10) == []
+
+
+def test_keys_follow_removal_and_rekeying(cache: VegvesenLookupCache) -> None:
+    cache.pop("EF19999")
+    # The vehicle of EF30000, re-registered as EF10001
+    vehicle = copy.deepcopy(make_vehicle("EF30000"))
+    vehicle["kjoretoyId"]["kjennemerke"] = "EF 10001"
+    cache.put("EF10001", vehicle, 20.0)
+
+    assert cache.keys_with_prefix("EF", 10) == ["EF10000", "EF10001"]
+
+
+def test_least_recently_used_dropped(
+    cache: VegvesenLookupCache, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cache_module, "CACHE_MAX_ENTRIES", len(PLATES))
+    removed = []
+    cache.on_change = lambda key, record: record is None and removed.append(key)
+    # Stored last to first, so PLATES[-1] is the least recently used; reading
+    # it makes PLATES[-2] the one
+    cache.get(PLATES[-1])
+
+    cache.put("CD55555", make_vehicle("CD55555"), 30.0)
+
+    assert removed == [PLATES[-2]]
+    assert len(cache) == len(PLATES)
+    assert PLATES[-2] not in cache
+    assert make_vehicle(PLATES[-2])["kjoretoyId"]["understellsnummer"] not in cache
+    assert cache.keys_with_prefix("EF3", 10) == []
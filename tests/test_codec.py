@@ -0,0 +1,94 @@
+"""Payload codec: zstd and zlib round-trips, mixed stores, corrupt blobs."""
+
+from __future__ import annotations
+
+import base64
+
+import pytest
+
+from custom_components.vegvesen_vehicle_lookup import codec
+
+from .vehicles import make_vehicle
+
+VEHICLE = make_vehicle("EF12345")
+
+
+@pytest.fixture
+def without_zstd(monkeypatch: pytest.MonkeyPatch) -> None:
+    """As if the optional zstandard package were not installed."""
+    monkeypatch.setattr(codec, "zstandard", None)
+
+
+def _encode_zstd() -> str:
+    pytest.importorskip("zstandard")
+    return codec.encode(VEHICLE)
+
+
+def _encode_zlib(monkeypatch: pytest.MonkeyPatch) -> str:
+    with monkeypatch.context() as patch:
+        patch.setattr(codec, "zstandard", None)
+        return codec.encode(VEHICLE)
+
+
+def test_zstd_round_trip() -> None:
+    encoded = _encode_zstd()
+
+    assert encoded.startswith(f"{codec.CODEC_ZSTD}:1:")
+    assert codec.decode(encoded) == VEHICLE
+
+
+@pytest.mark.usefixtures("without_zstd")
+def test_zlib_round_trip() -> None:
+    encoded = codec.encode(VEHICLE)
+
+    assert encoded.startswith(f"{codec.CODEC_ZLIB}:1:")
+    assert codec.decode(encoded) == VEHICLE
+
+
+def test_zlib_read_with_zstd_installed(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("zstandard")
+
+    assert codec.decode(_encode_zlib(monkeypatch)) == VEHICLE
+
+
+def test_zstd_unreadable_without_zstandard(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    encoded = _encode_zstd()
+    monkeypatch.setattr(codec, "zstandard", None)
+
+    with pytest.raises(ValueError, match="zstandard is not installed"):
+        codec.decode(encoded)
+
+
+@pytest.mark.parametrize("codec_name", [codec.CODEC_ZSTD, codec.CODEC_ZLIB])
+def test_corrupt_payload(
+    monkeypatch: pytest.MonkeyPatch, codec_name: str
+) -> None:
+    if codec_name == codec.CODEC_ZSTD:
+        encoded = _encode_zstd()
+    else:
+        encoded = _encode_zlib(monkeypatch)
+    prefix, text = encoded.rsplit(":", 1)
+    blob = bytearray(base64.b64decode(text))
+    # Flip bits in the middle of the compressed data
+    for index in range(len(blob) // 2, len(blob) // 2 + 8):
+        blob[index] ^= 0xFF
+    corrupt = f"{prefix}:{base64.b64encode(bytes(blob)).decode()}"
+
+    with pytest.raises(ValueError, match="Corrupt payload"):
+        codec.decode(corrupt)
+
+
+@pytest.mark.parametrize(
+    "encoded",
+    [
+        "not a payload",
+        "lz4:1:AAAA",
+        "zlib:99:eJwDAAAAAAE=",
+        "zlib:1:not base64!",
+    ],
+)
+def test_malformed_payload(encoded: str) -> None:
+    with pytest.raises(ValueError):
+        codec.decode(encoded)
@@ -0,0 +1,144 @@
+"""Immediate lookups: coalescing, superseding keys, cancelled callers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.vegvesen_vehicle_lookup.const import (
+    ATTR_REGNR,
+    CONF_DEBOUNCE_SECONDS,
+    DOMAIN,
+    EVENT_LOOKUP_RESULT,
+    PRIORITY_INTERACTIVE,
+    SERVICE_LOOKUP,
+)
+from custom_components.vegvesen_vehicle_lookup.coordinator import (
+    VegvesenCoordinator,
+)
+
+from .common import async_setup_entries, async_unload_entries
+from .fake_vegvesen import FakeVegvesen
+
+REGNR = "EF12345"
+OTHER = "GH67890"
+API_LATENCY = 0.2  # seconds, long enough for the others to join
+
+
+@pytest.fixture
+async def entry(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen
+) -> AsyncIterator[MockConfigEntry]:
+    """An entry whose text entity looks up without debouncing."""
+    fake_vegvesen.latency = lambda: API_LATENCY
+    entries = await async_setup_entries(
+        hass, fake_vegvesen, **{CONF_DEBOUNCE_SECONDS: 0}
+    )
+    yield entries[0]
+    await async_unload_entries(hass, entries)
+
+
+def _coordinator(hass: HomeAssistant, entry: MockConfigEntry) -> VegvesenCoordinator:
+    return hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+
+def _entity_id(hass: HomeAssistant, domain: str, unique_id: str) -> str:
+    entity_id = er.async_get(hass).async_get_entity_id(domain, DOMAIN, unique_id)
+    assert entity_id is not None
+    return entity_id
+
+
+async def _async_requested(server: FakeVegvesen, key: str) -> None:
+    """Wait until the API call for key is in flight."""
+    while not server.requests[key]:
+        await asyncio.sleep(0.01)
+
+
+async def test_triggers_coalesced(
+    hass: HomeAssistant, entry: MockConfigEntry, fake_vegvesen: FakeVegvesen
+) -> None:
+    """Text entity, Lookup Now button and service: one lookup."""
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+
+    await hass.services.async_call(
+        "text",
+        "set_value",
+        {
+            "entity_id": _entity_id(hass, "text", f"{entry.entry_id}_regnr_input"),
+            "value": REGNR,
+        },
+        blocking=True,
+    )
+    await _async_requested(fake_vegvesen, REGNR)
+    await asyncio.gather(
+        hass.services.async_call(
+            "button",
+            "press",
+            {
+                "entity_id": _entity_id(
+                    hass, "button", f"{entry.entry_id}_lookup_now"
+                )
+            },
+            blocking=True,
+        ),
+        hass.services.async_call(
+            DOMAIN, SERVICE_LOOKUP, {ATTR_REGNR: REGNR}, blocking=True
+        ),
+    )
+    await hass.async_block_till_done()
+
+    assert fake_vegvesen.requests[REGNR] == 1
+    assert [event.data["status"] for event in events] == ["success"]
+
+
+async def test_new_key_looked_up_after_running_one(
+    hass: HomeAssistant, entry: MockConfigEntry, fake_vegvesen: FakeVegvesen
+) -> None:
+    """Callers for a new key share one follow-up lookup."""
+    coordinator = _coordinator(hass, entry)
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    coordinator.regnr = REGNR
+    first = hass.async_create_task(coordinator.async_lookup_now(PRIORITY_INTERACTIVE))
+    await _async_requested(fake_vegvesen, REGNR)
+
+    coordinator.regnr = OTHER
+    await asyncio.gather(
+        coordinator.async_lookup_now(PRIORITY_INTERACTIVE),
+        coordinator.async_lookup_now(PRIORITY_INTERACTIVE),
+    )
+    await first
+
+    assert [event.data["regnr"] for event in events] == [REGNR, OTHER]
+    assert fake_vegvesen.requests == {REGNR: 1, OTHER: 1}
+    assert coordinator.snapshot["registration_number"].replace(" ", "") == OTHER
+
+
+async def test_cancelled_caller_leaves_lookup_running(
+    hass: HomeAssistant, entry: MockConfigEntry, fake_vegvesen: FakeVegvesen
+) -> None:
+    coordinator = _coordinator(hass, entry)
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    coordinator.regnr = REGNR
+    caller = hass.async_create_task(
+        coordinator.async_lookup_now(PRIORITY_INTERACTIVE)
+    )
+    await _async_requested(fake_vegvesen, REGNR)
+
+    caller.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    # A later caller joins the lookup that is still running
+    await coordinator.async_lookup_now(PRIORITY_INTERACTIVE)
+
+    assert [event.data["status"] for event in events] == ["success"]
+    assert fake_vegvesen.requests[REGNR] == 1
+    assert coordinator.snapshot["registration_number"].replace(" ", "") == REGNR
@@ -0,0 +1,120 @@
+"""Export service: CSV and NDJSON files, filename checks and admin access."""
+
+from __future__ import annotations
+
+import csv
+import json
+import os
+from pathlib import Path
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry, MockUser
+import pytest
+
+from homeassistant.core import Context, HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, Unauthorized
+
+from custom_components.vegvesen_vehicle_lookup import export
+from custom_components.vegvesen_vehicle_lookup.const import (
+    ATTR_FILENAME,
+    ATTR_FORMAT,
+    DOMAIN,
+    EXPORT_DIR,
+    SERVICE_EXPORT,
+)
+
+from .common import async_lookup
+from .vehicles import make_regnr
+
+PLATES = [make_regnr(i) for i in range(3)]
+
+
+@pytest.fixture
+async def exported(
+    hass: HomeAssistant, tmp_path: Path, loaded_entry: MockConfigEntry
+) -> Path:
+    """Config directory in tmp_path, with PLATES looked up."""
+    hass.config.config_dir = str(tmp_path)
+    await async_lookup(hass, PLATES)
+    return tmp_path / EXPORT_DIR
+
+
+async def _async_export(hass: HomeAssistant, **data) -> dict:
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_EXPORT, data, blocking=True, return_response=True
+    )
+
+
+async def test_csv(hass: HomeAssistant, exported: Path) -> None:
+    response = await _async_export(hass, **{ATTR_FILENAME: "fleet.csv"})
+
+    assert response == {"path": str(exported / "fleet.csv"), "rows": 3}
+    with open(exported / "fleet.csv", encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        rows = list(reader)
+    assert reader.fieldnames[:2] == ["regnr", "fetched_at"]
+    assert "make" in reader.fieldnames
+    assert sorted(row["regnr"] for row in rows) == PLATES
+    assert all(row["make"] for row in rows)
+
+
+async def test_ndjson(hass: HomeAssistant, exported: Path) -> None:
+    response = await _async_export(
+        hass, **{ATTR_FORMAT: "ndjson", ATTR_FILENAME: "fleet.ndjson"}
+    )
+
+    assert response["rows"] == 3
+    lines = (exported / "fleet.ndjson").read_text(encoding="utf-8").splitlines()
+    rows = [json.loads(line) for line in lines]
+    assert sorted(row["regnr"] for row in rows) == PLATES
+    assert all(row["make"] and row["fetched_at"] for row in rows)
+
+
+@pytest.mark.parametrize("filename", ["../fleet.csv", "sub/fleet.csv", ".fleet"])
+async def test_invalid_filename(
+    hass: HomeAssistant, exported: Path, filename: str
+) -> None:
+    with pytest.raises(HomeAssistantError, match="Invalid export filename"):
+        await _async_export(hass, **{ATTR_FILENAME: filename})
+
+
+async def test_failed_write_removes_partial_file(
+    hass: HomeAssistant, exported: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    rows = export._iter_rows
+
+    def _failing_rows(records):
+        yield next(rows(records))
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(export, "_iter_rows", _failing_rows)
+
+    with pytest.raises(OSError):
+        await _async_export(hass, **{ATTR_FILENAME: "fleet.csv"})
+    assert os.listdir(exported) == []
+
+
+async def test_admin_only(
+    hass: HomeAssistant,
+    exported: Path,
+    hass_admin_user: MockUser,
+    hass_read_only_user: MockUser,
+) -> None:
+    with pytest.raises(Unauthorized):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_EXPORT,
+            {},
+            blocking=True,
+            return_response=True,
+            context=Context(user_id=hass_read_only_user.id),
+        )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_EXPORT,
+        {},
+        blocking=True,
+        return_response=True,
+        context=Context(user_id=hass_admin_user.id),
+    )
+    assert response["rows"] == 3
@@ -0,0 +1,102 @@
+"""Fleet store: fed from the record index, on startup and on every lookup."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.vegvesen_vehicle_lookup import codec
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_FLEET_SENSORS,
+    DOMAIN,
+    INDEXED_ATTRIBUTES,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+
+from .common import (
+    async_lookup,
+    async_setup_entries,
+    async_unload_entries,
+    make_entry,
+)
+from .fake_vegvesen import FakeVegvesen
+from .vehicles import make_regnr
+
+pytest.importorskip("numpy")  # VegvesenFleetStore needs it
+
+
+@pytest.fixture
+def decoded(monkeypatch: pytest.MonkeyPatch) -> list[str]:
+    """Payloads passed to codec.decode."""
+    blobs: list[str] = []
+    decode = codec.decode
+    monkeypatch.setattr(
+        codec, "decode", lambda blob: blobs.append(blob) or decode(blob)
+    )
+    return blobs
+
+
+async def test_loaded_from_index(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_vegvesen: FakeVegvesen,
+    decoded: list[str],
+) -> None:
+    """Enabling the store reads stored indexes, not payloads."""
+    entry = make_entry(fake_vegvesen, **{CONF_FLEET_SENSORS: True})
+    hass_storage[f"{STORAGE_KEY}.{entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{STORAGE_KEY}.{entry.entry_id}",
+        "data": {
+            "indexed": list(INDEXED_ATTRIBUTES),
+            "records": {
+                # Not valid payloads: decoding them would fail
+                regnr: {
+                    "payload": "not a payload",
+                    "fetched_at": dt_util.utcnow().timestamp(),
+                    "vin": None,
+                    "index": {"wltp_co2_combined": co2, "fuel_type": "Diesel"},
+                }
+                for regnr, co2 in (("EF12345", 120), ("EF12346", 80))
+            },
+        },
+    }
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    fleet = hass.data[DOMAIN][entry.entry_id]["coordinator"].fleet
+    aggregates = fleet.aggregates(dt_util.now().date())
+    assert aggregates["vehicles"] == 2
+    assert aggregates["co2_total"] == 200
+    assert aggregates["fuel_mix"] == {"Diesel": 2}
+    assert decoded == []
+    await async_unload_entries(hass, [entry])
+
+
+async def test_updated_on_lookup(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen
+) -> None:
+    entries = await async_setup_entries(
+        hass, fake_vegvesen, **{CONF_FLEET_SENSORS: True}
+    )
+    coordinator = hass.data[DOMAIN][entries[0].entry_id]["coordinator"]
+
+    await async_lookup(hass, [make_regnr(1), make_regnr(2)])
+
+    indexes = [record.index for _, record in coordinator.cache.items()]
+    aggregates = coordinator.fleet.aggregates(dt_util.now().date())
+    assert aggregates["vehicles"] == 2
+    assert aggregates["co2_total"] == sum(
+        index.get("wltp_co2_combined", 0) for index in indexes
+    )
+
+    coordinator.cache.pop(make_regnr(1))
+    assert coordinator.fleet.aggregates(dt_util.now().date())["vehicles"] == 1
+    await async_unload_entries(hass, entries)
@@ -0,0 +1,171 @@
+"""Change history: baseline plus deltas, folding, forgetting, change events."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup import cache as cache_module
+from custom_components.vegvesen_vehicle_lookup import history as history_module
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_FRESHNESS_HOURS,
+    CONF_STALE_WHILE_REVALIDATE,
+    DOMAIN,
+    EVENT_VEHICLE_CHANGED,
+    HISTORY_STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+)
+from custom_components.vegvesen_vehicle_lookup.history import VegvesenChangeTracker
+
+from .common import async_lookup, async_setup_entries, async_unload_entries
+from .fake_vegvesen import FakeVegvesen
+
+REGNR = "EF12345"
+BASELINE = {"make": "TESLA", "color": "Hvit", "curb_weight": 1979}
+
+
+async def _async_saved(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> dict:
+    """Let the delayed save run and return the stored vehicles."""
+    # The save is timed on the loop's clock, which follows the frozen one
+    freezer.tick(timedelta(seconds=STORAGE_SAVE_DELAY + 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    return hass_storage[f"{HISTORY_STORAGE_KEY}.test"]["data"]["vehicles"]
+
+
+async def test_baseline_then_deltas(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    tracker = VegvesenChangeTracker(hass, "test")
+
+    assert tracker.record(REGNR, BASELINE, 1.0) == {}
+    # Nothing changed: nothing stored
+    assert tracker.record(REGNR, dict(BASELINE), 2.0) == {}
+    changes = tracker.record(
+        REGNR, {"make": "TESLA", "color": "Svart", "curb_weight": 1979}, 3.0
+    )
+    assert changes == {"color": {"old": "Hvit", "new": "Svart"}}
+    changes = tracker.record(REGNR, {"make": "TESLA", "color": "Svart"}, 4.0)
+    assert changes == {"curb_weight": {"old": 1979, "new": None}}
+
+    assert await _async_saved(hass, hass_storage, freezer) == {
+        REGNR: {
+            "baseline": BASELINE,
+            "baseline_at": 1.0,
+            "deltas": [
+                {"at": 3.0, "set": {"color": "Svart"}},
+                {"at": 4.0, "unset": ["curb_weight"]},
+            ],
+        }
+    }
+
+    # The current snapshot is rebuilt from the stored deltas
+    reloaded = VegvesenChangeTracker(hass, "test")
+    await reloaded.async_load()
+    assert reloaded.record(REGNR, {"make": "TESLA", "color": "Svart"}, 5.0) == {}
+
+
+async def test_oldest_delta_folded_into_baseline(
+    hass: HomeAssistant, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(history_module, "HISTORY_MAX_DELTAS", 2)
+    tracker = VegvesenChangeTracker(hass, "test")
+    tracker.record(REGNR, BASELINE, 1.0)
+
+    for at, weight in ((2.0, 1980), (3.0, 1981), (4.0, 1982)):
+        tracker.record(REGNR, {**BASELINE, "curb_weight": weight}, at)
+
+    history = tracker.history(REGNR)
+    assert history["baseline"] == {**BASELINE, "curb_weight": 1980}
+    assert history["baseline_at"] == 2.0
+    assert history["deltas"] == [
+        {"at": 3.0, "set": {"curb_weight": 1981}},
+        {"at": 4.0, "set": {"curb_weight": 1982}},
+    ]
+    assert tracker.record(REGNR, {**BASELINE, "curb_weight": 1982}, 5.0) == {}
+
+
+async def test_retain_and_forget(hass: HomeAssistant) -> None:
+    tracker = VegvesenChangeTracker(hass, "test")
+    for regnr in ("AB10000", "AB20000", REGNR):
+        tracker.record(regnr, BASELINE, 1.0)
+
+    tracker.retain({"AB10000", REGNR})
+    tracker.forget(REGNR)
+
+    assert tracker.history("AB10000") is not None
+    assert tracker.history("AB20000") is None
+    assert tracker.history(REGNR) is None
+    # Tracked afresh: a new baseline, not a change
+    assert tracker.record(REGNR, {"make": "VOLVO"}, 2.0) == {}
+
+
+async def test_forgotten_when_evicted(
+    hass: HomeAssistant,
+    fake_vegvesen: FakeVegvesen,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(cache_module, "CACHE_MAX_ENTRIES", 1)
+    entries = await async_setup_entries(hass, fake_vegvesen)
+    history = hass.data[DOMAIN][entries[0].entry_id]["coordinator"].history
+
+    await async_lookup(hass, REGNR)
+    assert history.history(REGNR) is not None
+    await async_lookup(hass, "AB10000")
+
+    assert history.history(REGNR) is None
+    assert history.history("AB10000") is not None
+    await async_unload_entries(hass, entries)
+
+
+async def test_vehicle_changed_event(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen
+) -> None:
+    entries = await async_setup_entries(
+        hass,
+        fake_vegvesen,
+        **{CONF_FRESHNESS_HOURS: 0, CONF_STALE_WHILE_REVALIDATE: False},
+    )
+    events = async_capture_events(hass, EVENT_VEHICLE_CHANGED)
+    await async_lookup(hass, REGNR)
+    snapshot = hass.data[DOMAIN][entries[0].entry_id]["coordinator"].snapshot
+    assert events == []
+
+    # Re-weighed and the colour dropped from the register
+    data = fake_vegvesen.vehicles[REGNR]["godkjenning"]["tekniskGodkjenning"]
+    data["tekniskeData"]["vekter"]["egenvekt"] += 10
+    del data["tekniskeData"]["karosseriOgLasteplan"]["rFarge"]
+    await async_lookup(hass, REGNR)
+
+    assert fake_vegvesen.requests[REGNR] == 2
+    assert len(events) == 1
+    assert events[0].data["entry_id"] == entries[0].entry_id
+    assert events[0].data["regnr"] == REGNR
+    assert events[0].data["changes"] == {
+        "curb_weight": {
+            "old": snapshot["curb_weight"],
+            "new": snapshot["curb_weight"] + 10,
+        },
+        "color": {"old": snapshot["color"], "new": None},
+    }
+
+    # Looked up again unchanged: no event
+    await async_lookup(hass, REGNR)
+    assert len(events) == 1
+    await async_unload_entries(hass, entries)
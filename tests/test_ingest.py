@@ -0,0 +1,237 @@
+"""ANPR plate reads: normalisation, the dedupe window, batching, events."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from datetime import timedelta
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.vegvesen_vehicle_lookup import codec, ingest
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_PLATE_EVENT,
+    DOMAIN,
+    EVENT_PLATE_READ,
+    INDEXED_ATTRIBUTES,
+    PLATE_BATCH_SECONDS,
+    PLATE_DEDUPE_SECONDS,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from custom_components.vegvesen_vehicle_lookup.ingest import normalize_plate
+
+from .common import async_setup_entries, async_unload_entries, make_entry
+from .fake_vegvesen import FakeVegvesen
+
+CAMERA_EVENT = "anpr_read"
+REGNR = "EF12345"
+
+
+@pytest.fixture
+async def camera_entry(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen
+) -> AsyncIterator[MockConfigEntry]:
+    """An entry taking plate reads from CAMERA_EVENT."""
+    entries = await async_setup_entries(
+        hass, fake_vegvesen, **{CONF_PLATE_EVENT: CAMERA_EVENT}
+    )
+    yield entries[0]
+    await async_unload_entries(hass, entries)
+
+
+def _metrics(hass: HomeAssistant, entry: MockConfigEntry):
+    return hass.data[DOMAIN][entry.entry_id]["coordinator"].metrics
+
+
+def _read(hass: HomeAssistant, *plates: str) -> None:
+    for plate in plates:
+        hass.bus.async_fire(CAMERA_EVENT, {"plate": plate, "source": "gate"})
+
+
+async def _async_flush(hass: HomeAssistant) -> None:
+    """Let the batch timer fire and the lookups finish."""
+    await hass.async_block_till_done()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=PLATE_BATCH_SECONDS + 0.1)
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+
+@pytest.mark.parametrize(
+    ("raw", "plate"),
+    [
+        ("EF12345", "EF12345"),
+        ("ef 12345", "EF12345"),
+        ("EF-123 45", "EF12345"),
+        ("E 12345", None),
+        ("EF1234", None),
+        ("EF123456", None),
+        ("ÆF12345", None),
+    ],
+)
+def test_normalize_plate(raw: str, plate: str | None) -> None:
+    assert normalize_plate(raw) == plate
+
+
+async def test_read_looked_up_once(
+    hass: HomeAssistant,
+    camera_entry: MockConfigEntry,
+    fake_vegvesen: FakeVegvesen,
+) -> None:
+    events = async_capture_events(hass, EVENT_PLATE_READ)
+
+    _read(hass, "EF 12345", "ef-12345", "EF12345", "not a plate")
+    await _async_flush(hass)
+
+    assert len(events) == 1
+    assert events[0].data["regnr"] == REGNR
+    assert events[0].data["source"] == "gate"
+    assert events[0].data["status"] == "found"
+    assert events[0].data["found"] is True
+    assert events[0].data["data"]["make"]
+    assert fake_vegvesen.requests[REGNR] == 1
+    metrics = _metrics(hass, camera_entry)
+    assert metrics.plate_reads == {"accepted": 1, "duplicate": 2, "invalid": 1}
+    assert metrics.plate_lookups == {"found": 1}
+
+
+async def test_not_found_status(
+    hass: HomeAssistant,
+    camera_entry: MockConfigEntry,
+    fake_vegvesen: FakeVegvesen,
+) -> None:
+    events = async_capture_events(hass, EVENT_PLATE_READ)
+    fake_vegvesen.faults[REGNR] = 404
+
+    _read(hass, REGNR)
+    await _async_flush(hass)
+
+    assert events[0].data["status"] == "not_found"
+    assert events[0].data["found"] is False
+    assert events[0].data["data"] == {}
+    assert _metrics(hass, camera_entry).plate_lookups == {"not_found": 1}
+
+
+async def test_dedupe_window_slides(
+    hass: HomeAssistant,
+    camera_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events = async_capture_events(hass, EVENT_PLATE_READ)
+    # The window runs on the monotonic clock; only the pipeline's is moved
+    clock = SimpleNamespace(now=time.monotonic())
+    monkeypatch.setattr(
+        ingest, "time", SimpleNamespace(monotonic=lambda: clock.now, time=time.time)
+    )
+    step = PLATE_DEDUPE_SECONDS * 0.75
+
+    _read(hass, REGNR)
+    await _async_flush(hass)
+    # A car waiting at the gate: each read is within the window of the last
+    for _ in range(3):
+        clock.now += step
+        _read(hass, REGNR)
+        await _async_flush(hass)
+    assert len(events) == 1
+
+    clock.now += PLATE_DEDUPE_SECONDS + 1
+    _read(hass, REGNR)
+    await _async_flush(hass)
+    assert len(events) == 2
+    assert _metrics(hass, camera_entry).plate_reads == {
+        "accepted": 2,
+        "duplicate": 3,
+    }
+
+
+async def test_full_batch_looked_up_at_once(
+    hass: HomeAssistant,
+    camera_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events = async_capture_events(hass, EVENT_PLATE_READ)
+    monkeypatch.setattr(ingest, "PLATE_BATCH_SIZE", 3)
+
+    _read(hass, "EF10001", "EF10002")
+    await hass.async_block_till_done()
+    assert events == []
+
+    _read(hass, "EF10003")
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert sorted(event.data["regnr"] for event in events) == [
+        "EF10001",
+        "EF10002",
+        "EF10003",
+    ]
+
+
+async def test_backlog_cap(
+    hass: HomeAssistant,
+    camera_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    events = async_capture_events(hass, EVENT_PLATE_READ)
+    monkeypatch.setattr(ingest, "PLATE_MAX_BACKLOG", 2)
+
+    _read(hass, "EF10001", "EF10002", "EF10003", "EF10004")
+    await _async_flush(hass)
+
+    assert sorted(event.data["regnr"] for event in events) == ["EF10001", "EF10002"]
+    assert _metrics(hass, camera_entry).plate_reads == {
+        "accepted": 2,
+        "dropped": 2,
+    }
+
+    # Dropped plates are not remembered as seen
+    _read(hass, "EF10003")
+    await _async_flush(hass)
+    assert len(events) == 3
+
+
+async def test_freshness_without_decoding(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_vegvesen: FakeVegvesen,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    decoded = []
+    decode = codec.decode
+    monkeypatch.setattr(
+        codec, "decode", lambda blob: decoded.append(blob) or decode(blob)
+    )
+    entry = make_entry(fake_vegvesen)
+    hass_storage[f"{STORAGE_KEY}.{entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{STORAGE_KEY}.{entry.entry_id}",
+        "data": {
+            "indexed": list(INDEXED_ATTRIBUTES),
+            "records": {
+                # Not a valid payload: decoding it would fail
+                REGNR: {
+                    "payload": "not a payload",
+                    "fetched_at": dt_util.utcnow().timestamp(),
+                    "vin": None,
+                    "index": {},
+                }
+            },
+        },
+    }
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.data[DOMAIN][entry.entry_id]["coordinator"].is_fresh(REGNR)
+    assert decoded == []
+    await async_unload_entries(hass, [entry])
@@ -0,0 +1,155 @@
+"""Lookup service: choosing entries and spreading batches across them."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+
+from custom_components.vegvesen_vehicle_lookup.const import (
+    ATTR_DEVICE_ID,
+    ATTR_ENTRY_ID,
+    ATTR_REGNR,
+    DOMAIN,
+    EVENT_LOOKUP_RESULT,
+    SERVICE_LOOKUP,
+)
+from custom_components.vegvesen_vehicle_lookup.coordinator import (
+    VegvesenCoordinator,
+)
+
+from .common import async_setup_entries, async_unload_entries
+from .fake_vegvesen import FakeVegvesen
+
+REGNR = "EF12345"
+
+
+@pytest.fixture
+async def entries(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen
+) -> AsyncIterator[list[MockConfigEntry]]:
+    """Three entries against the stand-in server."""
+    entries = await async_setup_entries(hass, fake_vegvesen, count=3)
+    yield entries
+    await async_unload_entries(hass, entries)
+
+
+@pytest.fixture
+def loads(monkeypatch: pytest.MonkeyPatch) -> dict[str, int]:
+    """Pretended load per entry id (0 if not set)."""
+    loads: dict[str, int] = {}
+    monkeypatch.setattr(
+        VegvesenCoordinator,
+        "load",
+        property(lambda self: loads.get(self.config_entry.entry_id, 0)),
+    )
+    return loads
+
+
+def _entry_data(hass: HomeAssistant, entry: MockConfigEntry) -> dict[str, Any]:
+    return hass.data[DOMAIN][entry.entry_id]
+
+
+async def _async_lookup(hass: HomeAssistant, **data: Any) -> None:
+    await hass.services.async_call(DOMAIN, SERVICE_LOOKUP, data, blocking=True)
+
+
+def _looked_up_by(
+    hass: HomeAssistant, entries: list[MockConfigEntry]
+) -> list[str | None]:
+    """The current vehicle of each entry."""
+    return [_entry_data(hass, entry)["coordinator"].regnr for entry in entries]
+
+
+async def test_least_loaded_entry(
+    hass: HomeAssistant, entries: list[MockConfigEntry], loads: dict[str, int]
+) -> None:
+    loads.update(
+        {entries[0].entry_id: 3, entries[1].entry_id: 1, entries[2].entry_id: 2}
+    )
+
+    await _async_lookup(hass, **{ATTR_REGNR: REGNR})
+
+    assert _looked_up_by(hass, entries) == [None, REGNR, None]
+
+
+async def test_exhausted_quota_skipped(
+    hass: HomeAssistant, entries: list[MockConfigEntry], loads: dict[str, int]
+) -> None:
+    loads.update({entries[0].entry_id: 3, entries[2].entry_id: 2})
+    _entry_data(hass, entries[1])["api"].quota.limit = 0
+
+    await _async_lookup(hass, **{ATTR_REGNR: REGNR})
+
+    assert _looked_up_by(hass, entries) == [None, None, REGNR]
+
+
+async def test_all_exhausted_reports_quota(
+    hass: HomeAssistant, entries: list[MockConfigEntry], fake_vegvesen: FakeVegvesen
+) -> None:
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    for entry in entries:
+        _entry_data(hass, entry)["api"].quota.limit = 0
+
+    await _async_lookup(hass, **{ATTR_REGNR: REGNR})
+
+    assert [event.data["status"] for event in events] == ["quota_exceeded"]
+    assert fake_vegvesen.requests[REGNR] == 0
+
+
+async def test_entry_id_target(
+    hass: HomeAssistant, entries: list[MockConfigEntry], loads: dict[str, int]
+) -> None:
+    loads[entries[0].entry_id] = 3
+
+    await _async_lookup(
+        hass, **{ATTR_REGNR: REGNR, ATTR_ENTRY_ID: entries[0].entry_id}
+    )
+    await _async_lookup(hass, **{ATTR_REGNR: "AB10000", ATTR_ENTRY_ID: "unknown"})
+
+    assert _looked_up_by(hass, entries) == [REGNR, None, None]
+
+
+async def test_device_id_target(
+    hass: HomeAssistant, entries: list[MockConfigEntry], loads: dict[str, int]
+) -> None:
+    loads[entries[2].entry_id] = 3
+    device = dr.async_get(hass).async_get_device({(DOMAIN, entries[2].entry_id)})
+
+    await _async_lookup(hass, **{ATTR_REGNR: REGNR, ATTR_DEVICE_ID: device.id})
+
+    assert _looked_up_by(hass, entries) == [None, None, REGNR]
+
+
+async def test_list_fanned_out(
+    hass: HomeAssistant,
+    entries: list[MockConfigEntry],
+    loads: dict[str, int],
+    fake_vegvesen: FakeVegvesen,
+) -> None:
+    """Each plate goes to the entry with the least load plus plates given."""
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    loads[entries[0].entry_id] = 2
+    plates = ["AB10001", "AB10002", "AB10003", "AB10004"]
+
+    await _async_lookup(hass, **{ATTR_REGNR: plates})
+
+    by_entry = {entry.entry_id: set() for entry in entries}
+    for event in events:
+        by_entry[event.data["entry_id"]].add(event.data["regnr"])
+    assert list(by_entry.values()) == [
+        set(),
+        {"AB10001", "AB10003"},
+        {"AB10002", "AB10004"},
+    ]
+    assert all(fake_vegvesen.requests[plate] == 1 for plate in plates)
+    # Batch lookups leave the entries' current vehicles alone
+    assert _looked_up_by(hass, entries) == [None, None, None]
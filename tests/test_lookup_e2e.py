@@ -0,0 +1,97 @@
+"""Lookups through a set-up entry, with the stand-in server as the API."""
+
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup.const import DOMAIN, EVENT_LOOKUP_RESULT
+
+from .common import async_lookup
+from .fake_vegvesen import FAULT_TIMEOUT, FakeVegvesen
+
+REGNR = "EF12345"
+
+
+def _coordinator(hass: HomeAssistant, entry: MockConfigEntry):
+    return hass.data[DOMAIN][entry.entry_id]["coordinator"]
+
+
+async def test_lookup_then_cached(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, fake_vegvesen: FakeVegvesen
+) -> None:
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+
+    await async_lookup(hass, REGNR)
+    await async_lookup(hass, REGNR)
+
+    assert [e.data["status"] for e in events] == ["success", "cached"]
+    assert events[0].data["regnr"] == REGNR
+    assert events[0].data["data"]["make"]
+    assert fake_vegvesen.requests[REGNR] == 1
+    assert _coordinator(hass, loaded_entry).cache.peek(REGNR) is not None
+
+
+async def test_batch_lookup(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, fake_vegvesen: FakeVegvesen
+) -> None:
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    plates = ["EF12345", "EF12346", "EF12347"]
+
+    await async_lookup(hass, plates)
+
+    assert sorted(e.data["regnr"] for e in events) == plates
+    assert {e.data["status"] for e in events} == {"success"}
+    assert sum(fake_vegvesen.requests.values()) == len(plates)
+
+
+async def test_not_found(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, fake_vegvesen: FakeVegvesen
+) -> None:
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    fake_vegvesen.synthetic = False
+
+    await async_lookup(hass, REGNR)
+
+    assert events[0].data["status"] == "not_found"
+    coordinator = _coordinator(hass, loaded_entry)
+    assert coordinator.last_update_success
+    assert coordinator.snapshot == {}
+
+
+async def test_rate_limited(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry, fake_vegvesen: FakeVegvesen
+) -> None:
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    fake_vegvesen.faults[REGNR] = 429
+
+    await async_lookup(hass, REGNR)
+
+    assert events[0].data["status"] == "quota_exceeded"
+    coordinator = _coordinator(hass, loaded_entry)
+    assert not coordinator.last_update_success
+    assert coordinator.cache.peek(REGNR) is None
+
+
+async def test_timeout(
+    hass: HomeAssistant,
+    short_api_timeout: float,
+    loaded_entry: MockConfigEntry,
+    fake_vegvesen: FakeVegvesen,
+) -> None:
+    events = async_capture_events(hass, EVENT_LOOKUP_RESULT)
+    fake_vegvesen.faults[REGNR] = FAULT_TIMEOUT
+
+    await async_lookup(hass, REGNR)
+
+    assert events[0].data["status"] == "connection_error"
+    assert not _coordinator(hass, loaded_entry).last_update_success
+
+    # Served normally once the API answers again
+    del fake_vegvesen.faults[REGNR]
+    await async_lookup(hass, REGNR)
+    assert events[1].data["status"] == "success"
@@ -0,0 +1,135 @@
+"""Metrics endpoint: OpenMetrics text, histograms, entity write counts."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+import re
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.vegvesen_vehicle_lookup.const import (
+    DOMAIN,
+    METRICS_LATENCY_BUCKETS,
+)
+from custom_components.vegvesen_vehicle_lookup.metrics import CONTENT_TYPE
+
+from .common import async_lookup
+
+URL = f"/api/{DOMAIN}/metrics"
+REGNR = "EF12345"
+
+_SAMPLE = re.compile(r"^(\w+)(?:\{(.*)\})? (\S+)$")
+
+
+def _samples(text: str) -> dict[tuple[str, str], float]:
+    """Return {(name, labels): value} of the sample lines."""
+    samples = {}
+    for line in text.splitlines():
+        if not line.startswith("#"):
+            name, labels, value = _SAMPLE.match(line).groups()
+            samples[name, labels or ""] = float(value)
+    return samples
+
+
+async def test_scrape(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    loaded_entry: MockConfigEntry,
+) -> None:
+    await async_lookup(hass, REGNR)
+    await async_lookup(hass, REGNR)
+    client = await hass_client()
+
+    response = await client.get(URL)
+
+    assert response.status == 200
+    assert response.headers["Content-Type"] == CONTENT_TYPE
+    text = await response.text()
+    assert text.endswith("\n# EOF\n")
+    assert text.count("# EOF") == 1
+
+    # Every family has a TYPE and a HELP line
+    lines = text.splitlines()
+    types = {line.split()[2] for line in lines if line.startswith("# TYPE ")}
+    helps = {line.split()[2] for line in lines if line.startswith("# HELP ")}
+    assert types == helps
+    assert {"vegvesen_lookups", "vegvesen_lookup_duration_seconds"} <= types
+
+    entry = f'entry_id="{loaded_entry.entry_id}"'
+    samples = _samples(text)
+    assert samples["vegvesen_lookups_total", f'{entry},status="success"'] == 1
+    assert samples["vegvesen_lookups_total", f'{entry},status="cached"'] == 1
+    assert samples["vegvesen_cache_hits_total", entry] == 1
+
+    # Cumulative buckets, the last (+Inf) equal to the count
+    labels = f'{entry},phase="total"'
+    buckets = [
+        samples["vegvesen_lookup_duration_seconds_bucket", f'{labels},le="{le}"']
+        for le in (*METRICS_LATENCY_BUCKETS, "+Inf")
+    ]
+    assert buckets == sorted(buckets)
+    assert buckets[-1] == 2
+    assert samples["vegvesen_lookup_duration_seconds_count", labels] == 2
+
+
+async def test_scrape_requires_auth(
+    hass: HomeAssistant,
+    hass_client_no_auth: ClientSessionGenerator,
+    loaded_entry: MockConfigEntry,
+) -> None:
+    client = await hass_client_no_auth()
+
+    response = await client.get(URL)
+
+    assert response.status == 401
+
+
+async def test_entity_writes_counts_every_entity(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    """Attribute, diagnostic and queue sensors and the text entity alike."""
+    entity_ids = {
+        entity.entity_id
+        for entity in er.async_entries_for_config_entry(
+            er.async_get(hass), loaded_entry.entry_id
+        )
+    }
+    written: set[str] = set()
+    writes = 0
+
+    @callback
+    def _filter(data: Mapping[str, Any]) -> bool:
+        return data["entity_id"] in entity_ids
+
+    @callback
+    def _count(event: Event) -> None:
+        nonlocal writes
+        writes += 1
+        written.add(event.data["entity_id"])
+
+    for event_type in (EVENT_STATE_CHANGED, EVENT_STATE_REPORTED):
+        hass.bus.async_listen(event_type, _count, event_filter=_filter)
+    metrics = hass.data[DOMAIN][loaded_entry.entry_id]["coordinator"].metrics
+    before = metrics.entity_writes
+
+    await async_lookup(hass, REGNR)
+    await hass.services.async_call(
+        "button",
+        "press",
+        {"entity_id": next(e for e in entity_ids if e.startswith("button."))},
+        blocking=True,
+    )
+    await hass.async_block_till_done()
+
+    assert metrics.entity_writes - before == writes
+    assert {entity_id.split(".")[0] for entity_id in written} >= {
+        "sensor",
+        "text",
+        "button",
+    }
@@ -0,0 +1,128 @@
+"""Profile service: capture limits, single capture and the stats file."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from pathlib import Path
+import pstats
+import threading
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+import pytest
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.util.dt as dt_util
+
+from custom_components.vegvesen_vehicle_lookup import profiler
+from custom_components.vegvesen_vehicle_lookup.const import (
+    ATTR_FILENAME,
+    ATTR_LOOKUPS,
+    ATTR_SECONDS,
+    DATA_PROFILE,
+    DOMAIN,
+    EXPORT_DIR,
+    PROFILE_MAX_SECONDS,
+    SERVICE_PROFILE,
+)
+
+from .common import async_lookup
+from .vehicles import make_regnr
+
+
+@pytest.fixture
+def config_dir(hass: HomeAssistant, tmp_path: Path) -> Path:
+    hass.config.config_dir = str(tmp_path)
+    return tmp_path
+
+
+async def _async_profile(hass: HomeAssistant, **data) -> dict:
+    return await hass.services.async_call(
+        DOMAIN, SERVICE_PROFILE, data, blocking=True, return_response=True
+    )
+
+
+async def test_stops_after_lookups(
+    hass: HomeAssistant, config_dir: Path, loaded_entry: MockConfigEntry
+) -> None:
+    response = await _async_profile(
+        hass, **{ATTR_LOOKUPS: 2, ATTR_FILENAME: "lookups.prof"}
+    )
+    path = config_dir / EXPORT_DIR / "lookups.prof"
+    assert response == {"path": str(path), "lookups": 2, "seconds": 60}
+
+    await async_lookup(hass, make_regnr(1))
+    await hass.async_block_till_done()
+    assert hass.data[DATA_PROFILE] is not None
+
+    await async_lookup(hass, make_regnr(2))
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert DATA_PROFILE not in hass.data
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+async def test_stops_after_seconds(
+    hass: HomeAssistant, config_dir: Path, loaded_entry: MockConfigEntry
+) -> None:
+    await _async_profile(hass, **{ATTR_SECONDS: 5, ATTR_FILENAME: "time.prof"})
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert DATA_PROFILE not in hass.data
+    assert (config_dir / EXPORT_DIR / "time.prof").is_file()
+
+
+async def test_seconds_capped(
+    hass: HomeAssistant, config_dir: Path, loaded_entry: MockConfigEntry
+) -> None:
+    with pytest.raises(vol.Invalid):
+        await _async_profile(hass, **{ATTR_SECONDS: PROFILE_MAX_SECONDS + 1})
+    assert DATA_PROFILE not in hass.data
+
+
+async def test_one_capture_at_a_time(
+    hass: HomeAssistant, config_dir: Path, loaded_entry: MockConfigEntry
+) -> None:
+    await _async_profile(hass)
+
+    with pytest.raises(HomeAssistantError, match="already running"):
+        await _async_profile(hass)
+
+
+@pytest.mark.parametrize("filename", ["../x.prof", "sub/x.prof", ".x.prof"])
+async def test_invalid_filename(
+    hass: HomeAssistant,
+    config_dir: Path,
+    loaded_entry: MockConfigEntry,
+    filename: str,
+) -> None:
+    with pytest.raises(HomeAssistantError, match="Invalid profile filename"):
+        await _async_profile(hass, **{ATTR_FILENAME: filename})
+    assert DATA_PROFILE not in hass.data
+
+
+async def test_stats_written_in_executor(
+    hass: HomeAssistant,
+    config_dir: Path,
+    loaded_entry: MockConfigEntry,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    threads = []
+    write_stats = profiler._write_stats
+
+    def _write_stats(*args) -> None:
+        threads.append(threading.current_thread())
+        write_stats(*args)
+
+    monkeypatch.setattr(profiler, "_write_stats", _write_stats)
+    await _async_profile(hass, **{ATTR_LOOKUPS: 1, ATTR_FILENAME: "x.prof"})
+    await async_lookup(hass, make_regnr(1))
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert (config_dir / EXPORT_DIR / "x.prof").is_file()
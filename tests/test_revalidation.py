@@ -0,0 +1,118 @@
+"""Revalidation schedule and its call projection."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.vegvesen_vehicle_lookup import codec
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_SCHEDULED_REVALIDATION,
+    DOMAIN,
+    INDEXED_ATTRIBUTES,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+from custom_components.vegvesen_vehicle_lookup.revalidation import (
+    next_revalidation,
+    projected_calls,
+)
+
+from .common import async_unload_entries, make_entry
+from .fake_vegvesen import FakeVegvesen
+
+_DAY = 86400
+BASELINE_DAYS = 90
+
+
+@pytest.fixture(autouse=True)
+def midday(freezer: FrozenDateTimeFactory) -> None:
+    """Noon, with no DST change within the windows and horizons used."""
+    freezer.move_to("2024-05-15 12:00:00-07:00")
+
+
+def _snapshot(deadline_in_days: int) -> dict[str, str]:
+    deadline = dt_util.now().date() + timedelta(days=deadline_in_days)
+    return {"next_inspection_date": deadline.isoformat()}
+
+
+def _window(deadline_in_days: int) -> tuple[float, float]:
+    deadline = dt_util.now().date() + timedelta(days=deadline_in_days)
+    return (
+        dt_util.start_of_local_day(deadline - timedelta(days=60)).timestamp(),
+        dt_util.start_of_local_day(deadline + timedelta(days=3)).timestamp(),
+    )
+
+
+def test_without_deadline_only_baseline() -> None:
+    now = dt_util.utcnow().timestamp()
+
+    assert next_revalidation(now, {}, BASELINE_DAYS) == now + 90 * _DAY
+    assert projected_calls(now + 10 * _DAY, None, 90, now, now + 30 * _DAY) == 1
+
+
+def test_in_window_counts_every_recheck() -> None:
+    """Deadline in 20 days: re-checked in the window, then while overdue."""
+    now = dt_util.utcnow().timestamp()
+    due = next_revalidation(now, _snapshot(20), BASELINE_DAYS)
+    assert due == now + 14 * _DAY
+
+    calls = projected_calls(due, _window(20), BASELINE_DAYS, now, now + 30 * _DAY)
+
+    # day 14, the window end 3 days past the deadline, a week later overdue
+    assert calls == 3
+
+
+def test_far_deadline_outside_horizon() -> None:
+    now = dt_util.utcnow().timestamp()
+    due = next_revalidation(now, _snapshot(400), BASELINE_DAYS)
+
+    assert projected_calls(due, _window(400), 90, now, now + 30 * _DAY) == 0
+
+
+async def test_planned_from_index(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    fake_vegvesen: FakeVegvesen,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Startup plans every stored vehicle without decoding its payload."""
+    decoded = []
+    decode = codec.decode
+    monkeypatch.setattr(
+        codec, "decode", lambda blob: decoded.append(blob) or decode(blob)
+    )
+    entry = make_entry(fake_vegvesen, **{CONF_SCHEDULED_REVALIDATION: True})
+    deadline = dt_util.now().date() + timedelta(days=20)
+    hass_storage[f"{STORAGE_KEY}.{entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{STORAGE_KEY}.{entry.entry_id}",
+        "data": {
+            "indexed": list(INDEXED_ATTRIBUTES),
+            "records": {
+                # Not a valid payload: decoding it would fail
+                "EF12345": {
+                    "payload": "not a payload",
+                    "fetched_at": dt_util.utcnow().timestamp(),
+                    "vin": None,
+                    "index": {"next_inspection_date": deadline.isoformat()},
+                }
+            },
+        },
+    }
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    revalidation = hass.data[DOMAIN][entry.entry_id]["coordinator"].revalidation
+    # day 14, the window end 3 days past the deadline, a week later overdue
+    assert revalidation.projected_daily_calls() == round(3 / 30, 2)
+    assert decoded == []
+    await async_unload_entries(hass, [entry])
@@ -0,0 +1,196 @@
+"""Sensor entities: state writes, recorded attributes, date-derived values."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.const import EVENT_STATE_CHANGED, EVENT_STATE_REPORTED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+import homeassistant.util.dt as dt_util
+
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_ENTITY_MODE,
+    DOMAIN,
+    ENTITY_MODE_VEHICLE,
+    QUEUE_UPDATE_DELAY,
+    SIGNAL_QUEUE_UPDATED,
+)
+from custom_components.vegvesen_vehicle_lookup.sensor import VegvesenVehicleSensor
+
+from .common import (
+    async_lookup,
+    async_setup_entries,
+    async_unload_entries,
+    make_entry,
+)
+from .fake_vegvesen import FakeVegvesen
+from .vehicles import make_vehicle
+
+REGNR = "EF12345"
+DERIVED = ("days_until_next_inspection", "days_since_last_inspection", "vehicle_age")
+
+
+def _entity_id(hass: HomeAssistant, entry: MockConfigEntry, suffix: str) -> str:
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "sensor", DOMAIN, f"{entry.entry_id}_{suffix}"
+    )
+    assert entity_id is not None
+    return entity_id
+
+
+class _Writes:
+    """Counts state writes (changed or only reported) of one entity."""
+
+    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
+        self.count = 0
+
+        @callback
+        def _filter(data: Mapping[str, Any]) -> bool:
+            return data["entity_id"] == entity_id
+
+        @callback
+        def _count(event: Event) -> None:
+            self.count += 1
+
+        for event_type in (EVENT_STATE_CHANGED, EVENT_STATE_REPORTED):
+            hass.bus.async_listen(event_type, _count, event_filter=_filter)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+async def test_queue_updates_coalesced(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> None:
+    entity_id = _entity_id(hass, loaded_entry, "queue_depth")
+    coordinator = hass.data[DOMAIN][loaded_entry.entry_id]["coordinator"]
+    signal = SIGNAL_QUEUE_UPDATED.format(loaded_entry.entry_id)
+    writes = _Writes(hass, entity_id)
+
+    coordinator.queue.shed_count += 1
+    for _ in range(5):
+        async_dispatcher_send(hass, signal)
+    await hass.async_block_till_done()
+    assert len(writes) == 0
+
+    delay = timedelta(seconds=QUEUE_UPDATE_DELAY + 0.1)
+    async_fire_time_changed(hass, dt_util.utcnow() + delay)
+    await hass.async_block_till_done()
+    assert len(writes) == 1
+    assert hass.states.get(entity_id).attributes["shed_count"] == 1
+
+    # Nothing changed: no write
+    async_dispatcher_send(hass, signal)
+    async_fire_time_changed(hass, dt_util.utcnow() + 2 * delay)
+    await hass.async_block_till_done()
+    assert len(writes) == 1
+
+
+async def test_vehicle_sensor(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen
+) -> None:
+    entries = await async_setup_entries(
+        hass, fake_vegvesen, **{CONF_ENTITY_MODE: ENTITY_MODE_VEHICLE}
+    )
+    entity_id = _entity_id(hass, entries[0], "vehicle")
+    writes = _Writes(hass, entity_id)
+
+    await async_lookup(hass, REGNR)
+
+    state = hass.states.get(entity_id)
+    snapshot = hass.data[DOMAIN][entries[0].entry_id]["coordinator"].snapshot
+    assert state.state == f"{snapshot['make']} {snapshot['model']}"
+    assert state.attributes["registration_number"] == snapshot["registration_number"]
+    assert state.attributes["chassis_number"] == snapshot["chassis_number"]
+    assert "days_until_next_inspection" in state.attributes
+    assert len(writes) == 1
+
+    # Served from the cache, nothing changed: no write
+    await async_lookup(hass, REGNR)
+    assert len(writes) == 1
+    assert fake_vegvesen.requests[REGNR] == 1
+    await async_unload_entries(hass, entries)
+
+
+def test_vehicle_sensor_unrecorded_attributes() -> None:
+    """Only the identifying attributes go to the recorder."""
+    unrecorded = VegvesenVehicleSensor._unrecorded_attributes
+
+    assert {"registration_number", "make", "model"}.isdisjoint(unrecorded)
+    assert {"chassis_number", "days_until_next_inspection"} <= unrecorded
+
+
+async def test_derived_sensors_refreshed_at_midnight(
+    hass: HomeAssistant,
+    fake_vegvesen: FakeVegvesen,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    freezer.move_to("2024-05-15 12:00:00-07:00")
+    vehicle = make_vehicle(REGNR)
+    vehicle["periodiskKjoretoyKontroll"] = {
+        "kontrollfrist": "2024-06-14",
+        "sistGodkjent": "2022-06-14",
+    }
+    # 3634 days old, just under 9.95 years: rounded to 10.0 a day later
+    vehicle["forstegangsregistrering"]["registrertForstegangNorgeDato"] = (
+        "2014-06-03"
+    )
+    fake_vegvesen.add_vehicle(vehicle)
+    entry = make_entry(fake_vegvesen)
+    entry.add_to_hass(hass)
+    # Days since the last inspection is disabled by default
+    er.async_get(hass).async_get_or_create(
+        "sensor",
+        DOMAIN,
+        f"{entry.entry_id}_days_since_last_inspection",
+        config_entry=entry,
+    )
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_ids = {key: _entity_id(hass, entry, key) for key in DERIVED}
+    await async_lookup(hass, REGNR)
+
+    assert {
+        key: hass.states.get(entity_id).state
+        for key, entity_id in entity_ids.items()
+    } == {
+        "days_until_next_inspection": "30",
+        "days_since_last_inspection": "701",
+        "vehicle_age": "9.9",
+    }
+
+    writes = {key: _Writes(hass, entity_id) for key, entity_id in entity_ids.items()}
+    freezer.move_to("2024-05-16 00:00:02-07:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert {
+        key: hass.states.get(entity_id).state
+        for key, entity_id in entity_ids.items()
+    } == {
+        "days_until_next_inspection": "29",
+        "days_since_last_inspection": "702",
+        "vehicle_age": "10.0",
+    }
+    assert {key: len(w) for key, w in writes.items()} == dict.fromkeys(DERIVED, 1)
+    assert fake_vegvesen.requests[REGNR] == 1
+
+    # The next day's tick only writes the values that changed
+    freezer.move_to("2024-05-17 00:00:02-07:00")
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass.states.get(entity_ids["vehicle_age"]).state == "10.0"
+    assert len(writes["vehicle_age"]) == 1
+    assert len(writes["days_until_next_inspection"]) == 2
+    assert fake_vegvesen.requests[REGNR] == 1
+    await async_unload_entries(hass, [entry])
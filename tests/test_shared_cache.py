@@ -0,0 +1,112 @@
+"""Shared cache backends: two instances sharing records and quota counters.
+
+Each test runs against two instances of one backend: SQLite on a file in
+tmp_path, and Redis on an in-process fakeredis server.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup import shared_cache
+from custom_components.vegvesen_vehicle_lookup.shared_cache import (
+    RedisSharedCache,
+    SharedCacheBackend,
+    SQLiteSharedCache,
+)
+
+VIN = "YV1ZW25UDL1234567"
+TTL = 1  # seconds; SQLite runs in the executor, on the real clock
+
+
+def _record(fetched_at: float, payload: str = "blob", vin: str | None = VIN):
+    return {"payload": payload, "fetched_at": fetched_at, "vin": vin}
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+async def backends(
+    request: pytest.FixtureRequest,
+    hass: HomeAssistant,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> AsyncIterator[tuple[SharedCacheBackend, SharedCacheBackend]]:
+    """Two instances sharing one store."""
+    if request.param == "sqlite":
+        path = str(tmp_path / "shared.db")
+        pair = (SQLiteSharedCache(hass, path), SQLiteSharedCache(hass, path))
+    else:
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        monkeypatch.setattr(
+            shared_cache.aioredis,
+            "from_url",
+            lambda url, **kwargs: fakeredis.aioredis.FakeRedis(
+                server=server, **kwargs
+            ),
+        )
+        pair = (RedisSharedCache("redis://"), RedisSharedCache("redis://"))
+    for backend in pair:
+        await backend.async_setup()
+    yield pair
+    for backend in pair:
+        await backend.async_close()
+
+
+async def test_puts_shared(
+    backends: tuple[SharedCacheBackend, SharedCacheBackend],
+) -> None:
+    first, second = backends
+
+    await first.async_put("EF12345", _record(100.0))
+
+    assert await second.async_get("EF12345") == _record(100.0)
+    assert await second.async_get(VIN) == _record(100.0)
+    await second.async_delete("EF12345")
+    assert await first.async_get("EF12345") is None
+    assert await first.async_get(VIN) is None
+
+
+async def test_newer_fetch_wins(
+    backends: tuple[SharedCacheBackend, SharedCacheBackend],
+) -> None:
+    first, second = backends
+
+    await first.async_put("EF12345", _record(200.0, "new"))
+    # An older result written behind late
+    await second.async_put("EF12345", _record(100.0, "old"))
+
+    assert await first.async_get("EF12345") == _record(200.0, "new")
+    assert await second.async_get(VIN) == _record(200.0, "new")
+
+
+async def test_rekeyed_by_vin(
+    backends: tuple[SharedCacheBackend, SharedCacheBackend],
+) -> None:
+    first, second = backends
+
+    await first.async_put("EF12345", _record(100.0, "old plate"))
+    # The same vehicle, re-registered
+    await second.async_put("AB98765", _record(200.0, "new plate"))
+
+    assert await first.async_get("EF12345") is None
+    assert await first.async_get("AB98765") == _record(200.0, "new plate")
+    assert await first.async_get(VIN) == _record(200.0, "new plate")
+
+
+async def test_quota_counter(
+    backends: tuple[SharedCacheBackend, SharedCacheBackend],
+) -> None:
+    first, second = backends
+
+    assert await first.async_incr("quota:key:2024-05-15", TTL) == 1
+    assert await second.async_incr("quota:key:2024-05-15", TTL) == 2
+    assert await first.async_incr("quota:key:2024-05-16", TTL) == 1
+
+    await asyncio.sleep(TTL + 0.1)
+    assert await second.async_incr("quota:key:2024-05-15", TTL) == 1
@@ -0,0 +1,168 @@
+"""Soak harness: sustained lookups against the stand-in, with memory budgets.
+
+Run with ``pytest -m soak``; SOAK_LOOKUPS (default 20000) sets the number
+of lookups per test. A fixed set of plates is cycled, so the caches stop
+growing during the warm-up (the first tenth of the lookups). RSS and a
+tracemalloc snapshot are taken after it; a test fails if either grows
+past its budget by the end, or if more connections to the stand-in are
+left open than lookups ever ran at once. A share of the plates answers
+with 404, 500, a dropped connection or not at all, so error paths are
+soaked as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import contextlib
+import gc
+import os
+import tracemalloc
+
+import aiohttp
+import pytest
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.vegvesen_vehicle_lookup.api import VegvesenApi, VegvesenApiError
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_FRESHNESS_HOURS,
+    CONF_STALE_WHILE_REVALIDATE,
+    DOMAIN,
+)
+
+from .common import async_lookup, async_setup_entries, async_unload_entries
+from .fake_vegvesen import FAULT_DROP, FAULT_TIMEOUT, FakeVegvesen
+from .vehicles import make_regnr
+
+pytestmark = pytest.mark.soak
+
+LOOKUPS = int(os.environ.get("SOAK_LOOKUPS", "20000"))
+PLATES = 500  # distinct plates, cycled
+CONCURRENCY = 20  # lookups in flight at once (API client test)
+BATCH = 10  # plates per lookup service call (coordinator test)
+
+TRACEMALLOC_BUDGET = 2 * 2**20  # bytes of Python allocations
+RSS_BUDGET = 32 * 2**20  # bytes
+
+
+def _inject_faults(server: FakeVegvesen) -> None:
+    for index in range(PLATES):
+        plate = make_regnr(index)
+        if index % 50 == 1:
+            server.faults[plate] = 404
+        elif index % 97 == 2:
+            server.faults[plate] = 500
+        elif index % 211 == 3:
+            server.faults[plate] = FAULT_DROP
+        elif index == 4:
+            server.faults[plate] = FAULT_TIMEOUT
+
+
+def _rss() -> int | None:
+    """Current resident set size (Linux), or None."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            pages = int(statm.read().split()[1])
+    except OSError:
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+class _MemoryBudget:
+    """Growth of RSS and traced allocations between start() and check()."""
+
+    def start(self) -> None:
+        gc.collect()
+        tracemalloc.start(10)
+        self._snapshot = tracemalloc.take_snapshot()
+        self._rss = _rss()
+
+    def check(self) -> None:
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+        rss = _rss()
+        diff = snapshot.compare_to(self._snapshot, "lineno")
+        growth = sum(stat.size_diff for stat in diff)
+        top = "\n".join(str(stat) for stat in diff[:10])
+        assert growth < TRACEMALLOC_BUDGET, (
+            f"Python allocations grew by {growth / 2**20:.1f} MiB:\n{top}"
+        )
+        if rss is not None and self._rss is not None:
+            assert rss - self._rss < RSS_BUDGET, (
+                f"RSS grew by {(rss - self._rss) / 2**20:.1f} MiB:\n{top}"
+            )
+
+
+async def _drive(
+    lookup: Callable[[int], Awaitable[None]], count: int, workers: int
+) -> None:
+    """Run count lookups, numbered from 0, on the given number of workers."""
+    numbers = iter(range(count))
+
+    async def _worker() -> None:
+        for number in numbers:
+            await lookup(number)
+
+    await asyncio.gather(*(_worker() for _ in range(workers)))
+
+
+async def test_api_soak(fake_vegvesen: FakeVegvesen, short_api_timeout: float) -> None:
+    """VegvesenApi: lookups and key validations, errors included."""
+    _inject_faults(fake_vegvesen)
+    budget = _MemoryBudget()
+
+    async with aiohttp.ClientSession() as session:
+        api = VegvesenApi(session, fake_vegvesen.api_key, base_url=fake_vegvesen.url)
+        api.quota.limit = 10**9
+
+        async def _lookup(number: int) -> None:
+            with contextlib.suppress(VegvesenApiError):
+                if number % 100 == 0:
+                    await api.async_validate_api_key()
+                else:
+                    await api.async_lookup(make_regnr(number % PLATES))
+
+        warmup = LOOKUPS // 10
+        await _drive(_lookup, warmup, CONCURRENCY)
+        budget.start()
+        await _drive(_lookup, LOOKUPS - warmup, CONCURRENCY)
+        budget.check()
+
+        # Idle keep-alive connections only: at most one per worker
+        assert fake_vegvesen.open_connections <= CONCURRENCY
+
+
+async def test_coordinator_soak(
+    hass: HomeAssistant, fake_vegvesen: FakeVegvesen, short_api_timeout: float
+) -> None:
+    """Lookups through the service: cache, history, raw JSON and entities."""
+    _inject_faults(fake_vegvesen)
+    entries = await async_setup_entries(
+        hass,
+        fake_vegvesen,
+        # Every lookup goes to the API
+        **{CONF_FRESHNESS_HOURS: 0, CONF_STALE_WHILE_REVALIDATE: False},
+    )
+    hass.data[DOMAIN][entries[0].entry_id]["api"].quota.limit = 10**9
+    budget = _MemoryBudget()
+
+    async def _round(number: int) -> None:
+        """A batch lookup, then one single lookup (the entry's vehicle)."""
+        first = number * (BATCH + 1)
+        plates = [make_regnr((first + i) % PLATES) for i in range(BATCH + 1)]
+        await async_lookup(hass, plates[:-1])
+        await async_lookup(hass, plates[-1])
+
+    rounds = LOOKUPS // (BATCH + 1)
+    warmup = rounds // 10
+    await _drive(_round, warmup, 1)
+    await hass.async_block_till_done()
+    budget.start()
+    await _drive(_round, rounds - warmup, 1)
+    await hass.async_block_till_done()
+    budget.check()
+
+    assert fake_vegvesen.open_connections <= BATCH
+    await async_unload_entries(hass, entries)
@@ -0,0 +1,254 @@
+"""WebSocket commands: single vehicles, the paginated list, suggestions,
+subscriptions."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+import pytest
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.vegvesen_vehicle_lookup import codec
+from custom_components.vegvesen_vehicle_lookup.const import (
+    CONF_FRESHNESS_HOURS,
+    CONF_STALE_WHILE_REVALIDATE,
+    DOMAIN,
+    INDEXED_ATTRIBUTES,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+)
+
+from .common import (
+    async_lookup,
+    async_setup_entries,
+    async_unload_entries,
+    make_entry,
+)
+from .fake_vegvesen import FakeVegvesen
+
+PLATES = ["EF10000", "EF10001", "EF20000", "GH10000"]
+
+
+def _snapshots(hass: HomeAssistant, entry: MockConfigEntry) -> dict[str, dict]:
+    cache = hass.data[DOMAIN][entry.entry_id]["coordinator"].cache
+    return {key: record.attributes() for key, record in cache.items()}
+
+
+@pytest.fixture
+async def looked_up(
+    hass: HomeAssistant, loaded_entry: MockConfigEntry
+) -> MockConfigEntry:
+    """The entry, with PLATES looked up."""
+    await async_lookup(hass, PLATES)
+    return loaded_entry
+
+
+async def _command(
+    hass_ws_client: WebSocketGenerator, hass: HomeAssistant, **msg: Any
+) -> dict[str, Any]:
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({**msg, "type": f"{DOMAIN}/{msg['type']}"})
+    return await client.receive_json()
+
+
+async def test_get_vehicle(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    looked_up: MockConfigEntry,
+) -> None:
+    snapshot = _snapshots(hass, looked_up)["EF10000"]
+
+    by_plate = await _command(
+        hass_ws_client, hass, type="vehicle", regnr="ef 10000", fields=["make"]
+    )
+    by_vin = await _command(
+        hass_ws_client, hass, type="vehicle", regnr=snapshot["chassis_number"]
+    )
+
+    assert by_plate["result"]["regnr"] == "EF10000"
+    assert by_plate["result"]["data"] == {"make": snapshot["make"]}
+    assert by_vin["result"]["regnr"] == "EF10000"
+    assert by_vin["result"]["data"] == snapshot
+
+
+@pytest.mark.parametrize(
+    ("regnr", "code"), [("XY99999", "not_found"), ("not a plate", "invalid_format")]
+)
+async def test_get_vehicle_errors(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    looked_up: MockConfigEntry,
+    regnr: str,
+    code: str,
+) -> None:
+    response = await _command(hass_ws_client, hass, type="vehicle", regnr=regnr)
+
+    assert not response["success"]
+    assert response["error"]["code"] == code
+
+
+async def test_list_pages(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    looked_up: MockConfigEntry,
+) -> None:
+    response = await _command(
+        hass_ws_client, hass, type="vehicles", offset=1, limit=2
+    )
+
+    result = response["result"]
+    assert result["total"] == len(PLATES)
+    assert result["offset"] == 1
+    assert [v["regnr"] for v in result["vehicles"]] == PLATES[1:3]
+
+
+async def test_list_filter_and_fields(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    looked_up: MockConfigEntry,
+) -> None:
+    snapshots = _snapshots(hass, looked_up)
+    makes = [snapshots["EF10000"]["make"], snapshots["GH10000"]["make"]]
+
+    response = await _command(
+        hass_ws_client,
+        hass,
+        type="vehicles",
+        filter={"make": makes},
+        fields=["make", "model"],
+    )
+
+    expected = sorted(k for k, v in snapshots.items() if v["make"] in makes)
+    result = response["result"]
+    assert result["total"] == len(expected)
+    assert [v["regnr"] for v in result["vehicles"]] == expected
+    assert all(v["data"].keys() == {"make", "model"} for v in result["vehicles"])
+
+    response = await _command(
+        hass_ws_client, hass, type="vehicles", fields=["make", "no_such"]
+    )
+    assert response["error"]["code"] == "invalid_format"
+
+
+async def test_list_prefix(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    looked_up: MockConfigEntry,
+) -> None:
+    response = await _command(hass_ws_client, hass, type="vehicles", prefix="ef 1")
+
+    assert response["success"]
+    result = response["result"]
+    assert result["total"] == 2
+    assert [v["regnr"] for v in result["vehicles"]] == ["EF10000", "EF10001"]
+
+
+async def test_suggest(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    looked_up: MockConfigEntry,
+) -> None:
+    snapshots = _snapshots(hass, looked_up)
+
+    response = await _command(
+        hass_ws_client, hass, type="suggest", prefix="ef", limit=2
+    )
+
+    assert response["result"]["suggestions"] == [
+        {
+            "regnr": regnr,
+            "make": snapshots[regnr]["make"],
+            "model": snapshots[regnr]["model"],
+        }
+        for regnr in ("EF10000", "EF10001")
+    ]
+
+
+async def test_suggest_from_index(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    hass_ws_client: WebSocketGenerator,
+    fake_vegvesen: FakeVegvesen,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Suggestions of stored vehicles decode no payload."""
+    decoded = []
+    decode = codec.decode
+    monkeypatch.setattr(
+        codec, "decode", lambda blob: decoded.append(blob) or decode(blob)
+    )
+    entry = make_entry(fake_vegvesen)
+    hass_storage[f"{STORAGE_KEY}.{entry.entry_id}"] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": f"{STORAGE_KEY}.{entry.entry_id}",
+        "data": {
+            "indexed": list(INDEXED_ATTRIBUTES),
+            "records": {
+                # Not a valid payload: decoding it would fail
+                "EF12345": {
+                    "payload": "not a payload",
+                    "fetched_at": dt_util.utcnow().timestamp(),
+                    "vin": None,
+                    "index": {"make": "TESLA", "model": "MODEL Y"},
+                }
+            },
+        },
+    }
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    response = await _command(hass_ws_client, hass, type="suggest", prefix="EF1")
+
+    assert response["result"]["suggestions"] == [
+        {"regnr": "EF12345", "make": "TESLA", "model": "MODEL Y"}
+    ]
+    assert decoded == []
+    await async_unload_entries(hass, [entry])
+
+
+async def test_subscribe(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    fake_vegvesen: FakeVegvesen,
+) -> None:
+    entries = await async_setup_entries(
+        hass,
+        fake_vegvesen,
+        **{CONF_FRESHNESS_HOURS: 0, CONF_STALE_WHILE_REVALIDATE: False},
+    )
+    regnr = PLATES[0]
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": f"{DOMAIN}/subscribe", "regnr": regnr})
+    assert (await client.receive_json())["success"]
+
+    # Another plate is not forwarded; the first update has the full snapshot
+    await async_lookup(hass, [PLATES[1], regnr])
+    event = (await client.receive_json())["event"]
+    snapshot = _snapshots(hass, entries[0])[regnr]
+    assert event["entry_id"] == entries[0].entry_id
+    assert event["regnr"] == regnr
+    assert event["set"] == snapshot
+    assert event["unset"] == []
+
+    # Refreshed unchanged: nothing; then re-weighed: only the weight
+    await async_lookup(hass, regnr)
+    vehicle = fake_vegvesen.vehicles[regnr]["godkjenning"]["tekniskGodkjenning"]
+    vehicle["tekniskeData"]["vekter"]["egenvekt"] += 10
+    await async_lookup(hass, regnr)
+    event = (await client.receive_json())["event"]
+    assert event["set"] == {"curb_weight": snapshot["curb_weight"] + 10}
+    assert event["unset"] == []
+
+    # No longer registered
+    fake_vegvesen.faults[regnr] = 404
+    await async_lookup(hass, regnr)
+    event = (await client.receive_json())["event"]
+    assert event == {"entry_id": entries[0].entry_id, "regnr": regnr, "removed": True}
+    assert fake_vegvesen.requests[regnr] == 4
+    await async_unload_entries(hass, entries)
@@ -0,0 +1,216 @@
+"""Synthetic kjoretoydataListe items for tests, benchmarks and the stand-in.
+
+The payloads follow the structure of real enkeltoppslag responses for the
+fields the attribute catalog reads, with values drawn from a seeded RNG so
+runs are repeatable. They are not recordings of real vehicles; pass
+recorded responses to the stand-in server where realism matters.
+"""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+import random
+import string
+from typing import Any
+
+_VIN_CHARS = "ABCDEFGHJKLMNPRSTUVWXYZ0123456789"
+
+_MODELS = [
+    # make, model, fuel, curb weight (kg), WLTP CO₂ (g/km)
+    ("TESLA", "MODEL Y", "Elektrisitet", 1979, 0),
+    ("TESLA", "MODEL 3", "Elektrisitet", 1765, 0),
+    ("VOLKSWAGEN", "ID.4", "Elektrisitet", 2124, 0),
+    ("VOLKSWAGEN", "GOLF", "Bensin", 1295, 132),
+    ("TOYOTA", "RAV4", "Bensin", 1660, 126),
+    ("TOYOTA", "COROLLA", "Bensin", 1385, 110),
+    ("VOLVO", "XC60", "Diesel", 1940, 158),
+    ("SKODA", "OCTAVIA", "Diesel", 1460, 119),
+    ("BMW", "IX3", "Elektrisitet", 2185, 0),
+    ("MERCEDES-BENZ", "SPRINTER", "Diesel", 2310, 241),
+]
+_COLORS = ["Hvit", "Svart", "Grå", "Sølv", "Blå", "Rød", "Grønn"]
+
+
+def _code(value: str, name: str | None = None) -> dict[str, Any]:
+    return {
+        "kodeBeskrivelse": name or value,
+        "kodeNavn": name or value,
+        "kodeVerdi": value,
+        "tidligereKodeVerdi": [],
+    }
+
+
+def make_regnr(index: int) -> str:
+    """Return a distinct, valid registration number for an index."""
+    letters = string.ascii_uppercase
+    prefix = letters[(index // 100000 // 26) % 26] + letters[(index // 100000) % 26]
+    return f"{prefix}{index % 100000:05d}"
+
+
+def make_vehicle(
+    regnr: str, *, seed: int | None = None, today: date | None = None
+) -> dict[str, Any]:
+    """Return one kjoretoydataListe item for a registration number."""
+    rng = random.Random(regnr if seed is None else seed)
+    today = today or date.today()
+    make, model, fuel, weight, co2 = rng.choice(_MODELS)
+    weight += rng.randint(-60, 60)
+    vin = "".join(rng.choice(_VIN_CHARS) for _ in range(17))
+    first_registered = today - timedelta(days=rng.randint(30, 20 * 365))
+    deadline = today + timedelta(days=rng.randint(-60, 2 * 365))
+    electric = fuel == "Elektrisitet"
+    if electric:
+        consumption: dict[str, Any] = {
+            "co2Kombinert": 0,
+            "elEnergiforbruk": rng.randint(150, 220),
+            "rekkeviddeKmBlandetkjoring": rng.randint(350, 600),
+        }
+        noise = {"kjorestoy": rng.randint(62, 68)}
+    else:
+        co2 += rng.randint(-8, 8)
+        consumption = {
+            "co2Kombinert": co2,
+            "forbrukKombinert": round(co2 / 23.2, 1),
+        }
+        noise = {"kjorestoy": rng.randint(66, 72), "standstoy": rng.randint(70, 85)}
+
+    return {
+        "kjoretoyId": {
+            "kjennemerke": f"{regnr[:2]} {regnr[2:]}",
+            "understellsnummer": vin,
+        },
+        "forstegangsregistrering": {
+            "registrertForstegangNorgeDato": first_registered.isoformat()
+        },
+        "kjennemerke": [
+            {
+                "fomTidspunkt": f"{first_registered.isoformat()}T00:00:00+01:00",
+                "kjennemerke": f"{regnr[:2]} {regnr[2:]}",
+                "kjennemerkekategori": "KJORETOY",
+                "kjennemerketype": _code("ORDINART", "Ordinære kjennemerker"),
+            }
+        ],
+        "registrering": {
+            "fomTidspunkt": f"{first_registered.isoformat()}T00:00:00+01:00",
+            "kjoringensArt": _code("EGEN", "Egen bruk"),
+            "registreringsstatus": _code("REGISTRERT", "Registrert"),
+        },
+        "godkjenning": {
+            "forstegangsGodkjenning": {
+                "forstegangRegistrertDato": first_registered.isoformat(),
+                "godkjenningsId": str(rng.randint(10**7, 10**8 - 1)),
+                "godkjenningsundertype": {
+                    "kodeVerdi": "COC",
+                    "tidligereKodeVerdi": [],
+                },
+                "gyldigFraDato": first_registered.isoformat(),
+                "unntak": [],
+            },
+            "kjoretoymerknad": [],
+            "registreringsbegrensninger": {"registreringsbegrensning": []},
+            "tekniskGodkjenning": {
+                "godkjenningsId": str(rng.randint(10**7, 10**8 - 1)),
+                "gyldigFraDato": first_registered.isoformat(),
+                "kjoretoyklassifisering": {
+                    "beskrivelse": "Personbil",
+                    "efTypegodkjenning": {
+                        "typegodkjenningNrTekst": (
+                            f"e{rng.randint(1, 13)}*2007/46*"
+                            f"{rng.randint(1000, 9999):04d}*{rng.randint(1, 30):02d}"
+                        ),
+                        "variant": "".join(rng.choices(string.ascii_uppercase, k=4)),
+                        "versjon": "".join(rng.choices(string.ascii_uppercase, k=6)),
+                    },
+                    "kjoretoyAvgiftsKode": _code("101", "Personbil"),
+                    "tekniskKode": _code("M1", "Personbil"),
+                    "iSamsvarMedTypegodkjenning": True,
+                },
+                "krav": [],
+                "tekniskeData": {
+                    "akslinger": {"antallAksler": 2},
+                    "bremser": {"abs": True, "bremsesystem": "Hydraulisk"},
+                    "dimensjoner": {
+                        "bredde": rng.randint(1750, 2100),
+                        "hoyde": rng.randint(1400, 2600),
+                        "lengde": rng.randint(4000, 6000),
+                    },
+                    "generelt": {
+                        "fabrikant": [{"fabrikantNavn": make}],
+                        "handelsbetegnelse": [model],
+                        "merke": [
+                            {"merke": make, "merkeKode": str(rng.randint(1000, 9999))}
+                        ],
+                        "typebetegnelse": model.replace(" ", ""),
+                        "ukjentFabrikant": False,
+                    },
+                    "karosseriOgLasteplan": {
+                        "antallDorer": [rng.choice((3, 4, 5))],
+                        "karosseritype": _code("AB", "Kombikupé"),
+                        "kjoringSide": "venstre",
+                        "rFarge": [_code(str(rng.randint(1, 9)), rng.choice(_COLORS))],
+                    },
+                    "miljodata": {
+                        "euroKlasse": _code("6", "Euro 6"),
+                        "miljoOgdrivstoffGruppe": [
+                            {
+                                "drivstoffKodeMiljodata": _code(fuel[:1], fuel),
+                                "forbrukOgUtslipp": [
+                                    {
+                                        "malemetode": _code("WLTP"),
+                                        "partikkelfilterFabrikkmontert": not electric,
+                                        "wltpKjoretoyspesifikk": consumption,
+                                    }
+                                ],
+                                "lyd": noise,
+                            }
+                        ],
+                        "okoInnovasjon": False,
+                    },
+                    "motorOgDrivverk": {
+                        "girkassetype": _code("A", "Automat"),
+                        "hybridKategori": _code("INGEN", "Ingen"),
+                        "maksimumHastighet": [rng.randint(150, 250)],
+                        "motor": [
+                            {
+                                "antallSylindre": 0 if electric else 4,
+                                "drivstoff": [
+                                    {
+                                        "drivstoffKode": _code(fuel[:1], fuel),
+                                        "maksNettoEffekt": rng.randint(70, 300),
+                                    }
+                                ],
+                                "slagvolum": 0 if electric else rng.randint(1000, 2500),
+                            }
+                        ],
+                    },
+                    "persontall": {
+                        "sitteplassForan": 2,
+                        "sitteplasserTotalt": rng.choice((2, 5, 7)),
+                    },
+                    "tilhengerkopling": {"kopling": []},
+                    "vekter": {
+                        "egenvekt": weight,
+                        "nyttelast": rng.randint(350, 900),
+                        "tekniskTillattTotalvekt": weight + 500,
+                        "tillattTaklast": 75,
+                        "tillattTilhengervektMedBrems": rng.choice((0, 750, 1600)),
+                        "tillattTilhengervektUtenBrems": 750,
+                        "tillattTotalvekt": weight + 500,
+                        "tillattVertikalKoplingslast": 75,
+                        "tillattVogntogvekt": weight + 2100,
+                    },
+                },
+            },
+            "tilleggsgodkjenninger": [],
+            "unntak": [],
+        },
+        "periodiskKjoretoyKontroll": {
+            "kontrollfrist": deadline.isoformat(),
+            "sistGodkjent": (deadline - timedelta(days=730)).isoformat(),
+        },
+    }
+
+
+def make_response(vehicle: dict[str, Any]) -> dict[str, Any]:
+    """Wrap a vehicle the way the API does (KjoretoydataResponse)."""
+    return {"kjoretoydataListe": [vehicle]}